@@ -1,9 +1,13 @@
 from pyqtgraph import PlotWidget, mkPen
-from core import buffer, SpeedProcessor, AccelerationProcessor, SpeedCorrectedProcessor, SpeedPeakDetection, serial_mgr
-from PyQt5.QtCore import QTimer
+from core import buffer, SpeedProcessor, AccelerationProcessor, SpeedCorrectedProcessor, SpeedPeakDetection, SpectrumProcessor, PLLTracker, DampingEstimator, FilterProcessor, KalmanEstimator, EdgeGlitchFilter, ModelSignCorrector, serial_mgr
+from core import SessionStore, EXPORT_FORMATS, DEFAULT_EXPORT_FORMAT
+from core import ALIGN_TARGETS, DEFAULT_ALIGN_TARGET, DEFAULT_ALIGN_RATE, align_options
+from core import SavgolFilter, ACCEL_FILTERS, DEFAULT_ACCEL_FILTER, ZERO_PHASE_SOURCES
+from core import LCD_MODES, DEFAULT_LCD_MODE, SIGN_CORRECTORS, DEFAULT_SIGN_CORRECTOR
+from workers import ExportTask
+from PyQt5.QtCore import QTimer, QCoreApplication, QThreadPool, QSettings
 from PyQt5.QtWidgets import QVBoxLayout, QFileDialog, QMessageBox
 import os
-import csv
 import time
 
 class ControlController:
@@ -24,8 +28,12 @@ class ControlController:
         self.ui.SpeedCheckBox.stateChanged.connect(self.update_graph_selection)
         self.ui.RpmCheckBox.stateChanged.connect(self.update_graph_selection)
         self.ui.AccelerationCheckBox.stateChanged.connect(self.update_graph_selection)
+        self.ui.SpectrumCheckBox.stateChanged.connect(self.update_graph_selection)
+        self.ui.TrackerCheckBox.stateChanged.connect(self.update_graph_selection)
+        self.ui.KalmanCheckBox.stateChanged.connect(self.update_graph_selection)
         self.ui.AutoScrollGraphCheckBox.stateChanged.connect(self.toggle_graph_range)
         self.ui.CustomExportFilenameCheckBox.stateChanged.connect(self.toggle_export_custom_name)
+        self.ui.RecordSessionCheckBox.toggled.connect(self.toggle_session_recording)
 
         # Connect button signals
         self.ui.RPMSendButton.clicked.connect(self.change_rpm)
@@ -42,16 +50,48 @@ class ControlController:
         self.timer.timeout.connect(self.refresh_graph)
         self.timer.start()
 
+        self.settings = QSettings("UTP", "OSCOS")
+
+        # Filter used to differentiate speed into acceleration
+        for key, (label, _kwargs) in ACCEL_FILTERS.items():
+            self.ui.AccelFilterComboBox.addItem(label, key)
+        last_accel_filter = self.settings.value("accel_filter", DEFAULT_ACCEL_FILTER, type=str)
+        self.ui.AccelFilterComboBox.setCurrentIndex(
+            max(0, self.ui.AccelFilterComboBox.findData(last_accel_filter))
+        )
+        self.ui.AccelFilterComboBox.currentIndexChanged.connect(self.on_accel_filter_changed)
+
+        # What the signal LCDs display: the latest value or a running statistic
+        for key, label in LCD_MODES.items():
+            self.ui.LcdModeComboBox.addItem(label, key)
+        last_lcd_mode = self.settings.value("lcd_mode", DEFAULT_LCD_MODE, type=str)
+        self.ui.LcdModeComboBox.setCurrentIndex(
+            max(0, self.ui.LcdModeComboBox.findData(last_lcd_mode))
+        )
+        self.ui.LcdModeComboBox.currentIndexChanged.connect(
+            lambda _: self.settings.setValue("lcd_mode", self.ui.LcdModeComboBox.currentData())
+        )
+
+        # How the speed gets its sign (direction of travel)
+        for key, label in SIGN_CORRECTORS.items():
+            self.ui.SignMethodComboBox.addItem(label, key)
+        last_sign_method = self.settings.value("sign_method", DEFAULT_SIGN_CORRECTOR, type=str)
+        self.ui.SignMethodComboBox.setCurrentIndex(
+            max(0, self.ui.SignMethodComboBox.findData(last_sign_method))
+        )
+        self.ui.SignMethodComboBox.currentIndexChanged.connect(self.on_sign_method_changed)
+
         # Create data processors:
+        self.edge_filter = EdgeGlitchFilter(buffer.edge_glitches)
         self.speed_processor = SpeedProcessor(
             self.ui.toothLengthSpinBox.value(),
             buffer.speed
         )
 
-        self.accel_processor = AccelerationProcessor(buffer.acceleration)
+        self.accel_processor = self._make_accel_processor(buffer.acceleration)
 
-        self.speed_corrected_processor = SpeedCorrectedProcessor(buffer.speed_corrected)
-        self.accel_corrected_processor = AccelerationProcessor(buffer.acceleration_corrected)
+        self.speed_corrected_processor = self._make_sign_processor()
+        self.accel_corrected_processor = self._make_accel_processor(buffer.acceleration_corrected)
         # Initialize peak detector using values from the UI spinboxes
         peak_window = float(self.ui.PeakWindowSpinBox.value())
         peak_threshold = float(self.ui.PeakThresholdSpinBox.value())
@@ -61,13 +101,41 @@ class ControlController:
             threshold=peak_threshold,
         )
 
+        # Oscillation frequency from a sliding spectrum of the corrected speed
+        self.spectrum_processor = SpectrumProcessor(buffer.dominant_frequency, buffer.speed_spectrum)
+
+        # Low-latency frequency/amplitude/phase tracking, seeded by the spectrum
+        self.tracker = PLLTracker(buffer.tracker_frequency, buffer.tracker_amplitude, buffer.tracker_phase)
+
+        # Decay of the oscillation from successive speed peaks
+        self.damping_estimator = DampingEstimator(buffer.log_decrement, buffer.damping_ratio, buffer.quality_factor)
+
+        # Smoothed position/speed/acceleration from the tooth edges, also
+        # predicted between edges at a fixed rate
+        self.kalman = KalmanEstimator(
+            self.ui.toothLengthSpinBox.value(),
+            buffer.kalman_position,
+            buffer.kalman_speed,
+            buffer.kalman_acceleration,
+        )
+        self.kalman_timer = QTimer()
+        self.kalman_timer.setInterval(int(1000 / self.kalman.output_rate))
+        self.kalman_timer.timeout.connect(
+            lambda: self.kalman.tick(buffer.clock.now(), self.edge_filter.pending)
+        )
+        self.kalman_timer.start()
+
         # Connect button to update peak detector parameters at runtime
         self.ui.PeakChangeButton.clicked.connect(self.update_peak_params)
 
         buffer.speed.subscribe(self.accel_processor)
-        buffer.speed.subscribe(self.speed_corrected_processor)
+        self._subscribe_sign_processor()
         buffer.speed_corrected.subscribe(self.accel_corrected_processor)
         buffer.speed.subscribe(self.speed_peak_processor)
+        buffer.speed_corrected.subscribe(self.spectrum_processor)
+        buffer.speed_corrected.subscribe(self.tracker)
+        buffer.dominant_frequency.subscribe(self.tracker.seed)
+        buffer.speed_peaks.subscribe(self.damping_estimator)
 
         # Hardcoded info about each graph
         self.signal_registry = {
@@ -87,6 +155,18 @@ class ControlController:
                 "lcd": self.ui.lcdPeak,
                 "scrollable": None,
             },
+            "spectrum": {
+                "lcd": self.ui.lcdFrequency,
+                "scrollable": False,
+            },
+            "tracker": {
+                "lcd": self.ui.lcdTrackerFrequency,
+                "scrollable": True,
+            },
+            "kalman": {
+                "lcd": self.ui.lcdKalmanSpeed,
+                "scrollable": True,
+            },
         }
 
         # Checkbox map
@@ -95,6 +175,9 @@ class ControlController:
             "acceleration": self.ui.AccelerationCheckBox,
             "rpm": self.ui.RpmCheckBox,
             "peak": self.ui.PeakCheckBox,
+            "spectrum": self.ui.SpectrumCheckBox,
+            "tracker": self.ui.TrackerCheckBox,
+            "kalman": self.ui.KalmanCheckBox,
         }
 
         # Steps of the graph scrollbar
@@ -103,6 +186,40 @@ class ControlController:
         # Enable autoscroll on start
         self.ui.AutoScrollGraphCheckBox.setChecked(True)
 
+        # Export format selection; exports run on a background thread
+        for key, (label, _ext) in EXPORT_FORMATS.items():
+            self.ui.ExportFormatComboBox.addItem(label, key)
+
+        last_export_format = self.settings.value("export_format", DEFAULT_EXPORT_FORMAT, type=str)
+        self.ui.ExportFormatComboBox.setCurrentIndex(
+            max(0, self.ui.ExportFormatComboBox.findData(last_export_format))
+        )
+        # Time base of the time-aligned export
+        for key, label in ALIGN_TARGETS.items():
+            self.ui.AlignComboBox.addItem(label, key)
+
+        last_align = self.settings.value("export_align", DEFAULT_ALIGN_TARGET, type=str)
+        self.ui.AlignComboBox.setCurrentIndex(max(0, self.ui.AlignComboBox.findData(last_align)))
+        self.ui.AlignRateSpinBox.setValue(
+            self.settings.value("export_align_rate", DEFAULT_ALIGN_RATE, type=float)
+        )
+        self.ui.AlignComboBox.currentIndexChanged.connect(self.on_export_align_changed)
+        self.ui.AlignRateSpinBox.valueChanged.connect(self.on_export_align_changed)
+
+        self.ui.ExportFormatComboBox.currentIndexChanged.connect(self.on_export_format_changed)
+        self.on_export_format_changed()
+
+        self._export_pool = QThreadPool()
+        self._export_pool.setMaxThreadCount(1)
+        self._export_task = None
+        self.ui.ExportProgressBar.setVisible(False)
+
+        # On-disk recording of the whole run (see toggle_session_recording)
+        self.session_store = None
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.stop_session_recording)
+
 
     def _resolve_buffer(self, name):
         sign_corrected = self.ui.SignCorrectionCheckBox.isChecked()
@@ -121,6 +238,66 @@ class ControlController:
             return buffer.rpm
         if name == "peak":
             return buffer.speed_peaks
+        if name == "spectrum":
+            return buffer.dominant_frequency
+        if name == "tracker":
+            return buffer.tracker_frequency
+        if name == "kalman":
+            return buffer.kalman_speed
+
+    #----------------------------------------
+    # Acceleration filter
+    #----------------------------------------
+    def _make_accel_processor(self, out_buffer):
+        key = self.ui.AccelFilterComboBox.currentData() or DEFAULT_ACCEL_FILTER
+        kwargs = ACCEL_FILTERS[key][1]
+        if kwargs is None:
+            return AccelerationProcessor(out_buffer)
+        return FilterProcessor(out_buffer, SavgolFilter(deriv=1, **kwargs))
+
+    def on_accel_filter_changed(self, *_):
+        key = self.ui.AccelFilterComboBox.currentData() or DEFAULT_ACCEL_FILTER
+        self.settings.setValue("accel_filter", key)
+
+        # Swap the processors in place; new samples use the new filter
+        buffer.speed.unsubscribe(self.accel_processor)
+        buffer.speed_corrected.unsubscribe(self.accel_corrected_processor)
+        self.accel_processor = self._make_accel_processor(buffer.acceleration)
+        self.accel_corrected_processor = self._make_accel_processor(buffer.acceleration_corrected)
+        buffer.speed.subscribe(self.accel_processor)
+        buffer.speed_corrected.subscribe(self.accel_corrected_processor)
+
+    #----------------------------------------
+    # Sign correction
+    #----------------------------------------
+    def _make_sign_processor(self):
+        key = self.ui.SignMethodComboBox.currentData() or DEFAULT_SIGN_CORRECTOR
+        if key == "model":
+            return ModelSignCorrector(buffer.speed_corrected)
+        return SpeedCorrectedProcessor(buffer.speed_corrected)
+
+    def _subscribe_sign_processor(self):
+        proc = self.speed_corrected_processor
+        buffer.speed.subscribe(proc)
+        if isinstance(proc, ModelSignCorrector):
+            buffer.edge_direction.subscribe(proc.set_direction)
+            buffer.dominant_frequency.subscribe(proc.seed)
+
+    def _unsubscribe_sign_processor(self):
+        proc = self.speed_corrected_processor
+        buffer.speed.unsubscribe(proc)
+        if isinstance(proc, ModelSignCorrector):
+            buffer.edge_direction.unsubscribe(proc.set_direction)
+            buffer.dominant_frequency.unsubscribe(proc.seed)
+
+    def on_sign_method_changed(self, *_):
+        key = self.ui.SignMethodComboBox.currentData() or DEFAULT_SIGN_CORRECTOR
+        self.settings.setValue("sign_method", key)
+
+        # Swap the processor in place; new samples use the new method
+        self._unsubscribe_sign_processor()
+        self.speed_corrected_processor = self._make_sign_processor()
+        self._subscribe_sign_processor()
 
     #----------------------------------------
     # Send Kp value
@@ -184,8 +361,12 @@ class ControlController:
     def _add_graph(self, name, lcd=None, scrollable=True):
         pw = PlotWidget(background="#ffffff")
         pw.plotItem.showGrid(x=True, y=True)
-        pw.plotItem.setLabel("bottom", "Time (s)")
-        pw.plotItem.setLabel("left", name)
+        if name == "spectrum":
+            pw.plotItem.setLabel("bottom", "Frequency (Hz)")
+            pw.plotItem.setLabel("left", "PSD")
+        else:
+            pw.plotItem.setLabel("bottom", "Time (s)")
+            pw.plotItem.setLabel("left", name)
         pw.getAxis("left").setPen("#000000")
         pw.getAxis("bottom").setPen("#000000")
         pw.enableAutoRange(x=False, y=True)
@@ -311,6 +492,17 @@ class ControlController:
             lcd = info["lcd"]
             scrollable = info["scrollable"]
 
+            if info["name"] == "spectrum":
+                # Latest averaged spectrum; the LCD shows its dominant frequency
+                info["widget"].enableAutoRange(x=True, y=True)
+                freqs, power, _ = buffer.speed_spectrum.get()
+                if freqs is not None:
+                    curve.setData(freqs, power)
+                _, f = buf.get_latest(1)
+                if f and lcd is not None:
+                    lcd.display(round(f[-1], 3))
+                continue
+
             if scrollable:
                 t, v, t_start, t_end = self._get_windowed_data(
                     buf,
@@ -340,20 +532,9 @@ class ControlController:
             if info["name"] == "speed":
                 peaks_item = info.get("peaks_item")
                 if self.ui.PeakCheckBox.isChecked() and peaks_item is not None:
-                    # Use the same windowing parameters to fetch peaks
-                    t_p, v_p, _, _ = self._get_windowed_data(
-                        buffer.speed_peaks,
-                        window_size,
-                        position=position,
-                        autoscroll=autoscroll,
-                    )
+                    # Peaks share the speed timeline: fetch the visible range
+                    t_p, v_p = buffer.speed_peaks.get_range(t_start, t_end)
                     if t_p and v_p:
-                        # Align peaks timestamps to the speed buffer timeline.
-                        speed_base = getattr(buffer.speed, "_t0", None)
-                        peaks_base = getattr(buffer.speed_peaks, "_t0", None)
-                        if speed_base is not None and peaks_base is not None:
-                            delta = peaks_base - speed_base
-                            t_p = [tp + delta for tp in t_p]
                         peaks_item.setData(t_p, v_p)
                     else:
                         peaks_item.setData([], [])
@@ -362,7 +543,23 @@ class ControlController:
                     peaks_item.setData([], [])
 
             if lcd is not None:
-                lcd.display(v[-1])
+                lcd.display(self._lcd_value(buf, v[-1]))
+
+        # Readouts without a graph
+        _, zeta = buffer.damping_ratio.get_latest(1)
+        if zeta:
+            self.ui.lcdDamping.display(round(zeta[-1], 4))
+
+    def _lcd_value(self, buf, latest):
+        mode = self.ui.LcdModeComboBox.currentData() or DEFAULT_LCD_MODE
+        if mode == "latest":
+            return latest
+
+        # Buffers without statistics keep showing the latest value
+        summary = buf.stats(windowed=mode.startswith("window_"))
+        if summary is None:
+            return latest
+        return summary[mode.split("_")[-1]]
 
     def toggle_graph_range(self):
         if self.ui.AutoScrollGraphCheckBox.isChecked():
@@ -375,11 +572,22 @@ class ControlController:
     # Refresh data buffers on serial read
     #---------------------------------------------------
     def refresh_t_buffer(self, data):
-        t_us = float(data)
+        # "<t_us>" or, with the second encoder channel, "<t_us>,<B level at the edge>"
+        fields = data.split(",")
+        t_us = float(fields[0])
         t_s = t_us * 1e-6
 
-        buffer.raw_timestamps.add(t_s)
-        self.speed_processor.push(t_s)
+        # Map the device time onto the session clock (and feed its drift estimate)
+        t = buffer.clock.observe(t_s)
+
+        buffer.raw_timestamps.add(t_s, t)
+        if len(fields) > 1:
+            buffer.edge_direction.add(1.0 if int(float(fields[1])) else -1.0, t)
+
+        # Missed/extra edges are repaired before speed is computed (one edge of delay)
+        for edge in self.edge_filter.push(t):
+            self.speed_processor.push(edge)
+            self.kalman.push(edge)
 
     def refresh_rpm_buffer(self, data):
         buffer.rpm.add(float(data))
@@ -407,7 +615,29 @@ class ControlController:
             self.ui.ExportFilenameField.setText("telemetry_Ymd_HMS")
             self.ui.ExportFilenameField.setEnabled(False)
 
+    def on_export_format_changed(self, *_):
+        fmt = self.ui.ExportFormatComboBox.currentData() or DEFAULT_EXPORT_FORMAT
+        self.settings.setValue("export_format", fmt)
+        self.ui.label_17.setText(EXPORT_FORMATS[fmt][1] or "/")
+        self.on_export_align_changed()
+
+    def on_export_align_changed(self, *_):
+        target = self.ui.AlignComboBox.currentData() or DEFAULT_ALIGN_TARGET
+        self.settings.setValue("export_align", target)
+        self.settings.setValue("export_align_rate", self.ui.AlignRateSpinBox.value())
+
+        # Only the time-aligned export has a time base to choose
+        aligned = self.ui.ExportFormatComboBox.currentData() == "csv_aligned"
+        self.ui.AlignComboBox.setEnabled(aligned)
+        self.ui.AlignRateSpinBox.setEnabled(aligned and target == "rate")
+
     def export_buffers(self):
+        # A second click while exporting cancels the export
+        if self._export_task is not None:
+            self._export_task.cancel()
+            self.ui.ExportButton.setEnabled(False)
+            return
+
         # Select directory
         directory = self.ui.ExportPathField.text()
 
@@ -415,12 +645,15 @@ class ControlController:
             QMessageBox.warning(None, "Warning", "No directory selected.")
             return
 
+        fmt = self.ui.ExportFormatComboBox.currentData() or DEFAULT_EXPORT_FORMAT
+        ext = EXPORT_FORMATS[fmt][1]
+
         # Create filename from export time
         if self.ui.CustomExportFilenameCheckBox.isChecked():
-            filepath = os.path.join(directory, self.ui.ExportFilenameField.text()+".csv")
+            filepath = os.path.join(directory, self.ui.ExportFilenameField.text() + ext)
         else:
             timestamp = time.strftime("%Y%m%d_%H%M%S")
-            filepath = os.path.join(directory, f"telemetry_{timestamp}.csv")
+            filepath = os.path.join(directory, f"telemetry_{timestamp}{ext}")
 
 
         # Buffers to export based on the checkboxes
@@ -432,19 +665,109 @@ class ControlController:
             "speed_corrected": (self.ui.ExportCorrectedSpeedCheckBox, buffer.speed_corrected),
             "acceleration_corrected": (self.ui.ExportCorrectedAccelerationCheckBox, buffer.acceleration_corrected),
             "speed_peaks": (self.ui.ExportPeaksCheckBox, buffer.speed_peaks),
+            "log_decrement": (self.ui.ExportDampingCheckBox, buffer.log_decrement),
+            "damping_ratio": (self.ui.ExportDampingCheckBox, buffer.damping_ratio),
+            "quality_factor": (self.ui.ExportDampingCheckBox, buffer.quality_factor),
+            "dominant_frequency": (self.ui.ExportTrackerCheckBox, buffer.dominant_frequency),
+            "tracker_frequency": (self.ui.ExportTrackerCheckBox, buffer.tracker_frequency),
+            "tracker_amplitude": (self.ui.ExportTrackerCheckBox, buffer.tracker_amplitude),
+            "tracker_phase": (self.ui.ExportTrackerCheckBox, buffer.tracker_phase),
+            "kalman_position": (self.ui.ExportKalmanCheckBox, buffer.kalman_position),
+            "kalman_speed": (self.ui.ExportKalmanCheckBox, buffer.kalman_speed),
+            "kalman_acceleration": (self.ui.ExportKalmanCheckBox, buffer.kalman_acceleration),
+            "edge_glitches": (self.ui.ExportGlitchesCheckBox, buffer.edge_glitches),
+        }
+
+        # Snapshot the selected buffers; encoding and writing happen in the worker
+        selected = {
+            name: info[1]
+            for name, info in data_info.items()
+            if info[0].isChecked()
         }
+        data = {name: buf.get_all() for name, buf in selected.items()}
+
+        # Zero-phase fits are computed in the worker from the source buffers
+        smoothing = None
+        if self.ui.ExportZeroPhaseCheckBox.isChecked():
+            smoothing = {
+                name: (*getattr(buffer, source).get_all(), deriv)
+                for name, (source, deriv) in ZERO_PHASE_SOURCES.items()
+                if name in data
+            }
+
+        align = None
+        if fmt == "csv_aligned":
+            align = align_options(
+                self.ui.AlignComboBox.currentData() or DEFAULT_ALIGN_TARGET,
+                data,
+                self.ui.AlignRateSpinBox.value(),
+            )
+
+        task = ExportTask(filepath, data, fmt, align=align, smoothing=smoothing)
+        task.signals.progress.connect(self.ui.ExportProgressBar.setValue)
+        task.signals.finished.connect(self._on_export_finished)
+        task.signals.cancelled.connect(self._on_export_cancelled)
+        task.signals.error.connect(self._on_export_error)
+        self._export_task = task
+
+        self.ui.ExportProgressBar.setValue(0)
+        self.ui.ExportProgressBar.setVisible(True)
+        self.ui.ExportButton.setText("Cancel")
+        self._export_pool.start(task)
+
+    def _end_export(self):
+        self._export_task = None
+        self.ui.ExportProgressBar.setVisible(False)
+        self.ui.ExportButton.setText("Export data")
+        self.ui.ExportButton.setEnabled(True)
 
-        # Write CSV
-        with open(filepath, "w", newline="") as f:
-            writer = csv.writer(f)
-            writer.writerow(["signal", "timestamp", "value"])
+    def _on_export_finished(self, path):
+        self._end_export()
+        print(f"Exported telemetry to {path}")
 
-            for name, info in data_info.items():
-                if info[0].isChecked():
-                    timestamps, values = info[1].get_all()
+    def _on_export_cancelled(self):
+        self._end_export()
+        print("Export cancelled")
+
+    def _on_export_error(self, msg):
+        self._end_export()
+        QMessageBox.warning(None, "Error", f"Export failed: {msg}")
+
+    #-----------------------------------------------
+    # Record the session to disk
+    #-----------------------------------------------
+    def toggle_session_recording(self, checked):
+        if not checked:
+            self.stop_session_recording()
+            return
+
+        if self.session_store is not None:
+            return
+
+        directory = self.ui.ExportPathField.text()
+        if not directory:
+            QMessageBox.warning(None, "Warning", "No directory selected.")
+            self.ui.RecordSessionCheckBox.setChecked(False)
+            return
+
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
+        path = os.path.join(directory, f"session_{timestamp}")
+        try:
+            self.session_store = SessionStore(path, buffer)
+        except Exception as e:
+            QMessageBox.warning(None, "Error", f"Could not start recording: {e}")
+            self.ui.RecordSessionCheckBox.setChecked(False)
+            return
+
+        print(f"Recording session to {path}")
+
+    def stop_session_recording(self):
+        store, self.session_store = self.session_store, None
+        if store is None:
+            return
 
-                    for t, v in zip(timestamps, values):
-                        writer.writerow([name, t, v])
+        store.close()
+        print(f"Session saved to {store.directory} ({store.samples_written} samples)")
 
     #-----------------------------------------------
     # Clear data buffers
@@ -461,12 +784,35 @@ class ControlController:
         buffer.speed_corrected.clear()
         buffer.acceleration_corrected.clear()
         buffer.speed_peaks.clear()
+        buffer.dominant_frequency.clear()
+        buffer.speed_spectrum.clear()
+        buffer.tracker_frequency.clear()
+        buffer.tracker_amplitude.clear()
+        buffer.tracker_phase.clear()
+        buffer.log_decrement.clear()
+        buffer.damping_ratio.clear()
+        buffer.quality_factor.clear()
+        buffer.edge_direction.clear()
+        buffer.edge_glitches.clear()
+        buffer.kalman_position.clear()
+        buffer.kalman_speed.clear()
+        buffer.kalman_acceleration.clear()
+
+        # A recording in progress needs monotonic time in its chunk files,
+        # so the session clock only restarts at 0 when nothing is recorded
+        if self.session_store is None:
+            buffer.clock.reset()
 
         # --- Reset processors (VERY IMPORTANT) ---
         self.speed_processor.reset()
         self.accel_processor.reset()
         self.speed_corrected_processor.reset()
         self.accel_corrected_processor.reset()
+        self.spectrum_processor.reset()
+        self.tracker.reset()
+        self.damping_estimator.reset()
+        self.kalman.reset()
+        self.edge_filter.reset()
 
         # --- Clear graphs ---
         for info in self.graphs.values():
@@ -3,23 +3,27 @@ from PyQt5.QtWidgets import (
     QMessageBox,
     QFileSystemModel,
 )
-from PyQt5.QtGui import QPixmap, QIcon, QStandardItemModel, QStandardItem, QDesktopServices
-from PyQt5.QtCore import QDir, QSize, Qt, QUrl, QTimer
+from PyQt5.QtCore import QFileSystemWatcher
+from PyQt5.QtGui import QPixmap, QIcon, QColor, QStandardItemModel, QStandardItem, QDesktopServices
+from PyQt5.QtCore import QDir, QSize, Qt, QUrl, QTimer, QThreadPool
 import os
 import shutil
 import numpy as np
-import cv2
-from PIL import Image
-from core import take_photo
+from core import take_photo, BINNING_FACTORS
+from core import OUTPUT_FORMATS, DEFAULT_OUTPUT_FORMAT, RAW_EXTS, to_uint8
+from core import ThumbnailCache, THUMBNAIL_DB_NAME, PhotoCatalog, OutputNameRegistry
+from core import SnapshotRequest, snapshot_path_for, DEFAULT_SNAPSHOT_SETTLE_S
+from core import SlidingExtremum
+from workers import FrameWriteTask, ThumbnailTask
 from PyQt5.QtCore import QSettings
 import re
 import time
-from pathlib import Path
-import csv
 from core import buffer
 
 
-IMAGE_EXTS = {".jpg", ".jpeg", ".png", ".bmp", ".gif", ".tif", ".tiff"}
+IMAGE_EXTS = {".jpg", ".jpeg", ".png", ".bmp", ".gif", ".tif", ".tiff"} | RAW_EXTS
+
+THUMB_SIZE = 128
 
 TAG_DEFINITIONS = {
     # Acquisition
@@ -51,14 +55,43 @@ class ImageController:
         self.ui = ui
         self.root_dir = None
         self.dir_model = None
+        self.thumb_cache = None
+        self.catalog = None
+
+        # Recent acceleration maximum for the photo metadata, kept up to date as samples arrive
+        self.accel_window = SlidingExtremum(window_seconds=1.5)
+        buffer.acceleration.subscribe(self.accel_window)
+        # Clear buffers also forgets the window (the session clock may keep running)
+        self.ui.ClearBuffersButton.clicked.connect(self.accel_window.reset)
 
         # List model for images
         self.list_model = QStandardItemModel()
         self.ui.PhotoListView.setModel(self.list_model)
         self.ui.PhotoListView.setViewMode(self.ui.PhotoListView.IconMode)
-        self.ui.PhotoListView.setIconSize(QSize(128, 128))
+        self.ui.PhotoListView.setIconSize(QSize(THUMB_SIZE, THUMB_SIZE))
         self.ui.PhotoListView.setGridSize(QSize(150, 150))
 
+        # Thumbnails are decoded in the background; rows show a placeholder
+        # until their thumbnail arrives. Visible rows are decoded first.
+        placeholder = QPixmap(THUMB_SIZE, THUMB_SIZE)
+        placeholder.fill(QColor("#dddddd"))
+        self._placeholder_icon = QIcon(placeholder)
+        self._thumb_pool = QThreadPool()
+        self._thumb_generation = 0
+        self._thumb_items = {}
+        self._thumb_sigs = {}
+        self._thumb_pending = {}
+        self._thumb_in_flight = 0
+
+        # Watch the listed folder and apply external changes as diffs
+        self._list_folder = None
+        self._folder_watcher = QFileSystemWatcher()
+        self._folder_watcher.directoryChanged.connect(self._on_folder_changed)
+        self._folder_sync_timer = QTimer()
+        self._folder_sync_timer.setSingleShot(True)
+        self._folder_sync_timer.setInterval(250)
+        self._folder_sync_timer.timeout.connect(self._sync_photo_list)
+
         self.ui.SelectPhotoPathButton.clicked.connect(self.select_photo_path)
         self.ui.AddSetButton.clicked.connect(self.add_set)
         self.ui.DeleteSetButton.clicked.connect(self.delete_set)
@@ -67,11 +100,25 @@ class ImageController:
         self.ui.StartPhotosButton.clicked.connect(self.start_photos)
         self.ui.PhotolabelInfoButton.clicked.connect(self.show_photo_label_info)
         self.ui.StopPhotosButton.clicked.connect(self.stop_photos)
+        self.ui.ExportSetMetadataButton.clicked.connect(self.export_set_metadata)
 
         self.ui.PhotoLabelField.textChanged.connect(
             lambda text: self.settings.setValue("photo_label_template", text.strip())
         )
 
+        # Output format selection
+        for key, (label, _ext) in OUTPUT_FORMATS.items():
+            self.ui.PhotoFormatComboBox.addItem(label, key)
+
+        self.ui.PhotoFormatComboBox.currentIndexChanged.connect(self.on_photo_format_changed)
+        self.ui.PngCompressionSpinBox.valueChanged.connect(
+            lambda value: self.settings.setValue("photo_png_compression", value)
+        )
+
+        # Camera ROI and binning
+        for factor in BINNING_FACTORS:
+            self.ui.BinningComboBox.addItem(f"{factor}x{factor}" if factor > 1 else "Off", factor)
+
 
         self.ui.PhotoListView.selectionModel().currentChanged.connect(
             self.on_photo_selection_changed
@@ -87,6 +134,42 @@ class ImageController:
         last_template = self.settings.value("photo_label_template", "", type=str)
         self.ui.PhotoLabelField.setText(last_template)
 
+        last_format = self.settings.value("photo_output_format", DEFAULT_OUTPUT_FORMAT, type=str)
+        fmt_index = self.ui.PhotoFormatComboBox.findData(last_format)
+        self.ui.PhotoFormatComboBox.setCurrentIndex(max(0, fmt_index))
+        self.on_photo_format_changed()
+
+        last_level = self.settings.value("photo_png_compression", 3, type=int)
+        self.ui.PngCompressionSpinBox.setValue(last_level)
+
+        self.ui.RoiCheckBox.setChecked(self.settings.value("camera_roi_enabled", False, type=bool))
+        for key, spin in self._roi_spin_boxes().items():
+            spin.setValue(self.settings.value(key, spin.value(), type=int))
+        bin_index = self.ui.BinningComboBox.findData(self.settings.value("camera_binning", 1, type=int))
+        self.ui.BinningComboBox.setCurrentIndex(max(0, bin_index))
+        self.on_camera_roi_changed()
+
+        self.ui.BayerTransferCheckBox.setChecked(
+            self.settings.value("camera_bayer_transfer", False, type=bool)
+        )
+        self.ui.BayerTransferCheckBox.toggled.connect(
+            lambda checked: self.settings.setValue("camera_bayer_transfer", checked)
+        )
+
+        self.ui.RoiCheckBox.toggled.connect(self.on_camera_roi_changed)
+        for spin in self._roi_spin_boxes().values():
+            spin.valueChanged.connect(self.on_camera_roi_changed)
+        self.ui.BinningComboBox.currentIndexChanged.connect(self.on_camera_roi_changed)
+
+        # Frames are encoded and written in the background, one at a time so
+        # metadata rows keep the capture order.
+        self._writer_pool = QThreadPool()
+        self._writer_pool.setMaxThreadCount(1)
+        self._pending_writes = {}
+
+        # Output file names are reserved on disk when a shot is prepared
+        self._output_names = OutputNameRegistry()
+
 
 
         last_path = self.settings.value("image_root_path", "", type=str)
@@ -128,38 +211,216 @@ class ImageController:
         self.load_images(path)
 
     def load_images(self, folder_path):
-        """Populate the `PhotoListView` with thumbnails of images inside `folder_path`.
-        Non-image files are ignored.
+        """Populate the `PhotoListView` with the images inside `folder_path`.
+        Non-image files are ignored. Rows are created immediately with a
+        placeholder icon and thumbnails are filled in by `_schedule_thumbnails`.
+        Later changes to the folder are applied incrementally.
         """
-        self.list_model.clear()
+        self._clear_photo_list()
+        self._import_set_metadata(folder_path)
+
+        images = self._scan_images(folder_path)
+        if images is None:
+            return
+
+        self._watch_folder(folder_path)
+
+        for fp, sig in sorted(images.items()):
+            self._append_image_item(fp, sig)
+
+        # ensure view parameters
+        self.ui.PhotoListView.setViewMode(self.ui.PhotoListView.IconMode)
+        self.ui.PhotoListView.setIconSize(QSize(THUMB_SIZE, THUMB_SIZE))
+        self.ui.PhotoListView.setGridSize(QSize(150, 150))
+
+        self._schedule_thumbnails()
+
+    def _scan_images(self, folder_path):
+        """Return {path: (mtime_ns, size)} for the images in `folder_path`, or None."""
+        images = {}
         try:
-            entries = os.listdir(folder_path)
+            with os.scandir(folder_path) as it:
+                for entry in it:
+                    if os.path.splitext(entry.name)[1].lower() not in IMAGE_EXTS:
+                        continue
+                    try:
+                        if not entry.is_file():
+                            continue
+                        st = entry.stat()
+                    except OSError:
+                        continue
+                    if st.st_size == 0:
+                        # Reserved name whose frame is not written yet
+                        continue
+                    images[os.path.normpath(entry.path)] = (st.st_mtime_ns, st.st_size)
         except Exception:
+            return None
+
+        return images
+
+    def _append_image_item(self, fp, sig):
+        item = QStandardItem(self._placeholder_icon, os.path.basename(fp))
+        item.setData(fp, Qt.UserRole + 1)
+        item.setEditable(False)
+        self.list_model.appendRow(item)
+
+        self._thumb_items[fp] = item
+        self._thumb_sigs[fp] = sig
+        self._thumb_pending[fp] = item
+
+    def _add_image_item(self, fp, sig=None):
+        """Insert (or refresh) a single image in the list, keeping name order."""
+        fp = os.path.normpath(fp)
+        if sig is None:
+            try:
+                st = os.stat(fp)
+            except OSError:
+                return
+            sig = (st.st_mtime_ns, st.st_size)
+
+        item = self._thumb_items.get(fp)
+        if item is not None:
+            # Already listed: only re-decode the thumbnail if the file changed
+            if self._thumb_sigs.get(fp) != sig:
+                self._thumb_sigs[fp] = sig
+                self._thumb_pending[fp] = item
+                self._schedule_thumbnails()
             return
 
-        for entry in sorted(entries):
-            fp = os.path.join(folder_path, entry)
-            if not os.path.isfile(fp):
-                continue
+        name = os.path.basename(fp)
 
-            ext = os.path.splitext(entry)[1].lower()
-            if ext not in IMAGE_EXTS:
-                continue
+        # Binary search over the (sorted) model rows
+        lo, hi = 0, self.list_model.rowCount()
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.list_model.item(mid).text() < name:
+                lo = mid + 1
+            else:
+                hi = mid
+
+        item = QStandardItem(self._placeholder_icon, name)
+        item.setData(fp, Qt.UserRole + 1)
+        item.setEditable(False)
+        self.list_model.insertRow(lo, item)
+
+        self._thumb_items[fp] = item
+        self._thumb_sigs[fp] = sig
+        self._thumb_pending[fp] = item
+        self._schedule_thumbnails()
+
+    def _remove_image_item(self, fp):
+        fp = os.path.normpath(fp)
+        item = self._thumb_items.pop(fp, None)
+        self._thumb_sigs.pop(fp, None)
+        self._thumb_pending.pop(fp, None)
+        if item is not None:
+            self.list_model.removeRow(item.row())
+
+    def _watch_folder(self, folder_path):
+        watched = self._folder_watcher.directories()
+        if watched:
+            self._folder_watcher.removePaths(watched)
+
+        self._list_folder = folder_path
+        if folder_path:
+            self._folder_watcher.addPath(folder_path)
+
+    def _on_folder_changed(self, path):
+        # Writes usually come in bursts; sync once they settle
+        self._folder_sync_timer.start()
+
+    def _sync_photo_list(self):
+        """Apply the difference between the listed folder and the model."""
+        folder = self._list_folder
+        if not folder:
+            return
 
-            pix = QPixmap(fp)
-            if pix.isNull():
-                continue
+        images = self._scan_images(folder)
+        if images is None:
+            # Folder is gone
+            self._watch_folder(None)
+            self._clear_photo_list()
+            return
 
-            icon = QIcon(pix.scaled(128, 128, Qt.KeepAspectRatio, Qt.SmoothTransformation))
-            item = QStandardItem(icon, entry)
-            item.setData(fp, Qt.UserRole + 1)
-            item.setEditable(False)
-            self.list_model.appendRow(item)
+        # Frames still being written are added once the writer reports them
+        for fp in self._pending_writes:
+            images.pop(os.path.normpath(fp), None)
 
-        # ensure view parameters
-        self.ui.PhotoListView.setViewMode(self.ui.PhotoListView.IconMode)
-        self.ui.PhotoListView.setIconSize(QSize(128, 128))
-        self.ui.PhotoListView.setGridSize(QSize(150, 150))
+        for fp in [fp for fp in self._thumb_items if fp not in images]:
+            self._remove_image_item(fp)
+
+        for fp, sig in sorted(images.items()):
+            self._add_image_item(fp, sig)
+
+    def _clear_photo_list(self):
+        # Results of thumbnails still in flight are dropped by generation
+        self._thumb_generation += 1
+        self._thumb_items = {}
+        self._thumb_sigs = {}
+        self._thumb_pending = {}
+        self._thumb_in_flight = 0
+        self.list_model.clear()
+
+    def _schedule_thumbnails(self):
+        """Keep the thumbnail pool busy with a bounded number of tasks."""
+        if not self._thumb_pending:
+            if self._thumb_in_flight == 0 and self.thumb_cache is not None:
+                self.thumb_cache.flush()
+            return
+
+        limit = 2 * self._thumb_pool.maxThreadCount()
+        free = limit - self._thumb_in_flight
+        if free <= 0:
+            return
+
+        for fp in self._next_thumbnail_paths(free):
+            del self._thumb_pending[fp]
+            task = ThumbnailTask(self._thumb_generation, fp, THUMB_SIZE, self.thumb_cache)
+            task.signals.loaded.connect(self._on_thumbnail_loaded)
+            self._thumb_pool.start(task)
+            self._thumb_in_flight += 1
+
+    def _next_thumbnail_paths(self, n):
+        """Pick up to `n` pending paths, rows visible in the view first."""
+        view = self.ui.PhotoListView
+        rect = view.viewport().rect()
+        first = view.indexAt(rect.topLeft())
+        last = view.indexAt(rect.bottomRight())
+        start = first.row() if first.isValid() else 0
+        stop = last.row() if last.isValid() else self.list_model.rowCount() - 1
+
+        paths = []
+        for row in range(start, stop + 1):
+            item = self.list_model.item(row)
+            fp = item.data(Qt.UserRole + 1) if item is not None else None
+            if fp in self._thumb_pending:
+                paths.append(fp)
+                if len(paths) >= n:
+                    return paths
+
+        for fp in self._thumb_pending:
+            if fp not in paths:
+                paths.append(fp)
+                if len(paths) >= n:
+                    break
+
+        return paths
+
+    def _on_thumbnail_loaded(self, generation, fp, img):
+        if generation != self._thumb_generation:
+            return
+
+        self._thumb_in_flight -= 1
+
+        item = self._thumb_items.get(fp)
+        if item is not None:
+            if img.isNull():
+                # Not a decodable image: drop it like the eager loader did
+                self._remove_image_item(fp)
+            else:
+                item.setIcon(QIcon(QPixmap.fromImage(img)))
+
+        self._schedule_thumbnails()
 
     def add_set(self):
         """Create a new subfolder inside the currently selected folder (or root).
@@ -222,18 +483,25 @@ class ImageController:
             QMessageBox.warning(None, "Error", f"Could not delete photo: {e}")
             return
 
-        # Remove metadata row
+        if self.thumb_cache is not None:
+            self.thumb_cache.discard(fp)
+
         folder = os.path.dirname(fp)
         filename = os.path.basename(fp)
-        self._remove_csv_row(folder, filename)
 
-        # Reload images
-        sel = self.ui.PhotoSetTreeView.currentIndex()
-        folder = self.dir_model.filePath(sel) if sel and sel.isValid() else self.root_dir
-        if not folder:
-            return
+        # Remove the telemetry snapshot that belongs to the photo
+        metadata = self._read_photo_metadata(folder, filename) or {}
+        snapshot_name = metadata.get("telemetry_file") or os.path.basename(snapshot_path_for(fp))
+        try:
+            os.remove(os.path.join(folder, snapshot_name))
+        except OSError:
+            pass
+
+        # Remove metadata row
+        self._remove_photo_metadata(folder, filename)
 
-        self.load_images(folder)
+        # Drop only this photo from the list
+        self._remove_image_item(fp)
 
         # Decide which row to select next
         new_count = model.rowCount()
@@ -336,29 +604,55 @@ class ImageController:
         tags = self._build_tag_map(index, self._photo_target_folder)
         base_name = self._expand_filename_template(template, tags)
 
-        out_path = self._safe_output_path(
-            self._photo_target_folder,
-            base_name,
-            ".png"
-        )
+        fmt = self.ui.PhotoFormatComboBox.currentData() or DEFAULT_OUTPUT_FORMAT
+        ext = OUTPUT_FORMATS[fmt][1]
+
+        try:
+            os.makedirs(self._photo_target_folder, exist_ok=True)
+            out_path = self._safe_output_path(
+                self._photo_target_folder,
+                base_name,
+                ext
+            )
+        except Exception as e:
+            QMessageBox.warning(None, "Error", f"Could not create output file: {e}")
+            self._photo_timer.stop()
+            self._photos_remaining = 0
+            return
 
         # -------------------------
         # Take photo
         # -------------------------
         try:
             print(f"Taking photo {index}, saving to {out_path}...")
-            img = take_photo(exposure_us=exposure, gain_db=gain)
+            camera_info = {}
+            # The telemetry window is anchored at the start of the exposure
+            snapshot_requests = []
+            img = take_photo(
+                exposure_us=exposure,
+                gain_db=gain,
+                raw_frame=(fmt == "npy"),
+                roi=self._camera_roi(),
+                binning=self.ui.BinningComboBox.currentData() or 1,
+                info=camera_info,
+                bayer_transfer=self.ui.BayerTransferCheckBox.isChecked(),
+                on_trigger=lambda: snapshot_requests.append(
+                    SnapshotRequest(buffer, exposure * 1e-6)
+                ),
+            )
         except Exception as e:
+            self._output_names.release(out_path)
             QMessageBox.warning(None, "Error", f"Failed taking photo: {e}")
             self._photo_timer.stop()
             self._photos_remaining = 0
             return
 
         # -------------------------
-        # Validate and save image
+        # Validate image and queue it for writing
         # -------------------------
         try:
             if img is None:
+                self._output_names.release(out_path)
                 QMessageBox.warning(None, "Error", "take_photo returned None")
                 return
 
@@ -373,59 +667,119 @@ class ImageController:
 
             print("[DEBUG]", info)
 
-            os.makedirs(os.path.dirname(out_path), exist_ok=True)
-
             # Convert to uint8 if needed
-            if isinstance(img, np.ndarray):
-                if img.dtype != np.uint8:
-                    if np.issubdtype(img.dtype, np.floating):
-                        m = np.nanmax(img)
-                        if m <= 1.0:
-                            img2 = (img * 255.0).astype(np.uint8)
-                        else:
-                            img2 = np.clip(img, 0, 255).astype(np.uint8)
-                    else:
-                        img2 = np.clip(img, 0, 255).astype(np.uint8)
-                else:
-                    img2 = img
-            else:
+            if not isinstance(img, np.ndarray):
+                self._output_names.release(out_path)
                 QMessageBox.warning(None, "Error", "Returned image is not an ndarray")
                 return
 
-            print(f"Saving photo to {out_path}...")
-            # OpenCV uses BGR ordering; Pillow expects RGB. Convert before saving.
-            if isinstance(img2, np.ndarray) and img2.ndim == 3 and img2.shape[2] == 3:
-                img2 = cv2.cvtColor(img2, cv2.COLOR_BGR2RGB)
-            pil_img = Image.fromarray(img2)
-            pil_img.save(out_path)
-
-            # -------------------------
-            # Save metadata to CSV
-            # -------------------------
-            csv_path = self._csv_path_for_set(self._photo_target_folder)
-            self._ensure_csv_header(csv_path)
+            img2 = to_uint8(img)
 
+            # Metadata is collected now so it matches the moment of the
+            # exposure, and written once the frame is on disk.
             metadata = self._collect_photo_metadata(
                 filename=os.path.basename(out_path),
                 index=index,
             )
+            metadata.update(camera_info)
+
+            metadata["telemetry_file"] = os.path.basename(snapshot_path_for(out_path))
+
+            self._pending_writes[out_path] = (self._photo_target_folder, metadata)
 
-            self._append_csv_row(csv_path, metadata)
-            print("Saved photo using Pillow")
+            task = FrameWriteTask(img2, out_path, fmt, self.ui.PngCompressionSpinBox.value())
+            task.signals.saved.connect(self._on_photo_saved)
+            task.signals.error.connect(self._on_photo_save_error)
+
+            # The telemetry of the exposure is still queued behind this call;
+            # the frame is written with its snapshot once it has reached the buffers
+            request = snapshot_requests[0]
+            QTimer.singleShot(
+                int(DEFAULT_SNAPSHOT_SETTLE_S * 1000),
+                lambda: self._start_frame_write(task, request),
+            )
 
         except Exception as e:
+            self._pending_writes.pop(out_path, None)
+            self._output_names.release(out_path)
             QMessageBox.warning(None, "Error", f"Failed saving photo: {e}")
             return
 
         # -------------------------
-        # Update UI and counters
+        # Update counters
         # -------------------------
-        self.load_images(self._photo_target_folder)
-
         self._photos_remaining -= 1
         if self._photos_remaining <= 0:
             self._photo_timer.stop()
 
+    def _start_frame_write(self, task, request):
+        try:
+            task.snapshot = request.capture()
+        except Exception as e:
+            print(f"[ERROR] Reading telemetry snapshot for {task.out_path}: {e}")
+        print(f"Saving photo to {task.out_path} ({task.fmt})...")
+        self._writer_pool.start(task)
+
+    def _on_photo_saved(self, out_path):
+        pending = self._pending_writes.pop(out_path, None)
+        if pending is None:
+            return
+
+        # -------------------------
+        # Save metadata to the catalog
+        # -------------------------
+        folder, metadata = pending
+        try:
+            self._store_photo_metadata(folder, metadata)
+        except Exception as e:
+            QMessageBox.warning(None, "Error", f"Failed saving metadata: {e}")
+
+        print(f"Saved photo {out_path}")
+
+        # -------------------------
+        # Update UI
+        # -------------------------
+        folder = os.path.dirname(out_path)
+        if self._list_folder and os.path.normpath(self._list_folder) == os.path.normpath(folder):
+            self._add_image_item(out_path)
+
+    def _on_photo_save_error(self, out_path, msg):
+        self._pending_writes.pop(out_path, None)
+        self._output_names.release(out_path)
+        QMessageBox.warning(None, "Error", f"Failed saving photo: {msg}")
+
+    def on_photo_format_changed(self, *_):
+        fmt = self.ui.PhotoFormatComboBox.currentData() or DEFAULT_OUTPUT_FORMAT
+        self.settings.setValue("photo_output_format", fmt)
+        self.ui.PngCompressionSpinBox.setEnabled(fmt == "png")
+
+    def _roi_spin_boxes(self):
+        return {
+            "camera_roi_x": self.ui.RoiXSpinBox,
+            "camera_roi_y": self.ui.RoiYSpinBox,
+            "camera_roi_width": self.ui.RoiWidthSpinBox,
+            "camera_roi_height": self.ui.RoiHeightSpinBox,
+        }
+
+    def _camera_roi(self):
+        # (x, y, w, h) to read from the sensor, or None for the full frame
+        if not self.ui.RoiCheckBox.isChecked():
+            return None
+        return (
+            self.ui.RoiXSpinBox.value(),
+            self.ui.RoiYSpinBox.value(),
+            self.ui.RoiWidthSpinBox.value(),
+            self.ui.RoiHeightSpinBox.value(),
+        )
+
+    def on_camera_roi_changed(self, *_):
+        enabled = self.ui.RoiCheckBox.isChecked()
+        self.settings.setValue("camera_roi_enabled", enabled)
+        for key, spin in self._roi_spin_boxes().items():
+            spin.setEnabled(enabled)
+            self.settings.setValue(key, spin.value())
+        self.settings.setValue("camera_binning", self.ui.BinningComboBox.currentData() or 1)
+
     def delete_set(self):
         sel = self.ui.PhotoSetTreeView.currentIndex()
         if not sel or not sel.isValid():
@@ -451,6 +805,15 @@ class ImageController:
             QMessageBox.warning(None, "Error", f"Could not delete folder: {e}")
             return
 
+        self._output_names.forget(path)
+
+        # Forget the metadata of the set (and of nested sets)
+        if self.catalog is not None:
+            try:
+                self.catalog.remove_set(path)
+            except Exception as e:
+                print(f"[ERROR] Failed to update photo catalog: {e}")
+
         # Refresh model and clear list view
         self.dir_model.setRootPath(self.root_dir)
         parent = sel.parent()
@@ -459,7 +822,8 @@ class ImageController:
         else:
             self.ui.PhotoSetTreeView.setRootIndex(self.dir_model.index(self.root_dir))
 
-        self.list_model.clear()
+        self._watch_folder(None)
+        self._clear_photo_list()
 
     def open_image(self, index):
         fp = index.data(Qt.UserRole + 1)
@@ -473,6 +837,24 @@ class ImageController:
 
 
     def _load_root_directory(self, directory):
+        if self.thumb_cache is not None:
+            self.thumb_cache.close()
+            self.thumb_cache = None
+
+        try:
+            self.thumb_cache = ThumbnailCache(os.path.join(directory, THUMBNAIL_DB_NAME))
+        except Exception as e:
+            print(f"[WARN] Thumbnail cache disabled: {e}")
+
+        if self.catalog is not None:
+            self.catalog.close()
+            self.catalog = None
+
+        try:
+            self.catalog = PhotoCatalog(directory)
+        except Exception as e:
+            QMessageBox.warning(None, "Error", f"Could not open the photo catalog: {e}")
+
         self.dir_model = QFileSystemModel()
         self.dir_model.setFilter(QDir.NoDotAndDotDot | QDir.AllDirs)
         self.dir_model.setRootPath(directory)
@@ -556,67 +938,49 @@ class ImageController:
 
 
     def _safe_output_path(self, folder: str, base_name: str, ext: str) -> str:
-        path = Path(folder) / f"{base_name}{ext}"
+        # Reserves the returned path by creating it (empty) on disk
+        return self._output_names.reserve(folder, base_name, ext)
 
-        if not path.exists():
-            return str(path)
+    def _import_set_metadata(self, folder: str):
+        """Bring a set's legacy metadata.csv into the catalog (once per file version)."""
+        if self.catalog is None:
+            return
 
-        # Auto-append counter
-        i = 1
-        while True:
-            new_path = Path(folder) / f"{base_name}_{i:03d}{ext}"
-            if not new_path.exists():
-                return str(new_path)
-            i += 1
+        try:
+            n = self.catalog.import_csv_if_changed(folder)
+            if n:
+                print(f"Imported {n} metadata rows from {folder}")
+        except Exception as e:
+            print(f"[ERROR] Importing metadata CSV: {e}")
 
-    def _csv_path_for_set(self, folder: str) -> str:
-        return os.path.join(folder, "metadata.csv")
+    def export_set_metadata(self):
+        """Write the selected set's metadata to its metadata.csv."""
+        folder = self._list_folder
+        if not folder:
+            QMessageBox.warning(None, "Warning", "No photo set selected.")
+            return
 
-    
-    def _ensure_csv_header(self, csv_path: str):
-        if os.path.exists(csv_path):
-            return
-
-        with open(csv_path, "w", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            writer.writerow([
-                "filename",
-                "timestamp",
-                "photo_index",
-                "amp",
-                "rpm_cmd",
-                "rpm_measured",
-                "speed_last",
-                "accel_last",
-                "speed_max",
-                "accel_max",
-                "kp",
-                "tooth_length",
-                "exposure_us",
-                "gain",
-                "set_name",
-            ])
+        if self.catalog is None:
+            QMessageBox.warning(None, "Warning", "No photo catalog open.")
+            return
+
+        try:
+            n = self.catalog.export_csv(folder)
+        except Exception as e:
+            QMessageBox.warning(None, "Error", f"Could not export metadata: {e}")
+            return
+
+        QMessageBox.information(
+            None,
+            "Export metadata",
+            f"Exported {n} rows to {os.path.join(folder, 'metadata.csv')}",
+        )
 
     def _collect_photo_metadata(self, filename: str, index: int) -> dict: # Latest values (safe even if empty)
         def last_or_none(buf):
             _, v = buf.get_latest(1)
             return v[0] if v else None
 
-        def max_or_none(buf, window_seconds: float = 1.5):
-            # Return the maximum value from the last `window_seconds` seconds
-            ts, vals = buf.get_all()
-            if not ts or not vals:
-                return None
-
-            last_t = ts[-1]
-            cutoff = last_t - float(window_seconds)
-
-            recent = [v for t, v in zip(ts, vals) if t >= cutoff]
-            if recent:
-                return max(recent)
-            # fallback to global max if no recent samples
-            return max(vals) if vals else None
-
         return {
             "filename": filename,
             "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
@@ -627,7 +991,7 @@ class ImageController:
             "speed_last": last_or_none(buffer.speed),
             "accel_last": last_or_none(buffer.acceleration),
             "speed_max": last_or_none(buffer.speed_peaks),
-            "accel_max": max_or_none(buffer.acceleration, 1.5),
+            "accel_max": self.accel_window.max,
             "kp": self.ui.KpSpinBox.value(),
             "tooth_length": self.ui.toothLengthSpinBox.value(),
             "exposure_us": int(self.ui.ExposureTimeSpinBox.value() * 1_000_000),
@@ -637,10 +1001,12 @@ class ImageController:
 
 
     
-    def _append_csv_row(self, csv_path: str, data: dict):
-        with open(csv_path, "a", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=data.keys())
-            writer.writerow(data)
+    def _store_photo_metadata(self, folder: str, data: dict):
+        if self.catalog is None:
+            raise RuntimeError("No photo catalog open")
+
+        self._import_set_metadata(folder)
+        self.catalog.add(folder, data)
 
 
     def on_photo_selection_changed(self, current, previous):
@@ -669,18 +1035,13 @@ class ImageController:
 
 
     def _read_photo_metadata(self, folder: str, filename: str) -> dict | None:
-        csv_path = os.path.join(folder, "metadata.csv")
-        if not os.path.isfile(csv_path):
+        if self.catalog is None:
             return None
 
         try:
-            with open(csv_path, newline="", encoding="utf-8") as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    if row.get("filename") == filename:
-                        return row
+            return self.catalog.get(folder, filename)
         except Exception as e:
-            print(f"[ERROR] Reading metadata CSV: {e}")
+            print(f"[ERROR] Reading photo catalog: {e}")
 
         return None
 
@@ -699,31 +1060,11 @@ class ImageController:
         self.ui.PhotoInfoTextBrowser.setHtml("".join(lines))
 
 
-    def _remove_csv_row(self, folder: str, filename: str):
-        csv_path = os.path.join(folder, "metadata.csv")
-        if not os.path.isfile(csv_path):
-            return  # No metadata file, nothing to do
+    def _remove_photo_metadata(self, folder: str, filename: str):
+        if self.catalog is None:
+            return
 
         try:
-            with open(csv_path, newline="", encoding="utf-8") as f:
-                reader = csv.DictReader(f)
-                rows = list(reader)
-                fieldnames = reader.fieldnames
-
-            if not fieldnames:
-                return
-
-            # Filter out the row matching this filename
-            new_rows = [row for row in rows if row.get("filename") != filename]
-
-            # If nothing changed, avoid rewriting
-            if len(new_rows) == len(rows):
-                return
-
-            with open(csv_path, "w", newline="", encoding="utf-8") as f:
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
-                writer.writeheader()
-                writer.writerows(new_rows)
-
+            self.catalog.remove(folder, filename)
         except Exception as e:
-            print(f"[ERROR] Failed to update metadata CSV: {e}")
+            print(f"[ERROR] Failed to update photo catalog: {e}")
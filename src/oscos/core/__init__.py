@@ -1,4 +1,15 @@
 from .data_buffer import buffer
 from .serial_manager import serial_mgr
-from .processors import SpeedProcessor, AccelerationProcessor, SpeedCorrectedProcessor, SpeedPeakDetection
-from .take_photo import take_photo
\ No newline at end of file
+from .processors import SpeedProcessor, AccelerationProcessor, SpeedCorrectedProcessor, SpeedPeakDetection, SpectrumProcessor, PLLTracker, DampingEstimator, FilterProcessor, SlidingExtremum, KalmanEstimator, EdgeGlitchFilter, ModelSignCorrector, SIGN_CORRECTORS, DEFAULT_SIGN_CORRECTOR
+from .take_photo import take_photo, BINNING_FACTORS
+from .image_io import OUTPUT_FORMATS, DEFAULT_OUTPUT_FORMAT, RAW_EXTS, to_uint8, read_preview, save_frame
+from .thumbnail_cache import ThumbnailCache, THUMBNAIL_DB_NAME
+from .catalog import PhotoCatalog, CATALOG_DB_NAME, find_catalog
+from .output_names import OutputNameRegistry
+from .telemetry_snapshot import capture_snapshot, snapshot_path_for, SnapshotRequest, DEFAULT_SNAPSHOT_MARGIN_S, DEFAULT_SNAPSHOT_SETTLE_S
+from .session_store import SessionStore, SessionReader, load_session
+from .exporter import EXPORT_FORMATS, DEFAULT_EXPORT_FORMAT, ALIGN_TARGETS, DEFAULT_ALIGN_TARGET, DEFAULT_ALIGN_RATE, align_options, export_signals
+from .resample import resample_signals
+from .session_clock import SessionClock
+from .filters import SavgolFilter, ACCEL_FILTERS, DEFAULT_ACCEL_FILTER, ZERO_PHASE_SOURCES, zero_phase
+from .running_stats import RunningStats, WindowedStats, LCD_MODES, DEFAULT_LCD_MODE
\ No newline at end of file
@@ -0,0 +1,199 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+import cv2
+import numpy as np
+from .image_io import RAW_EXTS, load_raw
+from .catalog import PhotoCatalog, find_catalog
+
+
+# Captures the amplitude measurement can read
+MEASURABLE_EXTS = {".png", ".tif", ".tiff", ".bmp", ".jpg", ".jpeg"} | RAW_EXTS
+
+
+def read_gray_roi(path, roi=None):
+    """Return (gray ROI as float32, (x0, y0), scale) for one capture.
+
+    `roi` is (x, y, w, h) in full-frame pixels. Raw Bayer captures are read
+    through a memory map, only the ROI rows are touched, and each 2x2 cell is
+    averaged into one gray pixel (scale 2); other images have scale 1.
+    """
+    ext = os.path.splitext(path)[1].lower()
+
+    if ext in RAW_EXTS:
+        raw = load_raw(path)
+        if raw.ndim == 2:
+            h, w = raw.shape
+            x, y, rw, rh = roi or (0, 0, w, h)
+            # Snap to whole Bayer cells
+            x0, y0 = x - x % 2, y - y % 2
+            x1, y1 = min(w, x + rw), min(h, y + rh)
+            x1 -= (x1 - x0) % 2
+            y1 -= (y1 - y0) % 2
+            cells = np.asarray(raw[y0:y1, x0:x1], dtype=np.float32)
+            gray = 0.25 * (cells[0::2, 0::2] + cells[0::2, 1::2]
+                           + cells[1::2, 0::2] + cells[1::2, 1::2])
+            return gray, (x0, y0), 2
+        img = cv2.cvtColor(np.asarray(raw), cv2.COLOR_BGR2GRAY)
+    else:
+        img = cv2.imread(path, cv2.IMREAD_GRAYSCALE)
+        if img is None:
+            raise RuntimeError(f"Could not read {path}")
+
+    if roi is None:
+        return img.astype(np.float32), (0, 0), 1
+
+    x, y, rw, rh = roi
+    return img[y:y + rh, x:x + rw].astype(np.float32), (x, y), 1
+
+
+def measure_profile(profile, polarity="auto", level=0.5, smooth=5, border=0.05):
+    """Locate the part's extent on a 1-D profile along the motion axis.
+
+    The background level and noise are taken from the `border` fraction of
+    samples at each end of the profile, so the ROI must reach past the
+    trail on both sides; the trail itself may cover most of the ROI. The
+    extent runs from the first to the last sample above `level` times the
+    peak contrast: a sinusoidal blur trail is brightest at its two turning
+    points and much dimmer in the middle, so the samples in between need
+    not stand out. `polarity` is "bright", "dark" or "auto" (larger
+    contrast wins).
+
+    Returns (start, end, centroid) in profile samples, end exclusive, or
+    None if nothing stands out from the background.
+    """
+    profile = np.asarray(profile, dtype=np.float32)
+    if smooth > 1 and profile.size > smooth:
+        # Pad with the end values so the smoothing does not darken the borders
+        k = int(smooth)
+        padded = np.pad(profile, (k // 2, k - 1 - k // 2), mode="edge")
+        profile = np.convolve(padded, np.ones(k, dtype=np.float32) / k, mode="valid")
+
+    n = max(1, int(round(profile.size * border)))
+    edges = np.concatenate((profile[:n], profile[-n:]))
+    background = float(np.median(edges))
+    noise = float(np.median(np.abs(edges - background))) * 1.4826
+
+    bright = profile - background
+    if polarity == "bright" or (polarity == "auto" and bright.max() >= -bright.min()):
+        signal = bright
+    elif polarity in ("dark", "auto"):
+        signal = -bright
+    else:
+        raise ValueError(f"Invalid polarity: {polarity}")
+
+    peak = float(signal.max())
+    if peak <= 0.0 or peak <= 3.0 * noise:
+        return None
+
+    above = np.flatnonzero(signal >= level * peak)
+    start, end = int(above[0]), int(above[-1]) + 1
+
+    weights = np.clip(signal[start:end], 0.0, None)
+    centroid = float(np.dot(np.arange(start, end), weights) / weights.sum())
+    return start, end, centroid
+
+
+def measure_frame(path, roi=None, axis="x", polarity="auto", level=0.5, smooth=5):
+    """Locate the oscillating part in one capture along `axis` ("x" or "y").
+
+    The ROI is projected onto the motion axis and measured with
+    measure_profile: for long exposures the extent is the motion-blur
+    trail, i.e. the full travel plus the part's own width.
+
+    Returns a dict with extent_px, start_px, end_px and centroid_px in
+    full-frame pixels, or None if nothing stands out from the background.
+    """
+    gray, (x0, y0), scale = read_gray_roi(path, roi)
+    if gray.size == 0:
+        raise ValueError("Empty ROI")
+
+    if axis == "x":
+        profile, origin = gray.mean(axis=0), x0
+    elif axis == "y":
+        profile, origin = gray.mean(axis=1), y0
+    else:
+        raise ValueError(f"Invalid axis: {axis}")
+
+    found = measure_profile(profile, polarity, level, smooth)
+    if found is None:
+        return None
+    start, end, centroid = found
+
+    return {
+        "extent_px": (end - start) * scale,
+        "start_px": origin + start * scale,
+        "end_px": origin + end * scale,
+        "centroid_px": origin + (centroid + 0.5) * scale,
+    }
+
+
+def amplitude_from_extent(extent_px, object_width_px=0.0):
+    """Half of the travel: the blur trail minus the part's own width, halved."""
+    return max(0.0, float(extent_px) - float(object_width_px)) / 2.0
+
+
+def _measure_job(args):
+    path, roi, axis, polarity, level = args
+    try:
+        return path, measure_frame(path, roi, axis, polarity, level), None
+    except Exception as e:
+        return path, None, str(e)
+
+
+def measure_folder(folder, roi=None, axis="x", object_width_px=0.0, mm_per_px=None,
+                   polarity="auto", level=0.5, workers=None, write=True, catalog_root=None):
+    """Measure the oscillation amplitude on every capture of a set with a process pool.
+
+    Results are written to the photo catalog (`amp_measured_px` and, with a
+    `mm_per_px` scale, `amp_measured_mm`) unless `write` is False. The catalog
+    governing `folder` is used, or the one in `catalog_root` if given.
+    Returns a list of (filename, result dict or None, error or None).
+    """
+    paths = [
+        os.path.join(folder, entry)
+        for entry in sorted(os.listdir(folder))
+        if os.path.splitext(entry)[1].lower() in MEASURABLE_EXTS
+    ]
+    if not paths:
+        return []
+
+    jobs = [(p, roi, axis, polarity, level) for p in paths]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        measured = list(pool.map(_measure_job, jobs))
+
+    results = []
+    for path, frame, err in measured:
+        if frame is not None:
+            frame["amp_measured_px"] = amplitude_from_extent(frame["extent_px"], object_width_px)
+            if mm_per_px is not None:
+                frame["amp_measured_mm"] = frame["amp_measured_px"] * float(mm_per_px)
+        elif err is None:
+            err = "No oscillating part found in the ROI"
+        results.append((os.path.basename(path), frame, err))
+
+    if write:
+        _store_amplitudes(folder, results, catalog_root)
+
+    return results
+
+
+def _store_amplitudes(folder, results, catalog_root=None):
+    if catalog_root is None:
+        db_path = find_catalog(folder)
+        if db_path is None:
+            raise RuntimeError(f"No photo catalog found for {folder}")
+        catalog_root = os.path.dirname(db_path)
+
+    catalog = PhotoCatalog(catalog_root)
+    try:
+        catalog.import_csv_if_changed(folder)
+        for filename, frame, err in results:
+            if frame is None:
+                continue
+            catalog.update(folder, filename, {
+                key: frame[key]
+                for key in ("amp_measured_px", "amp_measured_mm")
+                if key in frame
+            })
+    finally:
+        catalog.close()
@@ -0,0 +1,359 @@
+import os
+import re
+import csv
+import sqlite3
+
+
+# File name of the photo catalog, stored hidden inside the photo root
+CATALOG_DB_NAME = ".oscos_catalog.sqlite"
+
+# Name of the per-set CSV used before the catalog existed (and for export)
+METADATA_CSV_NAME = "metadata.csv"
+
+# Known metadata columns, in export order, with their SQLite type affinity.
+# Keys that are not listed here are added as untyped columns on first use.
+COLUMNS = {
+    "filename": "TEXT",
+    "timestamp": "TEXT",
+    "photo_index": "INTEGER",
+    "amp": "NUMERIC",
+    "rpm_cmd": "REAL",
+    "rpm_measured": "REAL",
+    "speed_last": "REAL",
+    "accel_last": "REAL",
+    "speed_max": "REAL",
+    "accel_max": "REAL",
+    "kp": "REAL",
+    "tooth_length": "REAL",
+    "exposure_us": "INTEGER",
+    "gain": "REAL",
+    "set_name": "TEXT",
+    "telemetry_file": "TEXT",
+    "amp_measured_px": "REAL",
+    "amp_measured_mm": "REAL",
+    "roi_x": "INTEGER",
+    "roi_y": "INTEGER",
+    "roi_width": "INTEGER",
+    "roi_height": "INTEGER",
+    "binning": "INTEGER",
+    "pixel_format": "TEXT",
+}
+
+_IDENT_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+def _quote(name):
+    # Column names go into SQL as quoted identifiers, so reserved words ("order") work
+    return '"' + name.replace('"', '""') + '"'
+
+
+def find_catalog(folder):
+    """Return the catalog file governing `folder` (searching parents), or None."""
+    folder = os.path.abspath(folder)
+    while True:
+        candidate = os.path.join(folder, CATALOG_DB_NAME)
+        if os.path.isfile(candidate):
+            return candidate
+        parent = os.path.dirname(folder)
+        if parent == folder:
+            return None
+        folder = parent
+
+
+class PhotoCatalog:
+    """Photo metadata for every set under a photo root, in one SQLite file.
+
+    Each photo is one row keyed by (set, filename), where `set` is the set
+    folder relative to the root. Every write is its own transaction.
+    """
+
+    def __init__(self, root):
+        self.root = os.path.abspath(root)
+        self.db_path = os.path.join(self.root, CATALOG_DB_NAME)
+
+        self._conn = sqlite3.connect(self.db_path)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+
+        with self._conn:
+            cols = ", ".join(f"{name} {affinity}" for name, affinity in COLUMNS.items())
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS photos ("
+                " id INTEGER PRIMARY KEY,"
+                " set_path TEXT NOT NULL,"
+                f" {cols},"
+                " UNIQUE(set_path, filename))"
+            )
+            self._columns = self._table_columns()
+
+            # Catalogs created by older versions may miss newer known columns
+            for name, affinity in COLUMNS.items():
+                if name not in self._columns:
+                    self._add_column(name, affinity)
+
+            for name, column in (
+                ("photos_set", "set_path"),
+                ("photos_rpm_cmd", "rpm_cmd"),
+                ("photos_rpm_measured", "rpm_measured"),
+                ("photos_amp", "amp"),
+                ("photos_timestamp", "timestamp"),
+            ):
+                self._conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON photos({column})")
+
+            # Per-set record of imported CSVs, so a stale CSV is not re-imported
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS csv_imports ("
+                " set_path TEXT PRIMARY KEY,"
+                " mtime_ns INTEGER NOT NULL)"
+            )
+
+    #--------------------------------
+    # Helpers
+    #--------------------------------
+    def set_key(self, folder):
+        rel = os.path.relpath(os.path.abspath(folder), self.root)
+        return rel.replace(os.sep, "/")
+
+    def _table_columns(self):
+        return [r["name"] for r in self._conn.execute("PRAGMA table_info(photos)")]
+
+    def _csv_columns(self, fieldnames):
+        """Map the header of a metadata CSV to catalog column names.
+
+        Names that are not identifiers are sanitized (other characters become
+        "_", a leading digit gets a "_" prefix) with a warning; names that
+        differ from a catalog column only by case use that column. Empty
+        names and names colliding with an earlier one are skipped.
+        """
+        existing = {c.lower(): c for c in self._columns}
+        mapping, used = {}, {"id", "set_path"}
+        for name in fieldnames or ():
+            column = (name or "").strip()
+            if not _IDENT_RE.match(column):
+                column = re.sub(r"\W", "_", column, flags=re.ASCII)
+                if column[:1].isdigit():
+                    column = "_" + column
+                if column.strip("_"):
+                    print(f"[WARN] Metadata column {name!r} imported as {column!r}")
+                else:
+                    print(f"[WARN] Skipping metadata column {name!r}")
+                    continue
+            if column.lower() in used:
+                print(f"[WARN] Skipping duplicate metadata column {name!r}")
+                continue
+            used.add(column.lower())
+            mapping[name] = existing.get(column.lower(), column)
+        return mapping
+
+    def _add_column(self, name, affinity=""):
+        if not _IDENT_RE.match(name):
+            raise ValueError(f"Invalid metadata column name: {name!r}")
+        self._conn.execute(f"ALTER TABLE photos ADD COLUMN {_quote(name)} {affinity}".rstrip())
+        self._columns.append(name)
+
+    def _upsert(self, key, data):
+        for name in data:
+            if name not in self._columns:
+                self._add_column(name, COLUMNS.get(name, ""))
+
+        # Columns not given keep their values and the row keeps its id (capture order)
+        names = ["set_path"] + list(data)
+        values = [key] + [None if v == "" else v for v in data.values()]
+        updates = [_quote(name) for name in data if name != "filename"]
+        if updates:
+            action = "DO UPDATE SET " + ", ".join(f"{name}=excluded.{name}" for name in updates)
+        else:
+            action = "DO NOTHING"
+        self._conn.execute(
+            f"INSERT INTO photos ({', '.join(_quote(name) for name in names)})"
+            f" VALUES ({', '.join('?' * len(names))})"
+            f" ON CONFLICT(set_path, filename) {action}",
+            values,
+        )
+
+    @staticmethod
+    def _row_dict(row):
+        d = dict(row)
+        d.pop("id", None)
+        d.pop("set_path", None)
+        return d
+
+    #--------------------------------
+    # Per-photo access
+    #--------------------------------
+    def add(self, folder, data):
+        """Insert the metadata of one photo in set `folder` (or update the given columns)."""
+        with self._conn:
+            self._upsert(self.set_key(folder), data)
+
+    def update(self, folder, filename, data):
+        """Set some columns of one photo, keeping the others (inserts if missing)."""
+        key = self.set_key(folder)
+        with self._conn:
+            for name in data:
+                if name not in self._columns:
+                    self._add_column(name, COLUMNS.get(name, ""))
+
+            values = [None if v == "" else v for v in data.values()]
+            cur = self._conn.execute(
+                f"UPDATE photos SET {', '.join(f'{_quote(name)}=?' for name in data)}"
+                " WHERE set_path=? AND filename=?",
+                values + [key, filename],
+            )
+            if cur.rowcount == 0:
+                self._upsert(key, {"filename": filename, **data})
+
+    def get(self, folder, filename):
+        row = self._conn.execute(
+            "SELECT * FROM photos WHERE set_path=? AND filename=?",
+            (self.set_key(folder), filename),
+        ).fetchone()
+        return self._row_dict(row) if row is not None else None
+
+    def remove(self, folder, filename):
+        with self._conn:
+            cur = self._conn.execute(
+                "DELETE FROM photos WHERE set_path=? AND filename=?",
+                (self.set_key(folder), filename),
+            )
+        return cur.rowcount > 0
+
+    def rename(self, folder, old, new):
+        with self._conn:
+            cur = self._conn.execute(
+                "UPDATE OR REPLACE photos SET filename=? WHERE set_path=? AND filename=?",
+                (new, self.set_key(folder), old),
+            )
+        return cur.rowcount > 0
+
+    def remove_set(self, folder):
+        """Forget a set and every set nested inside it."""
+        key = self.set_key(folder)
+        like = key.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "/%"
+        with self._conn:
+            for table in ("photos", "csv_imports"):
+                self._conn.execute(
+                    f"DELETE FROM {table} WHERE set_path=? OR set_path LIKE ? ESCAPE '\\'",
+                    (key, like),
+                )
+
+    #--------------------------------
+    # Queries across sets
+    #--------------------------------
+    def query(self, folder=None, amp=None, rpm_min=None, rpm_max=None,
+              since=None, until=None, rpm_column="rpm_measured"):
+        """Return photo rows matching every given filter, in capture order.
+
+        `since`/`until` compare against the "YYYY-MM-DD HH:MM:SS" timestamp.
+        Each returned dict carries its set (relative to the root) as "set_path".
+        """
+        if rpm_column not in ("rpm_measured", "rpm_cmd"):
+            raise ValueError(f"Invalid rpm column: {rpm_column}")
+
+        where, args = [], []
+        if folder is not None:
+            where.append("set_path=?")
+            args.append(self.set_key(folder))
+        if amp is not None:
+            where.append("amp=?")
+            args.append(amp)
+        if rpm_min is not None:
+            where.append(f"{rpm_column}>=?")
+            args.append(rpm_min)
+        if rpm_max is not None:
+            where.append(f"{rpm_column}<=?")
+            args.append(rpm_max)
+        if since is not None:
+            where.append("timestamp>=?")
+            args.append(since)
+        if until is not None:
+            where.append("timestamp<=?")
+            args.append(until)
+
+        sql = "SELECT * FROM photos"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY id"
+
+        rows = []
+        for row in self._conn.execute(sql, args):
+            d = self._row_dict(row)
+            d["set_path"] = row["set_path"]
+            rows.append(d)
+        return rows
+
+    #--------------------------------
+    # CSV compatibility
+    #--------------------------------
+    def import_csv(self, folder, csv_path=None):
+        """Import a set's metadata CSV into the catalog. Returns the row count."""
+        csv_path = csv_path or os.path.join(folder, METADATA_CSV_NAME)
+        key = self.set_key(folder)
+
+        with open(csv_path, newline="", encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+            rows = list(reader)
+        columns = self._csv_columns(reader.fieldnames)
+
+        mtime_ns = os.stat(csv_path).st_mtime_ns
+        with self._conn:
+            for row in rows:
+                data = {columns[name]: value for name, value in row.items() if name in columns}
+                if data.get("filename"):
+                    self._upsert(key, data)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO csv_imports (set_path, mtime_ns) VALUES (?, ?)",
+                (key, mtime_ns),
+            )
+        return len(rows)
+
+    def import_csv_if_changed(self, folder):
+        """Import `folder`'s metadata.csv unless this exact file was imported before.
+
+        Returns the number of imported rows (0 if nothing was done).
+        """
+        csv_path = os.path.join(folder, METADATA_CSV_NAME)
+        try:
+            mtime_ns = os.stat(csv_path).st_mtime_ns
+        except OSError:
+            return 0
+
+        row = self._conn.execute(
+            "SELECT mtime_ns FROM csv_imports WHERE set_path=?", (self.set_key(folder),)
+        ).fetchone()
+        if row is not None and row["mtime_ns"] == mtime_ns:
+            return 0
+
+        return self.import_csv(folder, csv_path)
+
+    def export_csv(self, folder, csv_path=None):
+        """Write a set's metadata as CSV (metadata.csv by default). Returns the row count."""
+        csv_path = csv_path or os.path.join(folder, METADATA_CSV_NAME)
+        key = self.set_key(folder)
+        fieldnames = [c for c in self._columns if c not in ("id", "set_path")]
+
+        rows = self._conn.execute(
+            "SELECT * FROM photos WHERE set_path=? ORDER BY id", (key,)
+        ).fetchall()
+
+        tmp_path = csv_path + ".tmp"
+        with open(tmp_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction="ignore")
+            writer.writeheader()
+            for row in rows:
+                writer.writerow(self._row_dict(row))
+        os.replace(tmp_path, csv_path)
+
+        # The exported file matches the catalog: do not import it back
+        if os.path.abspath(csv_path) == os.path.abspath(os.path.join(folder, METADATA_CSV_NAME)):
+            with self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO csv_imports (set_path, mtime_ns) VALUES (?, ?)",
+                    (key, os.stat(csv_path).st_mtime_ns),
+                )
+
+        return len(rows)
+
+    def close(self):
+        self._conn.close()
@@ -1,29 +1,42 @@
 from collections import deque
+from itertools import islice
 from threading import Lock
-import time
+from .session_clock import SessionClock
+from .running_stats import RunningStats, WindowedStats, DEFAULT_STATS_WINDOW_S
 
 class TelemetryBuffer:
-    def __init__(self, maxlen=100000):
+    def __init__(self, maxlen=100000, clock=None, stats=False, stats_window=DEFAULT_STATS_WINDOW_S):
         self.timestamps = deque(maxlen=maxlen)
         self.values = deque(maxlen=maxlen)
         self.lock = Lock()
         self._subscribers = []
-        self._t0 = None
+        self.clock = clock if clock is not None else SessionClock()
+
+        # Optional running statistics, updated as samples are added (see stats())
+        self._run_stats = RunningStats() if stats else None
+        self._window_stats = WindowedStats(stats_window) if stats else None
 
     def subscribe(self, callback):
         self._subscribers.append(callback)
 
+    def unsubscribe(self, callback):
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
     def add(self, value, timestamp=None):
+        """Append a sample at `timestamp` (session seconds, see SessionClock).
+
+        Samples without a timestamp are timed on arrival with the host clock.
+        """
+        if timestamp is None:
+            timestamp = self.clock.now()
+
         with self.lock:
-            if timestamp == None:
-                if self._t0 is None:
-                    self._t0 = time.time() 
-                self.timestamps.append(time.time() - self._t0)
-            else:
-                if self._t0 is None:
-                    self._t0 = timestamp
-                self.timestamps.append(timestamp - self._t0)
+            self.timestamps.append(timestamp)
             self.values.append(value)
+            if self._run_stats is not None:
+                self._run_stats.add(value)
+                self._window_stats.add(timestamp, value)
 
         for cb in self._subscribers:
             cb(timestamp,value)
@@ -34,23 +47,135 @@ class TelemetryBuffer:
 
     def get_latest(self, n):
         with self.lock:
-            return list(self.timestamps)[-n:], list(self.values)[-n:]
+            n = min(n, len(self.values))
+            ts = list(islice(reversed(self.timestamps), n))
+            vs = list(islice(reversed(self.values), n))
+        ts.reverse()
+        vs.reverse()
+        return ts, vs
+
+    def get_range(self, t_start, t_end=None):
+        """Samples with t_start <= t <= t_end (session seconds).
+
+        The deques are walked backwards from the newest sample, so the cost
+        depends on how far back the range reaches, not on the buffer size.
+        """
+        ts, vs = [], []
+        with self.lock:
+            for t, v in zip(reversed(self.timestamps), reversed(self.values)):
+                if t < t_start:
+                    break
+                if t_end is not None and t > t_end:
+                    continue
+                ts.append(t)
+                vs.append(v)
+        ts.reverse()
+        vs.reverse()
+        return ts, vs
+
+    def get_window(self, seconds):
+        """Samples from the last `seconds` seconds, counted from the newest one."""
+        with self.lock:
+            if not self.timestamps:
+                return [], []
+            t_last = self.timestamps[-1]
+        return self.get_range(t_last - float(seconds))
+
+    def stats(self, windowed=False):
+        """Summary of every sample since the last clear (or, if `windowed`, of
+        the stats window): count, mean, variance, std, rms, min and max.
+
+        None if the buffer keeps no statistics or has no samples. The
+        summary is kept up to date on add, so this does not read the deques.
+        """
+        with self.lock:
+            acc = self._window_stats if windowed else self._run_stats
+            return acc.summary() if acc is not None else None
+
+    @property
+    def t0(self):
+        """Device time of session time 0 (None until the clock has seen one)."""
+        return self.clock.origin
+
+    def clear(self):
+        with self.lock:
+            self.timestamps.clear()
+            self.values.clear()
+            if self._run_stats is not None:
+                self._run_stats.reset()
+                self._window_stats.reset()
+
+class SpectrumBuffer:
+    """Latest spectrum published by a processor: frequencies, power and timestamp.
+
+    Each update replaces the arrays instead of writing into them, so readers
+    get a consistent spectrum without copying.
+    """
+    def __init__(self):
+        self.lock = Lock()
+        self.clear()
+
+    def set(self, frequencies, power, timestamp):
+        with self.lock:
+            self._frequencies = frequencies
+            self._power = power
+            self._timestamp = timestamp
+
+    def get(self):
+        with self.lock:
+            return self._frequencies, self._power, self._timestamp
 
     def clear(self):
-        self.timestamps.clear()
-        self.values.clear()
-        self._t0 = None
+        self.set(None, None, None)
 
 class BufferRegistry:
     def __init__(self):
-        self.raw_timestamps = TelemetryBuffer()
-        self.speed = TelemetryBuffer()
-        self.acceleration = TelemetryBuffer()
-        self.rpm = TelemetryBuffer()
+        # Every buffer shares one timeline, so equal timestamps mean the same instant
+        self.clock = SessionClock()
+
+        self.raw_timestamps = TelemetryBuffer(clock=self.clock)
+
+        # Direction of travel (+1/-1) per edge, when the telemetry has the second encoder channel
+        self.edge_direction = TelemetryBuffer(clock=self.clock)
+
+        # Running count of missed/extra encoder edges repaired by EdgeGlitchFilter
+        self.edge_glitches = TelemetryBuffer(clock=self.clock)
+
+        self.speed = TelemetryBuffer(clock=self.clock, stats=True)
+        self.acceleration = TelemetryBuffer(clock=self.clock, stats=True)
+        self.rpm = TelemetryBuffer(clock=self.clock, stats=True)
         
-        self.speed_corrected = TelemetryBuffer()
-        self.acceleration_corrected = TelemetryBuffer()
+        self.speed_corrected = TelemetryBuffer(clock=self.clock, stats=True)
+        self.acceleration_corrected = TelemetryBuffer(clock=self.clock, stats=True)
+
+        self.speed_peaks = TelemetryBuffer(clock=self.clock)
+
+        # Oscillation frequency of speed_corrected and its latest spectrum
+        self.dominant_frequency = TelemetryBuffer(clock=self.clock)
+        self.speed_spectrum = SpectrumBuffer()
+
+        # PLL tracking of speed_corrected: frequency (Hz), amplitude and phase (rad)
+        self.tracker_frequency = TelemetryBuffer(clock=self.clock)
+        self.tracker_amplitude = TelemetryBuffer(clock=self.clock)
+        self.tracker_phase = TelemetryBuffer(clock=self.clock)
+
+        # Decay estimated from speed_peaks
+        self.log_decrement = TelemetryBuffer(clock=self.clock)
+        self.damping_ratio = TelemetryBuffer(clock=self.clock)
+        self.quality_factor = TelemetryBuffer(clock=self.clock)
+
+        # Kalman estimate from the tooth edges: position (m), speed (m/s), acceleration (m/s^2)
+        self.kalman_position = TelemetryBuffer(clock=self.clock)
+        self.kalman_speed = TelemetryBuffer(clock=self.clock, stats=True)
+        self.kalman_acceleration = TelemetryBuffer(clock=self.clock)
+
+    def get_range(self, names, t_start, t_end=None):
+        """{name: (timestamps, values)} of each buffer in `names` over one time range."""
+        return {name: getattr(self, name).get_range(t_start, t_end) for name in names}
 
-        self.speed_peaks = TelemetryBuffer()
+    def get_window(self, names, seconds):
+        """The last `seconds` seconds of each buffer in `names`, ending now on the session clock."""
+        t_end = self.clock.now()
+        return self.get_range(names, t_end - float(seconds), t_end)
 
 buffer = BufferRegistry()
@@ -0,0 +1,197 @@
+import io
+import os
+import shutil
+import numpy as np
+from .session_store import write_session
+from .resample import resample_signals
+
+
+# Telemetry export formats: key -> (label shown in the UI, extension)
+#  - csv:      long format, one "signal,timestamp,value" row per sample
+#  - csv_wide: one timestamp/value column pair per signal, side by side
+#  - csv_aligned: one time column and one column per signal, resampled onto
+#    a common grid (timestamps must be on one clock, see core.resample)
+#  - npz:      NumPy archive with "<signal>_t" / "<signal>_v" arrays
+#  - session:  chunked binary folder, readable with core.session_store
+EXPORT_FORMATS = {
+    "csv": ("CSV (long)", ".csv"),
+    "csv_wide": ("CSV (wide)", ".csv"),
+    "csv_aligned": ("CSV (time-aligned)", ".csv"),
+    "npz": ("NumPy (.npz)", ".npz"),
+    "session": ("Chunked binary", ""),
+}
+
+DEFAULT_EXPORT_FORMAT = "csv"
+
+# Time base of the "csv_aligned" export: key -> label shown in the UI
+#  - densest: timestamps of the exported signal with the most samples
+#  - speed/rpm: timestamps of that signal (the densest one if it is not exported)
+#  - rate:    uniform grid at the chosen rate (Hz)
+ALIGN_TARGETS = {
+    "densest": "Densest signal",
+    "speed": "Speed samples",
+    "rpm": "RPM samples",
+    "rate": "Uniform grid",
+}
+
+DEFAULT_ALIGN_TARGET = "densest"
+DEFAULT_ALIGN_RATE = 100.0
+
+# Samples written per step; progress and cancellation are checked in between
+EXPORT_CHUNK_SIZE = 50000
+
+# Enough digits for microseconds on run-relative timestamps
+_NUMBER_FMT = "%.15g"
+
+
+class ExportCancelled(Exception):
+    pass
+
+
+class _Progress:
+    # Counts written samples and reports whole percentages
+    def __init__(self, total, progress=None, is_cancelled=None):
+        self.total = max(1, int(total))
+        self.done = 0
+        self.percent = -1
+        self.progress = progress
+        self.is_cancelled = is_cancelled
+
+    def step(self, n):
+        if self.is_cancelled is not None and self.is_cancelled():
+            raise ExportCancelled()
+
+        self.done += n
+        percent = min(100, self.done * 100 // self.total)
+        if percent != self.percent and self.progress is not None:
+            self.percent = percent
+            self.progress(percent)
+
+
+def export_signals(path, signals, fmt=DEFAULT_EXPORT_FORMAT, progress=None,
+                   is_cancelled=None, chunk_size=EXPORT_CHUNK_SIZE, align=None):
+    """Write {signal: (timestamps, values)} to `path` in one of EXPORT_FORMATS.
+
+    Data is written in chunks of `chunk_size` samples with NumPy bulk
+    writers. `progress(percent)` is called as chunks are written and
+    `is_cancelled()` is polled between chunks; on cancellation ExportCancelled
+    is raised and nothing is left at `path`. Files are written next to `path`
+    and renamed into place once complete.
+
+    For "csv_aligned", `align` holds keyword arguments for
+    core.resample.resample_signals (reference, rate, methods).
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+
+    arrays = {
+        name: (np.asarray(t, dtype=np.float64), np.asarray(v, dtype=np.float64))
+        for name, (t, v) in signals.items()
+    }
+    total = sum(len(t) for t, _ in arrays.values())
+    if fmt == "csv_wide":
+        total = max((len(t) for t, _ in arrays.values()), default=0)
+    elif fmt == "csv_aligned":
+        grid, values = resample_signals(arrays, **(align or {}))
+        total = len(grid)
+    tracker = _Progress(total, progress, is_cancelled)
+
+    tmp_path = path + ".part"
+    try:
+        if fmt == "csv":
+            _write_long_csv(tmp_path, arrays, tracker, chunk_size)
+        elif fmt == "csv_wide":
+            _write_wide_csv(tmp_path, arrays, tracker, chunk_size)
+        elif fmt == "csv_aligned":
+            _write_aligned_csv(tmp_path, grid, values, tracker, chunk_size)
+        elif fmt == "npz":
+            _write_npz(tmp_path, arrays, tracker)
+        else:
+            write_session(tmp_path, arrays, chunk_size=chunk_size, on_chunk=tracker.step)
+    except BaseException:
+        _remove(tmp_path)
+        raise
+
+    if os.path.isdir(path):
+        shutil.rmtree(path)
+    os.replace(tmp_path, path)
+    if progress is not None:
+        progress(100)
+    return path
+
+
+def align_options(target, names, rate=DEFAULT_ALIGN_RATE):
+    """`align` keyword arguments of export_signals for an ALIGN_TARGETS key and the exported signal names."""
+    if target == "rate":
+        return {"rate": float(rate)}
+    if target in names:
+        return {"reference": target}
+    return {}
+
+
+def _remove(path):
+    if os.path.isdir(path):
+        shutil.rmtree(path, ignore_errors=True)
+    elif os.path.exists(path):
+        os.remove(path)
+
+
+def _write_long_csv(path, arrays, tracker, chunk_size):
+    with open(path, "w", newline="") as f:
+        f.write("signal,timestamp,value\n")
+        for name, (t, v) in arrays.items():
+            for i in range(0, len(t), chunk_size):
+                block = np.column_stack((t[i:i + chunk_size], v[i:i + chunk_size]))
+                np.savetxt(f, block, fmt=f"{name},{_NUMBER_FMT},{_NUMBER_FMT}")
+                tracker.step(len(block))
+
+
+def _write_wide_csv(path, arrays, tracker, chunk_size):
+    names = list(arrays)
+    rows = max((len(t) for t, _ in arrays.values()), default=0)
+
+    with open(path, "w", newline="") as f:
+        f.write(",".join(f"{name}_t,{name}_v" for name in names) + "\n")
+        for i in range(0, rows, chunk_size):
+            n = min(chunk_size, rows - i)
+            block = np.full((n, 2 * len(names)), np.nan)
+            for col, name in enumerate(names):
+                t, v = arrays[name]
+                part = t[i:i + n]
+                block[:len(part), 2 * col] = part
+                block[:len(part), 2 * col + 1] = v[i:i + n]
+
+            # Shorter signals leave empty cells
+            text = io.StringIO()
+            np.savetxt(text, block, fmt=_NUMBER_FMT, delimiter=",")
+            f.write(text.getvalue().replace("nan", ""))
+            tracker.step(n)
+
+
+def _write_aligned_csv(path, grid, values, tracker, chunk_size):
+    names = list(values)
+
+    with open(path, "w", newline="") as f:
+        f.write(",".join(["t"] + names) + "\n")
+        for i in range(0, len(grid), chunk_size):
+            block = np.column_stack(
+                [grid[i:i + chunk_size]] + [values[name][i:i + chunk_size] for name in names]
+            )
+
+            # Points outside a signal's range leave empty cells
+            text = io.StringIO()
+            np.savetxt(text, block, fmt=_NUMBER_FMT, delimiter=",")
+            f.write(text.getvalue().replace("nan", ""))
+            tracker.step(len(block))
+
+
+def _write_npz(path, arrays, tracker):
+    payload = {}
+    for name, (t, v) in arrays.items():
+        payload[f"{name}_t"] = t
+        payload[f"{name}_v"] = v
+
+    # np.savez compresses everything at once; report it as one step
+    with open(path, "wb") as f:
+        np.savez_compressed(f, **payload)
+    tracker.step(tracker.total)
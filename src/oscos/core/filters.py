@@ -0,0 +1,147 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+# Filters applied to speed to obtain acceleration: key -> (label shown in the UI, SavgolFilter kwargs)
+#  - difference: two-point difference of consecutive samples (AccelerationProcessor)
+#  - savgol:     Savitzky-Golay derivative evaluated at the window centre (delay of window // 2 samples)
+#  - savgol_end: Savitzky-Golay derivative evaluated at the newest sample (no delay, noisier)
+ACCEL_FILTERS = {
+    "difference": ("Two-point difference", None),
+    "savgol": ("Savitzky-Golay", {"window": 9, "order": 2}),
+    "savgol_end": ("Savitzky-Golay (low latency)", {"window": 9, "order": 2, "position": "end"}),
+}
+
+DEFAULT_ACCEL_FILTER = "difference"
+
+# Offline smoothing used for exports
+ZERO_PHASE_WINDOW = 9
+ZERO_PHASE_ORDER = 2
+
+# Exported signal -> (buffer it is computed from, derivative order)
+ZERO_PHASE_SOURCES = {
+    "speed": ("speed", 0),
+    "speed_corrected": ("speed_corrected", 0),
+    "acceleration": ("speed", 1),
+    "acceleration_corrected": ("speed_corrected", 1),
+}
+
+
+def savgol_fit(t, v, window=9, order=2, deriv=0, position="center"):
+    """Local polynomial fits over every run of `window` consecutive samples.
+
+    Unlike the classic Savitzky-Golay filter the fit uses the actual sample
+    times, so irregular sampling (one speed sample per tooth) is handled. A
+    polynomial of degree `order` is fitted by least squares to each window
+    and its `deriv`-th derivative evaluated at the window's centre sample or
+    at its last sample (`position="end"`). All windows are solved at once.
+
+    Returns (times, values), one entry per complete window.
+    """
+    t = np.asarray(t, dtype=np.float64)
+    v = np.asarray(v, dtype=np.float64)
+    if window <= order:
+        raise ValueError("window must be larger than order")
+    if deriv > order:
+        raise ValueError("deriv must not exceed order")
+    if len(t) < window:
+        return np.empty(0), np.empty(0)
+
+    tw = sliding_window_view(t, window)
+    vw = sliding_window_view(v, window)
+    k = window // 2 if position == "center" else window - 1
+    t_eval = tw[:, k]
+
+    # Centre and scale the time axis of each window for conditioning
+    half = (tw[:, -1] - tw[:, 0]) / 2.0
+    half[half <= 0] = 1.0
+    x = (tw - t_eval[:, None]) / half[:, None]
+
+    powers = x[:, :, None] ** np.arange(order + 1)      # (n, window, order + 1)
+    ata = np.einsum("nwi,nwj->nij", powers, powers)
+    atb = np.einsum("nwi,nw->ni", powers, vw)
+    coeffs = np.linalg.solve(ata, atb[:, :, None])[:, :, 0]
+
+    # x = 0 at the evaluation point: the derivative is deriv! * c_deriv / half ** deriv
+    factorial = np.prod(np.arange(1, deriv + 1))
+    return t_eval, factorial * coeffs[:, deriv] / half ** deriv
+
+
+def zero_phase(t, v, window=ZERO_PHASE_WINDOW, order=ZERO_PHASE_ORDER, deriv=0):
+    """Offline smoothing (deriv=0) or differentiation of a whole series, without lag.
+
+    Each sample is taken from the polynomial fitted to the window centred on
+    it; the first and last window // 2 samples are evaluated on the first and
+    last windows' polynomials. Returns values aligned with `t`.
+    """
+    t = np.asarray(t, dtype=np.float64)
+    v = np.asarray(v, dtype=np.float64)
+    n = len(t)
+    if n < window:
+        if n <= order:
+            return np.full(n, np.nan)
+        window = n - (1 - n % 2)  # Largest odd window that fits
+        if window <= order:
+            return np.full(n, np.nan)
+
+    half = window // 2
+    out = np.empty(n)
+    _, out[half:n - half] = savgol_fit(t, v, window, order, deriv)
+
+    for idx, seg in ((range(half), slice(0, window)), (range(n - half, n), slice(n - window, n))):
+        tw, vw = t[seg], v[seg]
+        t_ref = tw[half]
+        scale = max((tw[-1] - tw[0]) / 2.0, 1e-12)
+        poly = np.polyfit((tw - t_ref) / scale, vw, order)
+        for _ in range(deriv):
+            poly = np.polyder(poly)
+        out[list(idx)] = np.polyval(poly, (t[list(idx)] - t_ref) / scale) / scale ** deriv
+
+    return out
+
+
+class SavgolFilter:
+    """Streaming Savitzky-Golay fit with persistent state between batches.
+
+    `process(t, v)` accepts any number of new samples and returns the fits
+    for every window completed by them; the last window - 1 samples are kept
+    for the next call, so a stream filtered in batches gives the same output
+    as the whole series filtered at once.
+    """
+
+    def __init__(self, window=9, order=2, deriv=0, position="center"):
+        self.window = int(window)
+        self.order = int(order)
+        self.deriv = int(deriv)
+        self.position = position
+        if self.window <= self.order:
+            raise ValueError("window must be larger than order")
+        self.reset()
+
+    def reset(self):
+        self._t = np.empty(0)
+        self._v = np.empty(0)
+
+    def process(self, t, v):
+        t = np.concatenate((self._t, np.atleast_1d(np.asarray(t, dtype=np.float64))))
+        v = np.concatenate((self._v, np.atleast_1d(np.asarray(v, dtype=np.float64))))
+
+        keep = self.window - 1
+        self._t = t[-keep:] if len(t) > keep else t
+        self._v = v[-keep:] if len(v) > keep else v
+
+        return savgol_fit(t, v, self.window, self.order, self.deriv, self.position)
+
+
+def zero_phase_signals(signals, sources, window=ZERO_PHASE_WINDOW, order=ZERO_PHASE_ORDER):
+    """Replace signals of {name: (t, v)} with zero-phase fits for export.
+
+    `sources` maps a name to (t, v, deriv) of the series it is computed
+    from (see ZERO_PHASE_SOURCES): speed is smoothed in place, while
+    acceleration is recomputed as the derivative of speed rather than by
+    smoothing the two-point differences.
+    """
+    out = dict(signals)
+    for name, (t, v, deriv) in sources.items():
+        out[name] = (np.asarray(t, dtype=np.float64), zero_phase(t, v, window, order, deriv))
+    return out
@@ -0,0 +1,285 @@
+import os
+import csv
+from concurrent.futures import ProcessPoolExecutor
+import cv2
+import numpy as np
+from .catalog import PhotoCatalog, METADATA_CSV_NAME, find_catalog
+from .output_names import OutputNameRegistry
+
+
+# Output formats for captured frames: key -> (label shown in the UI, extension)
+#  - png:  demosaiced BGR frame written with cv2.imwrite (configurable zlib level)
+#  - tiff: demosaiced BGR frame, uncompressed TIFF (no zlib cost at capture time)
+#  - npy:  raw sensor frame (Bayer mosaic, 1 byte/pixel), memory-mappable with np.load
+OUTPUT_FORMATS = {
+    "png": ("PNG", ".png"),
+    "tiff": ("TIFF (uncompressed)", ".tiff"),
+    "npy": ("Raw Bayer (.npy)", ".npy"),
+}
+
+DEFAULT_OUTPUT_FORMAT = "png"
+DEFAULT_PNG_COMPRESSION = 3
+
+# Formats that are not decodable by Qt/Pillow and need converting before sharing
+RAW_EXTS = {".npy"}
+
+# Captures that the batch converter encodes to PNG
+CONVERTIBLE_EXTS = {".npy", ".tif", ".tiff"}
+
+# Per-channel colour balance applied after demosaicing (B, G, R multipliers)
+COLOR_BALANCE_BGR = (1.0, 0.95, 0.952)
+
+# Demosaic code for each camera Bayer format. Camera formats are named after
+# the top-left 2x2 cell, OpenCV's after the second row (second and third
+# columns), so e.g. an RGGB sensor ("BayerRG8") needs COLOR_BayerBG2BGR.
+BAYER_CODES = {
+    "BayerRG8": cv2.COLOR_BayerBG2BGR,
+    "BayerGB8": cv2.COLOR_BayerGR2BGR,
+    "BayerBG8": cv2.COLOR_BayerRG2BGR,
+    "BayerGR8": cv2.COLOR_BayerGB2BGR,
+}
+
+# Pattern assumed for raw captures whose pixel format was not recorded
+DEFAULT_BAYER_FORMAT = "BayerRG8"
+DEFAULT_BAYER_CODE = BAYER_CODES[DEFAULT_BAYER_FORMAT]
+
+
+def bayer_code_for(pixel_format):
+    """OpenCV demosaic code for a camera pixel format (default pattern if unknown)."""
+    return BAYER_CODES.get(pixel_format, DEFAULT_BAYER_CODE)
+
+
+def develop_raw(raw, bayer_code=DEFAULT_BAYER_CODE):
+    """Turn a raw sensor frame into a colour-balanced BGR uint8 image.
+
+    2D frames are treated as a Bayer mosaic and demosaiced with `bayer_code`;
+    3-channel frames are used as they are.
+    """
+    if raw.ndim == 2:
+        try:
+            color_bgr = cv2.cvtColor(raw, bayer_code)
+        except Exception:
+            raise RuntimeError("Error en demosaicing.")
+    else:
+        color_bgr = raw
+
+    b_mult, g_mult, r_mult = COLOR_BALANCE_BGR
+    try:
+        img_f = color_bgr.astype(np.float32)
+        img_f[..., 0] *= b_mult
+        img_f[..., 1] *= g_mult
+        img_f[..., 2] *= r_mult
+        np.clip(img_f, 0, 255, out=img_f)
+        color_bgr = img_f.astype(np.uint8)
+    except Exception:
+        # Fallback: leave image unchanged on any unexpected issue
+        pass
+
+    return color_bgr
+
+
+def to_uint8(img):
+    """Return `img` as uint8, rescaling [0, 1] floats and clipping anything else."""
+    if img.dtype == np.uint8:
+        return img
+
+    if np.issubdtype(img.dtype, np.floating):
+        m = np.nanmax(img)
+        if m <= 1.0:
+            return (img * 255.0).astype(np.uint8)
+
+    return np.clip(img, 0, 255).astype(np.uint8)
+
+
+def save_frame(img, out_path, fmt=DEFAULT_OUTPUT_FORMAT, png_compression=DEFAULT_PNG_COMPRESSION):
+    """Write a captured frame to `out_path` using the selected output format.
+
+    Colour frames are expected in OpenCV's BGR order and are written with
+    cv2.imwrite directly, so no RGB copy of the frame is made.
+    """
+    if fmt not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format: {fmt}")
+
+    if fmt == "npy":
+        # np.save only appends ".npy" when missing; the path already carries it
+        with open(out_path, "wb") as f:
+            np.save(f, np.ascontiguousarray(img))
+        return
+
+    if fmt == "tiff":
+        params = [cv2.IMWRITE_TIFF_COMPRESSION, 1]  # 1 = no compression
+    else:
+        level = min(9, max(0, int(png_compression)))
+        params = [cv2.IMWRITE_PNG_COMPRESSION, level]
+
+    if not cv2.imwrite(out_path, img, params):
+        raise RuntimeError(f"cv2.imwrite failed for {out_path}")
+
+
+def load_raw(path, mmap=True):
+    """Load a raw `.npy` capture, memory-mapped by default."""
+    return np.load(path, mmap_mode="r" if mmap else None)
+
+
+def read_preview(path, max_size=128, bayer_code=DEFAULT_BAYER_CODE):
+    """Return a small BGR preview of a raw `.npy` capture.
+
+    Only every k-th 2x2 Bayer cell is read from the memory-mapped file, so the
+    cost depends on the preview size rather than on the sensor size.
+    """
+    raw = load_raw(path)
+    h, w = raw.shape[:2]
+    step = max(1, max(h, w) // (2 * max_size))
+
+    if raw.ndim == 2 and step > 1:
+        # Keep whole 2x2 cells so the mosaic phase survives the decimation
+        step += step % 2
+        rows = np.sort(np.concatenate((np.arange(0, h - 1, step), np.arange(1, h, step))))
+        cols = np.sort(np.concatenate((np.arange(0, w - 1, step), np.arange(1, w, step))))
+        small = np.ascontiguousarray(raw[np.ix_(rows, cols)])
+    else:
+        small = np.ascontiguousarray(raw[::step, ::step])
+
+    return develop_raw(to_uint8(small), bayer_code)
+
+
+#--------------------------------------------
+# Offline conversion of raw captures to PNG
+#--------------------------------------------
+def convert_to_png(path, png_compression=DEFAULT_PNG_COMPRESSION,
+                   bayer_code=DEFAULT_BAYER_CODE, remove_source=True, out_path=None):
+    """Encode one raw/uncompressed capture as PNG next to it. Returns the PNG path.
+
+    Without `out_path` the PNG takes the capture's name, and an existing
+    PNG of that name is never overwritten (FileExistsError).
+    """
+    root, ext = os.path.splitext(path)
+    if out_path is None:
+        out_path = root + ".png"
+        if os.path.exists(out_path):
+            raise FileExistsError(f"{out_path} already exists")
+
+    if ext.lower() in RAW_EXTS:
+        img = develop_raw(to_uint8(np.asarray(load_raw(path))), bayer_code)
+    else:
+        img = cv2.imread(path, cv2.IMREAD_UNCHANGED)
+        if img is None:
+            raise RuntimeError(f"Could not read {path}")
+
+    save_frame(img, out_path, "png", png_compression)
+
+    if remove_source:
+        os.remove(path)
+
+    return out_path
+
+
+def _convert_job(args):
+    path, png_compression, bayer_code, remove_source, out_path = args
+    try:
+        return path, convert_to_png(path, png_compression, bayer_code, remove_source, out_path), None
+    except Exception as e:
+        return path, None, str(e)
+
+
+def convert_folder(folder, png_compression=DEFAULT_PNG_COMPRESSION, workers=None,
+                   bayer_code=None, remove_source=True):
+    """Encode every raw capture inside `folder` to PNG using a process pool.
+
+    Unless `bayer_code` is given, each raw file is demosaiced according to the
+    pixel format recorded for it in the photo catalog. Output names are
+    reserved up front, so a PNG already next to a capture (e.g. `foo.png`
+    beside `foo.npy`) is kept and the new one gets a `_NNN` suffix. The set's metadata rows (in the photo catalog, or in a legacy
+    `metadata.csv` when there is no catalog) are renamed to the new PNG files.
+    Returns a list of (source, png_path or None, error or None).
+    """
+    sources = [
+        os.path.join(folder, entry)
+        for entry in sorted(os.listdir(folder))
+        if os.path.splitext(entry)[1].lower() in CONVERTIBLE_EXTS
+    ]
+    if not sources:
+        return []
+
+    if bayer_code is None:
+        formats = _recorded_pixel_formats(folder)
+        codes = [bayer_code_for(formats.get(os.path.basename(p))) for p in sources]
+    else:
+        codes = [bayer_code] * len(sources)
+
+    names = OutputNameRegistry()
+    targets = [names.reserve(folder, os.path.splitext(os.path.basename(p))[0], ".png") for p in sources]
+
+    jobs = [(p, png_compression, code, remove_source, out)
+            for p, code, out in zip(sources, codes, targets)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(_convert_job, jobs))
+
+    for (src, dst, err), out in zip(results, targets):
+        if dst is None:
+            names.release(out)
+
+    renamed = {
+        os.path.basename(src): os.path.basename(dst)
+        for src, dst, err in results
+        if dst is not None
+    }
+    _rename_metadata_rows(folder, renamed)
+
+    return results
+
+
+def _recorded_pixel_formats(folder):
+    # filename -> camera pixel format, from the catalog governing `folder`
+    db_path = find_catalog(folder)
+    if db_path is None:
+        return {}
+
+    catalog = PhotoCatalog(os.path.dirname(db_path))
+    try:
+        catalog.import_csv_if_changed(folder)
+        return {
+            row["filename"]: row.get("pixel_format")
+            for row in catalog.query(folder)
+        }
+    finally:
+        catalog.close()
+
+
+def _rename_metadata_rows(folder, renamed):
+    if not renamed:
+        return
+
+    db_path = find_catalog(folder)
+    if db_path is not None:
+        catalog = PhotoCatalog(os.path.dirname(db_path))
+        try:
+            # Pull in a CSV the catalog has not seen yet before renaming
+            catalog.import_csv_if_changed(folder)
+            for old, new in renamed.items():
+                catalog.rename(folder, old, new)
+        finally:
+            catalog.close()
+        return
+
+    csv_path = os.path.join(folder, METADATA_CSV_NAME)
+    if not os.path.isfile(csv_path):
+        return
+
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        rows = list(reader)
+        fieldnames = reader.fieldnames
+
+    if not fieldnames:
+        return
+
+    for row in rows:
+        name = row.get("filename")
+        if name in renamed:
+            row["filename"] = renamed[name]
+
+    with open(csv_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
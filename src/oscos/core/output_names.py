@@ -0,0 +1,82 @@
+import os
+from threading import Lock
+
+
+class OutputNameRegistry:
+    """Hands out unique photo file names per folder in constant time.
+
+    Each folder is listed once; afterwards names are checked against the
+    in-memory set and a per-name counter remembers where the `_NNN` suffix
+    search stopped. A name is only handed out after creating the (empty)
+    file with O_EXCL, so it cannot collide with files created by other
+    programs or with frames still being written in the background.
+    """
+
+    def __init__(self):
+        self.lock = Lock()
+        self._names = {}     # folder -> set of normcased names in use
+        self._next = {}      # (folder, base, ext) -> next suffix to try
+
+    def _folder_names(self, folder):
+        key = os.path.normpath(folder)
+        names = self._names.get(key)
+        if names is None:
+            try:
+                names = {os.path.normcase(n) for n in os.listdir(folder)}
+            except OSError:
+                names = set()
+            self._names[key] = names
+        return key, names
+
+    def _try_create(self, path, names, name):
+        if os.path.normcase(name) in names:
+            return False
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            names.add(os.path.normcase(name))
+            return False
+        os.close(fd)
+        names.add(os.path.normcase(name))
+        return True
+
+    def reserve(self, folder, base_name, ext):
+        """Create and return a new empty file `<base_name>[_NNN]<ext>` in `folder`."""
+        with self.lock:
+            key, names = self._folder_names(folder)
+
+            name = f"{base_name}{ext}"
+            path = os.path.join(folder, name)
+            if self._try_create(path, names, name):
+                return path
+
+            # Auto-append counter, resuming where the last search stopped
+            counter_key = (key, base_name, ext)
+            i = self._next.get(counter_key, 1)
+            while True:
+                name = f"{base_name}_{i:03d}{ext}"
+                path = os.path.join(folder, name)
+                i += 1
+                if self._try_create(path, names, name):
+                    self._next[counter_key] = i
+                    return path
+
+    def release(self, path):
+        """Remove a reservation that was never written (empty file)."""
+        with self.lock:
+            try:
+                if os.path.getsize(path) == 0:
+                    os.remove(path)
+            except OSError:
+                return
+
+            _, names = self._folder_names(os.path.dirname(path))
+            names.discard(os.path.normcase(os.path.basename(path)))
+
+    def forget(self, folder):
+        """Drop what is known about `folder` (e.g. after deleting it)."""
+        with self.lock:
+            key = os.path.normpath(folder)
+            self._names.pop(key, None)
+            for counter_key in [k for k in self._next if k[0] == key]:
+                del self._next[counter_key]
@@ -0,0 +1,153 @@
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .filters import zero_phase
+from .processors import SpeedCorrectedProcessor, SpeedPeakDetection
+from .sign_eval import (
+    REFERENCE_WINDOW, REFERENCE_ORDER, SampleCollector, match_events, run_sign_processor, flip_times,
+    reference_signs, score_flips, sign_error,
+)
+
+
+# Default grids: tunable -> values tried
+#  - sign: attributes of SpeedCorrectedProcessor
+#  - peak: arguments of SpeedPeakDetection
+SIGN_GRID = {
+    "SLOPE_EPS": (0.0, 0.01, 0.02, 0.05),
+    "CONFIRM_SAMPLES": (1, 2, 3, 5),
+    "MIN_FLIP_DT": (0.1, 0.2, 0.3),
+    "smoothing_alpha": (0.0, 0.2, 0.4),
+}
+
+PEAK_GRID = {
+    "window_seconds": (0.2, 0.3, 0.4, 0.5, 0.6, 0.8),
+    "threshold": (0.1, 0.2, 0.3, 0.4, 0.5),
+}
+
+
+def grid_points(grid):
+    """Every combination of a {name: values} grid, as a list of {name: value} dicts."""
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[n] for n in names))]
+
+
+def reference_peaks(t, v, reversals, min_peak=None):
+    """Speed maxima between consecutive reference reversals (one per half-cycle).
+
+    |v| is smoothed without lag and its largest value is taken in each
+    complete half-cycle. Half-cycles peaking below `min_peak` (default: 10 %
+    of the 99th percentile of the smoothed speed) are treated as idle and
+    skipped. Returns (times, values).
+    """
+    t = np.asarray(t, dtype=np.float64)
+    if len(t) < 3 or len(reversals) < 2:
+        return np.empty(0), np.empty(0)
+    s = zero_phase(t, np.abs(v), REFERENCE_WINDOW, REFERENCE_ORDER)
+    if min_peak is None:
+        min_peak = 0.1 * float(np.percentile(s, 99))
+
+    bounds = np.searchsorted(t, reversals)
+    times, values = [], []
+    for a, b in zip(bounds[:-1], bounds[1:]):
+        if b <= a:
+            continue
+        i = a + int(np.argmax(s[a:b]))
+        if s[i] >= min_peak:
+            times.append(t[i])
+            values.append(s[i])
+    return np.asarray(times), np.asarray(values)
+
+
+def run_peak_detector(t, v, **params):
+    """Peak times found by SpeedPeakDetection(**params) on a recorded speed series."""
+    peaks = SampleCollector()
+    detector = SpeedPeakDetection(peaks, **params)
+    for ts, vs in zip(np.asarray(t, dtype=np.float64).tolist(), np.asarray(v, dtype=np.float64).tolist()):
+        detector(ts, vs)
+    return np.asarray(peaks.t, dtype=np.float64)
+
+
+def _make_sign_processor(params):
+    def make(out_buffer):
+        proc = SpeedCorrectedProcessor(out_buffer)
+        for name, value in params.items():
+            setattr(proc, name, value)
+        return proc
+    return make
+
+
+# Recording shared by the jobs of one worker process (sent once, not per job)
+_DATA = None
+
+
+def _init_worker(data):
+    global _DATA
+    _DATA = data
+
+
+def _sweep_job(args):
+    kind, params = args
+    d = _DATA
+    if kind == "sign":
+        ts, vs, _ = run_sign_processor(_make_sign_processor(params), d["t"], d["v"])
+        score = score_flips(flip_times(ts, vs), d["reversals"], d["tolerance"])
+        score["wrong_sign"] = sign_error(vs, reference_signs(ts, d["reversals"], d["directions"]))
+        score["errors"] = score["missed"] + score["spurious"]
+    else:
+        peaks = run_peak_detector(d["t"], d["v"], **params)
+        matched, lags = match_events(peaks, d["peaks"], d["tolerance"])
+        score = {
+            "peaks": int(len(peaks)),
+            "reference": int(len(d["peaks"])),
+            "matched": matched,
+            "missed": int(len(d["peaks"]) - matched),
+            "spurious": int(len(peaks) - matched),
+            "median_lag": float(np.median(np.abs(lags))) if len(lags) else float("nan"),
+        }
+        score["errors"] = score["missed"] + score["spurious"]
+    return kind, params, score
+
+
+def _rank(result):
+    kind, params, score = result
+    second = score["wrong_sign"] if kind == "sign" else score["median_lag"]
+    return score["errors"], np.inf if np.isnan(second) else second
+
+
+def sweep(ref, sign_grid=SIGN_GRID, peak_grid=PEAK_GRID, tolerance=0.1, min_peak=None, workers=None):
+    """Score every combination of processor tunables on a recording with a process pool.
+
+    `ref` is a dict from core.sign_eval.load_reference. Each point of
+    `sign_grid` runs SpeedCorrectedProcessor over the speed and is scored on
+    missed and spurious flips against the reference reversals (ties broken
+    by the fraction of samples with the wrong sign); each point of
+    `peak_grid` runs SpeedPeakDetection and is scored on missed and spurious
+    peaks against one reference peak per half-cycle (ties broken by the
+    median timing error). Either grid may be empty. The recording is sent
+    once to each worker. Returns (sign results, peak results), each a list
+    of (params, score dict), best first.
+    """
+    peak_t, _ = reference_peaks(ref["t"], ref["v"], ref["reversals"], min_peak)
+    data = {
+        "t": ref["t"],
+        "v": ref["v"],
+        "reversals": ref["reversals"],
+        "directions": ref["directions"],
+        "peaks": peak_t,
+        "tolerance": float(tolerance),
+    }
+
+    jobs = [("sign", p) for p in grid_points(sign_grid)] if sign_grid else []
+    jobs += [("peak", p) for p in grid_points(peak_grid)] if peak_grid else []
+    if not jobs:
+        return [], []
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(data,)) as pool:
+        results = list(pool.map(_sweep_job, jobs, chunksize=max(1, len(jobs) // 64)))
+
+    results.sort(key=_rank)
+    sign_results = [(params, score) for kind, params, score in results if kind == "sign"]
+    peak_results = [(params, score) for kind, params, score in results if kind == "peak"]
+    return sign_results, peak_results
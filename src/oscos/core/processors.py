@@ -1,3 +1,10 @@
+import math
+from bisect import bisect_left, insort
+from collections import deque
+from threading import Lock
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
 class StreamProcessor:
     def __init__(self, out_buffer):
         self.out_buffer = out_buffer
@@ -61,6 +68,24 @@ class AccelerationProcessor(StreamProcessor):
         self.prev_v = None
         self.prev_t = None
 
+class FilterProcessor(StreamProcessor):
+    def __init__(self, out_buffer, filt):
+        """Run a batch filter from core.filters (e.g. SavgolFilter) on a stream.
+
+        Each sample is handed to `filt.process`; whatever it returns (none,
+        one or several filtered samples) is added to `out_buffer`.
+        """
+        super().__init__(out_buffer)
+        self.filter = filt
+
+    def __call__(self, timestamp, value):
+        ts, vs = self.filter.process(timestamp, value)
+        for t, v in zip(ts, vs):
+            self.out_buffer.add(float(v), float(t))
+
+    def reset(self):
+        self.filter.reset()
+
 class SpeedCorrectedProcessor:
     def __init__(self, out_buffer):
         self.out_buffer = out_buffer
@@ -156,6 +181,179 @@ class SpeedCorrectedProcessor:
         self.prev_v = sm_v
         self.prev_t = t
 
+# Ways of giving the speed its sign: key -> label shown in the UI
+#  - slope: EMA slope state machine (SpeedCorrectedProcessor)
+#  - model: second encoder channel when present, else sinusoid fit (ModelSignCorrector)
+SIGN_CORRECTORS = {
+    "slope": "Speed slope",
+    "model": "Encoder B / sine fit",
+}
+
+DEFAULT_SIGN_CORRECTOR = "slope"
+
+class ModelSignCorrector:
+    def __init__(self, out_buffer, direction_timeout=0.5, low_ratio=0.5, hysteresis=0.25, min_fit=5,
+                 min_half_period=0.05, max_history=2.0):
+        """Sign correction of the speed magnitude from a direction channel or a sinusoid model.
+
+        When the telemetry carries the second encoder channel, call
+        `set_direction(t, sign)` for every edge; while directions keep
+        arriving (within `direction_timeout` s) the sign is taken from them.
+
+        Otherwise reversals are placed at the minima of |v|. Each half-cycle
+        (reversal to reversal) is fitted by least squares with
+        a cos(w t) + b sin(w t), w = pi / half-period, the half-period being
+        the median spacing of the last reversals. Running sums keep the fit
+        O(1) per sample. The sign flips at the first sample past the fitted
+        zero, once |v| is below `low_ratio` of the half-cycle peak, so there
+        is no smoothing lag. Until the half-period is known, or if the model
+        is late, a reversal is confirmed when |v| rises `hysteresis` times
+        the peak above its minimum. Reversals closer than half a half-period,
+        or than `min_half_period` s before the half-period is known, are
+        ignored, and a spacing under half the running one is not learned,
+        so noise minima cannot shrink the half-period. `seed(t, frequency)`
+        (e.g. from the spectrum's dominant frequency) replaces a half-period
+        that is off by more than 25 %, so a wrong start cannot lock in.
+        Samples are kept for two half-periods (`max_history` s until one is
+        known) to refit after a reversal or a seed. Outputs sign * |v|
+        without smoothing.
+        """
+        self.out_buffer = out_buffer
+        self.direction_timeout = float(direction_timeout)
+        self.low_ratio = float(low_ratio)
+        self.hysteresis = float(hysteresis)
+        self.min_fit = int(min_fit)
+        self.min_half_period = float(min_half_period)
+        self.max_history = float(max_history)
+        self.reset()
+
+    def reset(self):
+        self.current_sign = 1
+        self.reversals = 0
+
+        # Direction channel
+        self._dir_sign = None
+        self._dir_t = None
+
+        # Reversal history
+        self._last_rev = None
+        self._spacings = deque(maxlen=3)
+
+        self._restart(None)
+
+    def _restart(self, samples):
+        # Start a half-cycle at the last reversal with the samples already past it
+        self._samples = deque(samples or ())
+        self._peak = 0.0
+        self._min_v = self._min_t = None
+        self._sums = [0.0] * 5      # cc, cs, ss, cy, sy
+        self._omega = None
+        if self._spacings:
+            self._omega = math.pi / self._half_period()
+
+        # Earliest reversal accepted by the model, and by the minimum fallback
+        self._min_model = self._min_fallback = None
+        if self._last_rev is not None:
+            half = self._half_period() if self._spacings else 0.0
+            self._min_model = self._last_rev + max(self.min_half_period, 0.5 * half)
+            self._min_fallback = self._last_rev + max(self.min_half_period, 0.75 * half)
+
+        for t, s in self._samples:
+            self._add(t, s)
+
+    def _half_period(self):
+        return sorted(self._spacings)[len(self._spacings) // 2]
+
+    def _add(self, t, s):
+        self._peak = max(self._peak, s)
+        # Minima too close to the last reversal cannot confirm the next one
+        early = self._min_fallback is not None and t < self._min_fallback
+        if not early and self._peak > 0 and s < self.low_ratio * self._peak:
+            if self._min_v is None or s < self._min_v:
+                self._min_v, self._min_t = s, t
+        if self._omega is not None and self._last_rev is not None:
+            x = self._omega * (t - self._last_rev)
+            c, sn = math.cos(x), math.sin(x)
+            sums = self._sums
+            sums[0] += c * c
+            sums[1] += c * sn
+            sums[2] += sn * sn
+            sums[3] += c * s
+            sums[4] += sn * s
+
+    def _fitted_zero(self):
+        # End of the fitted half-wave: R sin(x + phi) with x = w (t - last reversal) reaches pi
+        cc, cs, ss, cy, sy = self._sums
+        det = cc * ss - cs * cs
+        if det <= 1e-12:
+            return None
+        a = (ss * cy - cs * sy) / det
+        b = (cc * sy - cs * cy) / det
+        if b <= 0:
+            return None
+        phi = math.atan2(a, b)
+        return self._last_rev + (math.pi - phi) / self._omega
+
+    def seed(self, t, frequency):
+        """Check the half-period against an oscillation frequency estimate (Hz)."""
+        if not frequency or frequency <= 0:
+            return
+        half = 0.5 / frequency
+        if self._spacings and abs(self._half_period() / half - 1.0) <= 0.25:
+            return
+        self._spacings.clear()
+        self._spacings.append(half)
+        if self._last_rev is not None:
+            self._restart(list(self._samples))
+
+    def set_direction(self, t, sign):
+        """Direction of travel at edge time `t` from the second encoder channel (+1/-1)."""
+        sign = 1 if sign >= 0 else -1
+        if self._dir_sign is not None and sign != self._dir_sign:
+            self.reversals += 1
+        self._dir_sign = sign
+        self._dir_t = t
+
+    def __call__(self, t, v):
+        s = abs(v)
+
+        if self._dir_t is not None and t - self._dir_t <= self.direction_timeout:
+            self.current_sign = self._dir_sign
+            self.out_buffer.add(self.current_sign * s, t)
+            return
+
+        samples = self._samples
+        samples.append((t, s))
+        horizon = 2.0 * self._half_period() if self._spacings else self.max_history
+        while samples[0][0] < t - horizon:
+            samples.popleft()
+        self._add(t, s)
+
+        t_rev = None
+        if self._omega is not None and len(samples) >= self.min_fit and s < self.low_ratio * self._peak:
+            t_zero = self._fitted_zero()
+            if t_zero is not None and self._min_model is not None and t >= t_zero >= self._min_model:
+                t_rev = t_zero
+        if t_rev is None and self._min_v is not None and t > self._min_t:
+            if s > self._min_v + self.hysteresis * self._peak:
+                t_rev = self._min_t
+
+        if t_rev is not None:
+            self.current_sign *= -1
+            self.reversals += 1
+            if self._last_rev is not None and t_rev > self._last_rev:
+                spacing = t_rev - self._last_rev
+                half = self._half_period() if self._spacings else None
+                if half is not None and spacing > 2.5 * half:
+                    # Longer than a missed reversal or two: the learned half-period is wrong
+                    self._spacings.clear()
+                if half is None or spacing >= 0.5 * half:
+                    self._spacings.append(spacing)
+            self._last_rev = t_rev
+            self._restart([(ts, vs) for ts, vs in self._samples if ts >= t_rev])
+
+        self.out_buffer.add(self.current_sign * s, t)
+
 class SpeedPeakDetection:
     def __init__(self, out_buffer, window_seconds=0.5, threshold=0.4):
         """Detecta máximos asegurando que no haya dos picos en `window_seconds`.
@@ -212,4 +410,600 @@ class SpeedPeakDetection:
     def reset(self):
         self._candidate_v = None
         self._candidate_t = None
-        self._blocked_until = None
\ No newline at end of file
+        self._blocked_until = None
+
+class SpectrumProcessor:
+    def __init__(self, out_buffer, spectrum_buffer, sample_rate=50.0, segment=512,
+                 overlap=0.75, averages=4, max_gap=0.5):
+        """Streaming Welch spectrum of a signal and its dominant frequency.
+
+        Incoming samples are linearly resampled onto a uniform grid at
+        `sample_rate` Hz. Every hop (`segment` * (1 - `overlap`) grid samples)
+        the newest `segment` samples are detrended, Hann-windowed and
+        transformed with rfft; the power spectral density averaged over the
+        last `averages` segments goes to `spectrum_buffer` and its peak
+        frequency (parabolic interpolation between bins) to `out_buffer`. Work
+        per hop is one rfft of `segment` points, whatever the history length.
+        A gap longer than `max_gap` seconds restarts the grid.
+        """
+        self.out_buffer = out_buffer
+        self.spectrum_buffer = spectrum_buffer
+        self.sample_rate = float(sample_rate)
+        self.segment = int(segment)
+        self.hop = max(1, int(round(self.segment * (1.0 - float(overlap)))))
+        self.averages = max(1, int(averages))
+        self.max_gap = float(max_gap)
+
+        self._window = np.hanning(self.segment)
+        # One-sided PSD scaling (density, as in Welch's method)
+        self._scale = np.full(self.segment // 2 + 1, 2.0 / (self.sample_rate * np.sum(self._window ** 2)))
+        self._scale[0] /= 2.0
+        if self.segment % 2 == 0:
+            self._scale[-1] /= 2.0
+        self.frequencies = np.fft.rfftfreq(self.segment, 1.0 / self.sample_rate)
+
+        self.reset()
+
+    def reset(self):
+        self._prev_t = None
+        self._prev_v = None
+        self._restart_grid()
+
+    def _restart_grid(self):
+        self._grid_t0 = None        # Time of grid sample 0
+        self._count = 0             # Grid samples produced since the restart
+        self._tail = np.empty(0)    # Last segment - 1 grid samples
+        self._psds = []             # Spectra of the last `averages` segments
+
+    def __call__(self, t, v):
+        if self._prev_t is not None:
+            dt = t - self._prev_t
+            if dt <= 0:
+                return
+            if dt > self.max_gap:
+                self._restart_grid()
+
+        if self._grid_t0 is None:
+            self._grid_t0 = t
+            self._push_grid(np.array([v], dtype=np.float64))
+        else:
+            # Grid points in (prev_t, t], interpolated between the two samples
+            last = int(np.floor((t - self._grid_t0) * self.sample_rate))
+            if last >= self._count:
+                idx = np.arange(self._count, last + 1)
+                g = self._grid_t0 + idx / self.sample_rate
+                frac = (g - self._prev_t) / (t - self._prev_t)
+                self._push_grid(self._prev_v + (v - self._prev_v) * frac)
+
+        self._prev_t = t
+        self._prev_v = v
+
+    def _push_grid(self, values):
+        start = self._count - len(self._tail)   # Grid index of data[0]
+        data = np.concatenate((self._tail, values))
+        first = self._count + 1
+        self._count += len(values)
+
+        # Sample counts at which a segment ends: segment, segment + hop, ...
+        first = max(first, self.segment)
+        first += (self.segment - first) % self.hop
+        ends = np.arange(first, self._count + 1, self.hop)
+
+        if ends.size:
+            segments = sliding_window_view(data, self.segment)[ends - self.segment - start]
+            self._add_segments(segments, self._grid_t0 + (ends - 1) / self.sample_rate)
+
+        self._tail = data[-(self.segment - 1):] if self.segment > 1 else np.empty(0)
+
+    def _add_segments(self, segments, times):
+        # All segments completed by this sample are transformed as one batch
+        segments = segments - segments.mean(axis=1, keepdims=True)
+        spectra = np.fft.rfft(segments * self._window, axis=1)
+        psds = (spectra.real ** 2 + spectra.imag ** 2) * self._scale
+
+        for psd, t in zip(psds, times):
+            self._psds.append(psd)
+            if len(self._psds) > self.averages:
+                self._psds.pop(0)
+
+            mean_psd = np.mean(self._psds, axis=0)
+            self.spectrum_buffer.set(self.frequencies, mean_psd, float(t))
+            self.out_buffer.add(self._dominant_frequency(mean_psd), float(t))
+
+    def _dominant_frequency(self, psd):
+        # Skip the DC bin; refine the peak with a parabola through its neighbours
+        k = int(np.argmax(psd[1:])) + 1
+        delta = 0.0
+        if 1 < k < len(psd) - 1:
+            a, b, c = psd[k - 1], psd[k], psd[k + 1]
+            denom = a - 2.0 * b + c
+            if denom != 0:
+                delta = 0.5 * (a - c) / denom
+        return float((k + delta) * self.sample_rate / self.segment)
+
+class PLLTracker:
+    def __init__(self, frequency_buffer, amplitude_buffer, phase_buffer,
+                 initial_frequency=1.0, bandwidth=0.3, damping=0.707,
+                 min_frequency=0.05, max_frequency=20.0, mean_tau=5.0):
+        """Software phase-locked loop that tracks the oscillation of a signal.
+
+        Each sample is mixed with the loop's cosine and sine (after removing a
+        slow running mean, time constant `mean_tau`), the products are
+        low-pass filtered and their angle is the phase error, which drives a
+        PI loop of natural bandwidth `bandwidth` Hz. Frequency (Hz), amplitude
+        and signal phase (rad, cosine reference, wrapped to [-pi, pi]) are
+        added to the three buffers for every sample; each sample costs O(1)
+        and works with irregular sampling. `seed` pulls the loop to a coarse
+        estimate, e.g. the dominant frequency of the spectrum.
+        """
+        self.frequency_buffer = frequency_buffer
+        self.amplitude_buffer = amplitude_buffer
+        self.phase_buffer = phase_buffer
+
+        self.initial_frequency = float(initial_frequency)
+        self.min_frequency = float(min_frequency)
+        self.max_frequency = float(max_frequency)
+        self.mean_tau = float(mean_tau)
+
+        # Loop gains of a second-order PLL with unit phase-detector gain
+        wn = 2.0 * np.pi * float(bandwidth)
+        self.kp = 2.0 * float(damping) * wn
+        self.ki = wn * wn
+
+        # A seed further than this (relative) from the loop frequency re-locks it
+        self.SEED_TOLERANCE = 0.25
+
+        self.reset()
+
+    def reset(self):
+        self.prev_t = None
+        self._omega = 2.0 * np.pi * self.initial_frequency
+        self._phase = 0.0
+        self._mean = None
+        self._i = 0.0
+        self._q = 0.0
+
+    def seed(self, t, frequency):
+        f = self._omega / (2.0 * np.pi)
+        if frequency > 0 and abs(frequency - f) > self.SEED_TOLERANCE * frequency:
+            self._omega = 2.0 * np.pi * min(self.max_frequency, max(self.min_frequency, frequency))
+
+    def __call__(self, t, v):
+        if self.prev_t is None:
+            self.prev_t = t
+            self._mean = v
+            return
+
+        dt = t - self.prev_t
+        if dt <= 0:
+            return
+        self.prev_t = t
+
+        # Advance the oscillator to this sample
+        self._phase = (self._phase + self._omega * dt) % (2.0 * np.pi)
+
+        self._mean += (v - self._mean) * (1.0 - np.exp(-dt / self.mean_tau))
+        x = v - self._mean
+
+        # Quadrature mixing; the low-pass cut-off follows the loop frequency
+        # so the 2f mixing product is rejected whatever is being tracked
+        alpha = 1.0 - np.exp(-dt * self._omega / 4.0)
+        self._i += (x * np.cos(self._phase) - self._i) * alpha
+        self._q += (-x * np.sin(self._phase) - self._q) * alpha
+
+        err = np.arctan2(self._q, self._i)
+
+        # PI loop filter
+        w_min = 2.0 * np.pi * self.min_frequency
+        w_max = 2.0 * np.pi * self.max_frequency
+        self._omega = min(w_max, max(w_min, self._omega + self.ki * err * dt))
+        self._phase += self.kp * err * dt
+
+        signal_phase = (self._phase + err + np.pi) % (2.0 * np.pi) - np.pi
+
+        self.frequency_buffer.add(float(self._omega / (2.0 * np.pi)), t)
+        self.amplitude_buffer.add(float(2.0 * np.hypot(self._i, self._q)), t)
+        self.phase_buffer.add(float(signal_phase), t)
+
+class DampingEstimator:
+    def __init__(self, log_decrement_buffer, damping_buffer, q_buffer, window=8, peaks_per_period=2):
+        """Estimate decay from successive peaks (subscribe to the peak buffer).
+
+        A line is fitted by least squares to ln(peak) against time over the
+        last `window` peaks; its slope is the decay rate sigma (1/s). With the
+        period T taken from the mean peak spacing (`peaks_per_period` peaks per
+        oscillation: 2 for speed magnitude, which peaks in both directions),
+        the logarithmic decrement is sigma * T, the damping ratio
+        delta / sqrt(4 pi^2 + delta^2) and Q = 1 / (2 zeta). Each peak costs
+        O(window). A growing oscillation gives negative values and no Q.
+        """
+        self.log_decrement_buffer = log_decrement_buffer
+        self.damping_buffer = damping_buffer
+        self.q_buffer = q_buffer
+        self.window = max(3, int(window))
+        self.peaks_per_period = float(peaks_per_period)
+        self.reset()
+
+    def reset(self):
+        self._peaks = deque(maxlen=self.window)
+
+    def __call__(self, t, v):
+        if v <= 0:
+            return
+        self._peaks.append((t, np.log(v)))
+        n = len(self._peaks)
+        if n < 3:
+            return
+
+        ts = np.fromiter((p[0] for p in self._peaks), dtype=np.float64, count=n)
+        ys = np.fromiter((p[1] for p in self._peaks), dtype=np.float64, count=n)
+        tc = ts - ts.mean()
+        denom = np.dot(tc, tc)
+        if denom <= 0:
+            return
+        sigma = -np.dot(tc, ys - ys.mean()) / denom
+
+        period = self.peaks_per_period * (ts[-1] - ts[0]) / (n - 1)
+        delta = sigma * period
+        zeta = delta / np.sqrt(4.0 * np.pi ** 2 + delta ** 2)
+        q = 1.0 / (2.0 * zeta) if zeta > 0 else float("nan")
+
+        self.log_decrement_buffer.add(float(delta), t)
+        self.damping_buffer.add(float(zeta), t)
+        self.q_buffer.add(float(q), t)
+
+class SlidingExtremum:
+    def __init__(self, window_seconds=1.5):
+        """Maximum, minimum and peak-to-peak of a stream over a time window.
+
+        Subscribe it to a buffer. Two monotonic deques hold the candidates
+        for the maximum and the minimum of the last `window_seconds`
+        (counted back from the newest sample): each sample is pushed and
+        popped at most once, so updates are O(1) amortized and the current
+        values are read in O(1) without touching the buffer.
+        """
+        self.window_seconds = float(window_seconds)
+        self.lock = Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self._max = deque()   # (t, v), values decreasing
+            self._min = deque()   # (t, v), values increasing
+            self._last_t = None
+
+    def __call__(self, t, v):
+        # Time going backwards means the buffers were cleared
+        if self._last_t is not None and t < self._last_t:
+            self.reset()
+
+        with self.lock:
+            while self._max and self._max[-1][1] <= v:
+                self._max.pop()
+            self._max.append((t, v))
+
+            while self._min and self._min[-1][1] >= v:
+                self._min.pop()
+            self._min.append((t, v))
+
+            self._last_t = t
+            cutoff = t - self.window_seconds
+            while self._max[0][0] < cutoff:
+                self._max.popleft()
+            while self._min[0][0] < cutoff:
+                self._min.popleft()
+
+    @property
+    def max(self):
+        with self.lock:
+            return self._max[0][1] if self._max else None
+
+    @property
+    def min(self):
+        with self.lock:
+            return self._min[0][1] if self._min else None
+
+    @property
+    def peak_to_peak(self):
+        with self.lock:
+            if not self._max:
+                return None
+            return self._max[0][1] - self._min[0][1]
+
+class EdgeGlitchFilter:
+    def __init__(self, glitch_buffer=None, history=9, tolerance=0.25, short_ratio=0.7, max_fill=3):
+        """Repair missed and drop extra encoder edges before speed is computed.
+
+        Push raw edge times; `push` returns the cleaned edges to forward,
+        one edge behind, because a glitch is only told apart from a real
+        change of speed by the edge after it. The expected period is the
+        median of the last `history` raw periods (so one glitch cannot
+        shift it, and repairs never feed back into it), and edges are only
+        judged while the speed is steady (the period before them within
+        `tolerance` of the expected one):
+         - extra edge: one of the two periods around it is shorter than
+           `short_ratio` of the expected one and together they add up to
+           it and to the period before (within `tolerance`); the edge is
+           dropped.
+         - missed edges: the period is k times the expected one (k up to
+           `max_fill`) and the next one is normal; k - 1 edges are
+           inserted at equal spacing.
+        Anything else, such as the changing periods around a reversal,
+        passes unchanged. Each edge costs O(1) (the history is fixed-size). The
+        running glitch count is added to `glitch_buffer` at every glitch.
+        """
+        self.glitch_buffer = glitch_buffer
+        self.history = int(history)
+        self.tolerance = float(tolerance)
+        self.short_ratio = float(short_ratio)
+        self.max_fill = int(max_fill)
+        self.reset()
+
+    def reset(self):
+        self._prev = None          # Last accepted edge
+        self._pending = None       # Edge waiting for the next one
+        self._last_raw = None      # Last raw edge
+        self._periods = deque()    # Raw periods, oldest first
+        self._sorted = []          # Same periods, sorted
+        self.edges = 0
+        self.missed = 0
+        self.extra = 0
+
+    @property
+    def glitches(self):
+        return self.missed + self.extra
+
+    @property
+    def pending(self):
+        """Time of the raw edge held back for the next one (None if none); later outputs are not earlier."""
+        return self._pending
+
+    @property
+    def quality(self):
+        """Fraction of edges that needed no repair (1.0 before any edge)."""
+        if self.edges == 0:
+            return 1.0
+        return max(0.0, 1.0 - self.glitches / self.edges)
+
+    def _expected(self):
+        if len(self._sorted) < self.history:
+            return None
+        return self._sorted[len(self._sorted) // 2]
+
+    def _add_period(self, dt):
+        self._periods.append(dt)
+        insort(self._sorted, dt)
+        if len(self._periods) > self.history:
+            del self._sorted[bisect_left(self._sorted, self._periods.popleft())]
+
+    def _flag(self, t, count, kind):
+        if kind == "missed":
+            self.missed += count
+        else:
+            self.extra += count
+        if self.glitch_buffer is not None:
+            self.glitch_buffer.add(float(self.glitches), t)
+
+    def push(self, timestamp):
+        """Feed one raw edge; returns the list of cleaned edges now confirmed."""
+        self.edges += 1
+        if self._last_raw is None:
+            self._prev = self._last_raw = timestamp
+            return [timestamp]
+
+        if timestamp <= self._last_raw:
+            # Repeated or out-of-order edge
+            self._flag(self._last_raw, 1, "extra")
+            return []
+
+        self._add_period(timestamp - self._last_raw)
+        self._last_raw = timestamp
+
+        if self._pending is None:
+            self._pending = timestamp
+            return []
+
+        p, self._pending = self._pending, timestamp
+        m = self._expected()
+        tol = self.tolerance
+        # _periods[-3] is the raw period before p's
+        if m is None or abs(self._periods[-3] / m - 1.0) >= tol:
+            self._prev = p
+            return [p]
+
+        d1 = p - self._prev
+        d2 = timestamp - p
+
+        # The median lags behind a change of speed, so the split period must
+        # also match the one before it
+        split = d1 + d2
+        if (min(d1, d2) < self.short_ratio * m and abs(split / m - 1.0) < tol
+                and abs(split / self._periods[-3] - 1.0) < tol):
+            self._flag(p, 1, "extra")
+            return []
+
+        k = int(round(d1 / m))
+        if 2 <= k <= self.max_fill and abs(d1 / (k * m) - 1.0) < tol and abs(d2 / m - 1.0) < tol:
+            start = self._prev
+            out = [start + d1 * j / k for j in range(1, k)] + [p]
+            self._prev = p
+            self._flag(p, k - 1, "missed")
+            return out
+
+        self._prev = p
+        return [p]
+
+    def filter_edges(self, timestamps):
+        """Clean an array of recorded edges; the last edge is held back as in streaming."""
+        out = []
+        for t in np.asarray(timestamps, dtype=np.float64):
+            out.extend(self.push(float(t)))
+        return np.asarray(out, dtype=np.float64)
+
+def _kalman_transition(dt, jerk_noise):
+    # State transition and white-jerk process noise of a constant-acceleration
+    # model for an array of time steps: (n, 3, 3) each
+    dt = np.asarray(dt, dtype=np.float64)
+    n = dt.size
+    F = np.zeros((n, 3, 3))
+    F[:, 0, 0] = F[:, 1, 1] = F[:, 2, 2] = 1.0
+    F[:, 0, 1] = F[:, 1, 2] = dt
+    F[:, 0, 2] = dt ** 2 / 2.0
+
+    d2, d3, d4, d5 = dt ** 2, dt ** 3, dt ** 4, dt ** 5
+    Q = np.empty((n, 3, 3))
+    Q[:, 0, 0] = d5 / 20.0
+    Q[:, 0, 1] = Q[:, 1, 0] = d4 / 8.0
+    Q[:, 0, 2] = Q[:, 2, 0] = d3 / 6.0
+    Q[:, 1, 1] = d3 / 3.0
+    Q[:, 1, 2] = Q[:, 2, 1] = d2 / 2.0
+    Q[:, 2, 2] = dt
+    return F, Q * jerk_noise
+
+
+class KalmanEstimator:
+    def __init__(self, tooth_length_mm, position_buffer, speed_buffer, acceleration_buffer,
+                 jerk_noise=50.0, position_noise_mm=0.2, output_rate=50.0, max_latency=0.1):
+        """Constant-acceleration Kalman filter on tooth edges (push raw timestamps).
+
+        Every edge is a position measurement one tooth further along. The
+        state (position m, speed m/s, acceleration m/s^2) is predicted with
+        white jerk noise of spectral density `jerk_noise` (m^2/s^5) and
+        corrected with measurement noise `position_noise_mm`. Estimates are
+        added to the three buffers at every edge and, in between, on a grid
+        at `output_rate` Hz: grid points are predicted from the last edge
+        when the next edge arrives or when `tick(now)` is called, so outputs
+        keep flowing at low speed. `tick` stays `max_latency` seconds behind
+        `now`, so edges arriving up to that late are still newer than the
+        last output; buffer timestamps never go backwards.
+        """
+        self.tooth_length = tooth_length_mm * 1e-3
+        self.position_buffer = position_buffer
+        self.speed_buffer = speed_buffer
+        self.acceleration_buffer = acceleration_buffer
+        self.jerk_noise = float(jerk_noise)
+        self.position_noise = position_noise_mm * 1e-3
+        self.output_rate = float(output_rate)
+        self.max_latency = float(max_latency)
+
+        # Initial speed/acceleration uncertainty (std dev, m/s and m/s^2)
+        self.INITIAL_SPEED_STD = 2.0
+        self.INITIAL_ACCEL_STD = 10.0
+
+        self.reset()
+
+    def reset(self):
+        self._x = None
+        self._P = None
+        self._t = None          # Time of the last edge
+        self._n = 0             # Edges seen
+        self._last_out = None   # Time of the last output
+
+    def _initial_state(self):
+        x = np.zeros(3)
+        P = np.diag([self.position_noise ** 2, self.INITIAL_SPEED_STD ** 2, self.INITIAL_ACCEL_STD ** 2])
+        return x, P
+
+    def _emit(self, t, x):
+        if self._last_out is not None and t <= self._last_out:
+            return
+        self._last_out = t
+        self.position_buffer.add(float(x[0]), t)
+        self.speed_buffer.add(float(x[1]), t)
+        self.acceleration_buffer.add(float(x[2]), t)
+
+    def _emit_grid(self, t_end, inclusive):
+        # Predictions from the last edge at the grid points in (last output, t_end)
+        if self._x is None or self.output_rate <= 0:
+            return
+        step = 1.0 / self.output_rate
+        start = self._t if self._last_out is None else max(self._t, self._last_out)
+        k0 = int(np.floor(start * self.output_rate)) + 1
+        k1 = int(np.floor(t_end * self.output_rate))
+        if not inclusive and k1 * step >= t_end:
+            k1 -= 1
+        for k in range(k0, k1 + 1):
+            dt = k * step - self._t
+            x = self._x
+            self._emit(k * step, (
+                x[0] + x[1] * dt + x[2] * dt * dt / 2.0,
+                x[1] + x[2] * dt,
+                x[2],
+            ))
+
+    def tick(self, now, held=None):
+        """Output the predicted state on the grid up to `now` - max_latency (session seconds).
+
+        `held` is the time of an edge received but not pushed yet (see
+        EdgeGlitchFilter.pending); the grid stops short of it.
+        """
+        t_end = now - self.max_latency
+        if held is not None and held <= t_end:
+            self._emit_grid(held, inclusive=False)
+        else:
+            self._emit_grid(t_end, inclusive=True)
+
+    def push(self, timestamp):
+        if self._t is not None and timestamp <= self._t:
+            return
+
+        self._emit_grid(timestamp, inclusive=False)
+
+        z = self._n * self.tooth_length
+        self._n += 1
+        if self._x is None:
+            self._x, self._P = self._initial_state()
+        else:
+            F, Q = _kalman_transition([timestamp - self._t], self.jerk_noise)
+            self._x, self._P = _kalman_step(self._x, self._P, F[0], Q[0], z, self.position_noise ** 2)
+        self._t = timestamp
+
+        self._emit(timestamp, self._x)
+
+    def filter_edges(self, timestamps):
+        """Run the filter over an array of edge times; returns (position, speed, acceleration) arrays.
+
+        Transition and noise matrices for the whole batch are built at once;
+        the state continues from (and is left at) the streaming state, but
+        nothing is added to the buffers.
+        """
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        out = np.empty((len(timestamps), 3))
+        if not len(timestamps):
+            return out[:, 0], out[:, 1], out[:, 2]
+
+        # Edges not newer than every earlier one are skipped, so each step
+        # runs from the last edge actually used
+        last = -np.inf if self._t is None else self._t
+        prev = np.maximum.accumulate(np.concatenate(([last], timestamps)))[:-1]
+        keep = timestamps > prev
+        dt = np.where(keep & np.isfinite(prev), timestamps - prev, 0.0)
+        F, Q = _kalman_transition(dt, self.jerk_noise)
+        r = self.position_noise ** 2
+
+        for i, t in enumerate(timestamps):
+            if not keep[i]:
+                out[i] = self._x
+                continue
+
+            z = self._n * self.tooth_length
+            self._n += 1
+            if self._x is None:
+                self._x, self._P = self._initial_state()
+            else:
+                self._x, self._P = _kalman_step(self._x, self._P, F[i], Q[i], z, r)
+            self._t = t
+            out[i] = self._x
+
+        return out[:, 0], out[:, 1], out[:, 2]
+
+
+def _kalman_step(x, P, F, Q, z, r):
+    # Predict, then correct with a position measurement (H = [1, 0, 0])
+    x = F @ x
+    P = F @ P @ F.T + Q
+    s = P[0, 0] + r
+    k = P[:, 0] / s
+    x = x + k * (z - x[0])
+    P = P - np.outer(k, P[0, :])
+    return x, P
@@ -0,0 +1,85 @@
+import numpy as np
+
+
+# "linear": np.interp between samples
+# "hold":   zero-order hold, each sample holds until the next one
+RESAMPLE_METHODS = ("linear", "hold")
+
+# Signals that are piecewise constant or sparse events, held rather than interpolated
+HOLD_SIGNALS = {"rpm", "speed_peaks"}
+
+
+def resample_signal(t, v, grid, method="linear"):
+    """Sample the series (t, v) at the times in `grid` (all arrays, t ascending).
+
+    Grid points before the first sample are NaN. With "linear" points after
+    the last sample are NaN too; with "hold" the last value is kept.
+    """
+    t = np.asarray(t, dtype=np.float64)
+    v = np.asarray(v, dtype=np.float64)
+    grid = np.asarray(grid, dtype=np.float64)
+
+    if t.size == 0:
+        return np.full(grid.shape, np.nan)
+
+    if method == "linear":
+        return np.interp(grid, t, v, left=np.nan, right=np.nan)
+
+    if method == "hold":
+        idx = np.searchsorted(t, grid, side="right") - 1
+        out = v[np.clip(idx, 0, None)]
+        out[idx < 0] = np.nan
+        return out
+
+    raise ValueError(f"Invalid resample method: {method}")
+
+
+def uniform_grid(signals, rate):
+    """Uniform grid at `rate` Hz over the span where all signals have data."""
+    spans = [(t[0], t[-1]) for t, _ in signals.values() if len(t)]
+    if not spans or rate <= 0:
+        return np.empty(0)
+
+    t_start = max(s for s, _ in spans)
+    t_end = min(e for _, e in spans)
+    if t_end < t_start:
+        return np.empty(0)
+
+    n = int(np.floor((t_end - t_start) * rate)) + 1
+    return t_start + np.arange(n) / rate
+
+
+def resample_signals(signals, grid=None, reference=None, rate=None, methods=None):
+    """Put every signal of {name: (t, v)} on one time base.
+
+    The grid is, in order of precedence: `grid` itself, the timestamps of
+    the `reference` signal, a uniform grid at `rate` Hz, or (by default) the
+    timestamps of the signal with the most samples. All timestamps must be on
+    the same clock. `methods` maps names to "linear"/"hold"; unlisted signals
+    are held if in HOLD_SIGNALS and interpolated otherwise.
+
+    Returns (grid, {name: values on grid}).
+    """
+    arrays = {
+        name: (np.asarray(t, dtype=np.float64), np.asarray(v, dtype=np.float64))
+        for name, (t, v) in signals.items()
+    }
+
+    if grid is None:
+        if reference is not None:
+            grid = arrays[reference][0]
+        elif rate is not None:
+            grid = uniform_grid(arrays, rate)
+        elif arrays:
+            grid = max(arrays.values(), key=lambda tv: len(tv[0]))[0]
+        else:
+            grid = np.empty(0)
+    grid = np.asarray(grid, dtype=np.float64)
+
+    methods = methods or {}
+    values = {}
+    for name, (t, v) in arrays.items():
+        method = methods.get(name, "hold" if name in HOLD_SIGNALS else "linear")
+        values[name] = resample_signal(t, v, grid, method)
+
+    return grid, values
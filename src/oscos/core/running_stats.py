@@ -0,0 +1,129 @@
+import math
+from collections import deque
+
+
+# Statistics a buffer can show on its LCD: key -> label shown in the UI
+#  - window_*: over the last `window_seconds` of the buffer (10 s by default)
+LCD_MODES = {
+    "latest": "Latest value",
+    "mean": "Run mean",
+    "std": "Run std dev",
+    "rms": "Run RMS",
+    "min": "Run min",
+    "max": "Run max",
+    "window_mean": "Window mean",
+    "window_std": "Window std dev",
+    "window_rms": "Window RMS",
+}
+
+DEFAULT_LCD_MODE = "latest"
+
+DEFAULT_STATS_WINDOW_S = 10.0
+
+
+def _summary(n, mean, m2, sum_sq, v_min, v_max):
+    if n == 0:
+        return None
+    variance = m2 / (n - 1) if n > 1 else 0.0
+    return {
+        "count": n,
+        "mean": mean,
+        "variance": variance,
+        "std": math.sqrt(max(variance, 0.0)),
+        "rms": math.sqrt(max(sum_sq / n, 0.0)),
+        "min": v_min,
+        "max": v_max,
+    }
+
+
+class RunningStats:
+    """Count, mean, variance (Welford), RMS, min and max of every value added, in O(1)."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self._sum_sq = 0.0
+        self.min = None
+        self.max = None
+
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        self._sum_sq += value * value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def summary(self):
+        return _summary(self.count, self.mean, self._m2, self._sum_sq, self.min, self.max)
+
+
+class WindowedStats:
+    """The same statistics over the last `window_seconds` (counted back from the newest sample).
+
+    Values leaving the window are removed with the inverse Welford update,
+    and min/max come from monotonic deques, so each sample costs O(1)
+    amortized. The values inside the window are kept to know what to remove.
+    """
+
+    def __init__(self, window_seconds=DEFAULT_STATS_WINDOW_S):
+        self.window_seconds = float(window_seconds)
+        self.reset()
+
+    def reset(self):
+        self._samples = deque()
+        self._max = deque()
+        self._min = deque()
+        self.mean = 0.0
+        self._m2 = 0.0
+        self._sum_sq = 0.0
+
+    def add(self, t, value):
+        # Time going backwards means the buffer was cleared
+        if self._samples and t < self._samples[-1][0]:
+            self.reset()
+
+        self._samples.append((t, value))
+        n = len(self._samples)
+        delta = value - self.mean
+        self.mean += delta / n
+        self._m2 += delta * (value - self.mean)
+        self._sum_sq += value * value
+
+        while self._max and self._max[-1][1] <= value:
+            self._max.pop()
+        self._max.append((t, value))
+        while self._min and self._min[-1][1] >= value:
+            self._min.pop()
+        self._min.append((t, value))
+
+        cutoff = t - self.window_seconds
+        while self._samples[0][0] < cutoff:
+            self._remove(self._samples.popleft()[1])
+        while self._max[0][0] < cutoff:
+            self._max.popleft()
+        while self._min[0][0] < cutoff:
+            self._min.popleft()
+
+    def _remove(self, value):
+        n = len(self._samples)
+        if n == 0:
+            self.mean = self._m2 = self._sum_sq = 0.0
+            return
+        delta = value - self.mean
+        self.mean -= delta / n
+        self._m2 -= delta * (value - self.mean)
+        self._sum_sq -= value * value
+
+    def summary(self):
+        if not self._samples:
+            return None
+        return _summary(len(self._samples), self.mean, self._m2, self._sum_sq,
+                        self._min[0][1], self._max[0][1])
@@ -0,0 +1,141 @@
+import time
+from threading import Lock
+
+
+class SessionClock:
+    """One timeline for every buffer of a run.
+
+    Telemetry carries device timestamps (seconds since the microcontroller
+    started) while other samples, such as RPM, are only timed on arrival
+    with the host clock. The clock maps both onto session time, which is 0
+    at the first event of the run.
+
+    Each device timestamp observed on arrival gives a (host, device) pair;
+    host - device equals the clock offset plus a transport delay that is
+    never negative. The pair with the smallest difference in each
+    `block_seconds` of host time is fed to a running least-squares line,
+    which tracks offset and drift between the two clocks in O(1) per sample.
+    """
+
+    def __init__(self, block_seconds=1.0, host_clock=time.monotonic):
+        self.block_seconds = float(block_seconds)
+        self.host_clock = host_clock
+        self.lock = Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            # Host time of the first event: session time 0 until a device reference exists
+            self._host_origin = None
+
+            # Device time that corresponds to session time 0
+            self._device_origin = None
+
+            # Best (smallest host - device) pair of the current block
+            self._block_start = None
+            self._block_best = None
+
+            # Least-squares sums of offset = host - device against host time
+            self._n = 0
+            self._sx = self._sy = self._sxx = self._sxy = 0.0
+
+            # Current model: device = host - (offset + drift * (host - host_origin))
+            self._offset = None
+            self._drift = 0.0
+
+    #--------------------------------
+    # Clock model
+    #--------------------------------
+    def observe(self, device_t, host_t=None):
+        """Record that device time `device_t` arrived at host time `host_t` (default: now).
+
+        Returns the session time of `device_t`.
+        """
+        if host_t is None:
+            host_t = self.host_clock()
+
+        with self.lock:
+            if self._host_origin is None:
+                self._host_origin = host_t
+            if self._device_origin is None:
+                # Keep session times of host-timed samples seen so far valid
+                self._device_origin = device_t - (host_t - self._host_origin)
+
+            offset = host_t - device_t
+            if self._offset is None:
+                self._offset = offset
+            elif self._n < 2 and offset < self._offset:
+                self._offset = offset
+
+            if self._block_start is None:
+                self._block_start = host_t
+            if self._block_best is None or offset < self._block_best[1]:
+                self._block_best = (host_t, offset)
+
+            if host_t - self._block_start >= self.block_seconds:
+                self._add_point(*self._block_best)
+                self._block_start = host_t
+                self._block_best = None
+
+            return device_t - self._device_origin
+
+    def _add_point(self, host_t, offset):
+        x = host_t - self._host_origin
+        self._n += 1
+        self._sx += x
+        self._sy += offset
+        self._sxx += x * x
+        self._sxy += x * offset
+
+        if self._n >= 2:
+            denom = self._n * self._sxx - self._sx * self._sx
+            if denom > 0:
+                self._drift = (self._n * self._sxy - self._sx * self._sy) / denom
+                self._offset = (self._sy - self._drift * self._sx) / self._n
+
+    @property
+    def drift(self):
+        """Host seconds gained per host second relative to the device clock."""
+        return self._drift
+
+    @property
+    def origin(self):
+        """Device time of session time 0 (None until a device timestamp is seen)."""
+        return self._device_origin
+
+    #--------------------------------
+    # Conversions
+    #--------------------------------
+    def host_to_device(self, host_t):
+        with self.lock:
+            if self._offset is None:
+                return None
+            x = host_t - self._host_origin
+            return host_t - (self._offset + self._drift * x)
+
+    def from_device(self, device_t):
+        """Session time of a device timestamp."""
+        with self.lock:
+            if self._device_origin is None:
+                host_t = self.host_clock()
+                if self._host_origin is None:
+                    self._host_origin = host_t
+                self._device_origin = device_t - (host_t - self._host_origin)
+            return device_t - self._device_origin
+
+    def from_host(self, host_t=None):
+        """Session time of a host timestamp (default: now)."""
+        if host_t is None:
+            host_t = self.host_clock()
+
+        device_t = self.host_to_device(host_t)
+        with self.lock:
+            if self._host_origin is None:
+                self._host_origin = host_t
+            if device_t is None or self._device_origin is None:
+                return host_t - self._host_origin
+            return device_t - self._device_origin
+
+    def now(self):
+        """Current session time."""
+        return self.from_host()
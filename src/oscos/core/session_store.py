@@ -0,0 +1,294 @@
+import os
+import json
+import time
+import zlib
+import struct
+from threading import Lock, Event, Thread
+import numpy as np
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+# Buffers of the BufferRegistry recorded by default
+SESSION_SIGNALS = (
+    "raw_timestamps",
+    "edge_direction",
+    "edge_glitches",
+    "speed",
+    "acceleration",
+    "rpm",
+    "speed_corrected",
+    "acceleration_corrected",
+    "speed_peaks",
+    "dominant_frequency",
+    "tracker_frequency",
+    "tracker_amplitude",
+    "tracker_phase",
+    "log_decrement",
+    "damping_ratio",
+    "quality_factor",
+    "kalman_position",
+    "kalman_speed",
+    "kalman_acceleration",
+)
+
+SESSION_MANIFEST = "session.json"
+CHUNK_EXT = ".chunks"
+
+DEFAULT_CHUNK_SIZE = 4096
+
+# Chunk header: magic, codec, sample count, first/last timestamp, payload bytes
+_HEADER = struct.Struct("<4sBIddI")
+_MAGIC = b"OSCC"
+_CODECS = {"none": 0, "zlib": 1, "zstd": 2}
+
+
+def available_compressions():
+    return [name for name in _CODECS if name != "zstd" or zstandard is not None]
+
+
+DEFAULT_COMPRESSION = "zstd" if zstandard is not None else "zlib"
+
+
+def _compress(codec, data):
+    if codec == 1:
+        return zlib.compress(data, 1)
+    if codec == 2:
+        return zstandard.ZstdCompressor(level=3).compress(data)
+    return data
+
+
+def _write_chunk(f, codec, t, v):
+    t = np.ascontiguousarray(t, dtype=np.float64)
+    v = np.ascontiguousarray(v, dtype=np.float64)
+    payload = _compress(codec, t.tobytes() + v.tobytes())
+    f.write(_HEADER.pack(_MAGIC, codec, len(t), t[0], t[-1], len(payload)))
+    f.write(payload)
+
+
+def _write_manifest(directory, signals, compression, chunk_size):
+    with open(os.path.join(directory, SESSION_MANIFEST), "w", encoding="utf-8") as f:
+        json.dump({
+            "version": 1,
+            "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "signals": list(signals),
+            "compression": compression,
+            "chunk_size": chunk_size,
+        }, f, indent=2)
+
+
+def _decompress(codec, data):
+    if codec == 1:
+        return zlib.decompress(data)
+    if codec == 2:
+        if zstandard is None:
+            raise RuntimeError("The session is zstd-compressed but zstandard is not installed")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return data
+
+
+class SessionStore:
+    """Append every sample of the selected buffers to disk while a run lasts.
+
+    Each signal goes to its own append-only `<name>.chunks` file as blocks of
+    float64 timestamps and values, optionally compressed, each with a small
+    header holding its time range (the per-chunk time index). Subscribers only
+    append to a pending list; a background thread writes a chunk whenever
+    `chunk_size` samples are pending or every `flush_interval` seconds, so RAM
+    stays bounded however long the run is.
+
+    Timestamps are the ones the buffers hold, in seconds on the registry's
+    session clock.
+    """
+
+    def __init__(self, directory, registry, signals=SESSION_SIGNALS,
+                 compression=DEFAULT_COMPRESSION, chunk_size=DEFAULT_CHUNK_SIZE,
+                 flush_interval=1.0):
+        if compression not in available_compressions():
+            raise ValueError(f"Unsupported compression: {compression}")
+
+        self.directory = directory
+        self.registry = registry
+        self.signals = tuple(signals)
+        self.chunk_size = int(chunk_size)
+        self.flush_interval = float(flush_interval)
+        self._codec = _CODECS[compression]
+
+        os.makedirs(directory, exist_ok=True)
+        _write_manifest(directory, self.signals, compression, self.chunk_size)
+
+        self._files = {
+            name: open(os.path.join(directory, name + CHUNK_EXT), "ab")
+            for name in self.signals
+        }
+
+        self.lock = Lock()
+        self._pending = {name: [] for name in self.signals}
+        self._wake = Event()
+        self._stop = Event()
+        self.samples_written = 0
+
+        self._callbacks = {}
+        for name in self.signals:
+            cb = self._make_callback(name)
+            self._callbacks[name] = cb
+            getattr(registry, name).subscribe(cb)
+
+        self._thread = Thread(target=self._run, name="SessionStore", daemon=True)
+        self._thread.start()
+
+    def _make_callback(self, name):
+        def on_sample(timestamp, value):
+            with self.lock:
+                pending = self._pending[name]
+                pending.append((timestamp, value))
+                full = len(pending) >= self.chunk_size
+            if full:
+                self._wake.set()
+        return on_sample
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self._write_pending()
+        self._write_pending()
+
+    def _write_pending(self):
+        with self.lock:
+            batches = {name: rows for name, rows in self._pending.items() if rows}
+            for name in batches:
+                self._pending[name] = []
+
+        for name, rows in batches.items():
+            f = self._files[name]
+            for i in range(0, len(rows), self.chunk_size):
+                data = np.asarray(rows[i:i + self.chunk_size], dtype=np.float64)
+                _write_chunk(f, self._codec, data[:, 0], data[:, 1])
+                self.samples_written += len(data)
+            f.flush()
+
+    def close(self):
+        """Stop recording, write what is pending and close the files."""
+        for name, cb in self._callbacks.items():
+            getattr(self.registry, name).unsubscribe(cb)
+        self._callbacks.clear()
+
+        self._stop.set()
+        self._wake.set()
+        self._thread.join()
+
+        for f in self._files.values():
+            f.close()
+
+
+class SessionReader:
+    """Read back a session written by SessionStore.
+
+    The chunk headers of a signal are scanned once (seeking over the
+    payloads) to build its time index; reads then only decompress the chunks
+    overlapping the requested time range. A truncated last chunk (e.g. after
+    a crash) is ignored.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        with open(os.path.join(directory, SESSION_MANIFEST), encoding="utf-8") as f:
+            self.manifest = json.load(f)
+        self.signals = list(self.manifest["signals"])
+        self._index = {}
+
+    def _path(self, name):
+        return os.path.join(self.directory, name + CHUNK_EXT)
+
+    def index(self, name):
+        """List of (offset, codec, count, t_first, t_last, payload_len) per chunk."""
+        if name in self._index:
+            return self._index[name]
+
+        chunks = []
+        path = self._path(name)
+        size = os.path.getsize(path) if os.path.exists(path) else 0
+        if size:
+            with open(path, "rb") as f:
+                offset = 0
+                while offset + _HEADER.size <= size:
+                    f.seek(offset)
+                    magic, codec, count, t_first, t_last, length = _HEADER.unpack(f.read(_HEADER.size))
+                    start = offset + _HEADER.size
+                    if magic != _MAGIC or start + length > size:
+                        break
+                    chunks.append((start, codec, count, t_first, t_last, length))
+                    offset = start + length
+
+        self._index[name] = chunks
+        return chunks
+
+    def time_range(self, name):
+        chunks = self.index(name)
+        if not chunks:
+            return None
+        return chunks[0][3], chunks[-1][4]
+
+    def read(self, name, t_start=None, t_end=None):
+        """Return (t, v) float64 arrays of `name` within [t_start, t_end]."""
+        ts, vs = [], []
+        with open(self._path(name), "rb") as f:
+            for start, codec, count, t_first, t_last, length in self.index(name):
+                if t_start is not None and t_last < t_start:
+                    continue
+                if t_end is not None and t_first > t_end:
+                    continue
+                f.seek(start)
+                raw = _decompress(codec, f.read(length))
+                block = np.frombuffer(raw, dtype=np.float64)
+                ts.append(block[:count])
+                vs.append(block[count:2 * count])
+
+        if not ts:
+            return np.empty(0), np.empty(0)
+
+        t = np.concatenate(ts)
+        v = np.concatenate(vs)
+        if t_start is not None or t_end is not None:
+            mask = np.ones(t.shape, dtype=bool)
+            if t_start is not None:
+                mask &= t >= t_start
+            if t_end is not None:
+                mask &= t <= t_end
+            t, v = t[mask], v[mask]
+        return t, v
+
+
+def write_session(directory, signals, compression=DEFAULT_COMPRESSION,
+                  chunk_size=DEFAULT_CHUNK_SIZE, on_chunk=None):
+    """Write {signal: (t, v)} arrays as a session readable by SessionReader.
+
+    `on_chunk(n)` is called after each chunk with its sample count; it may
+    raise to abort the write.
+    """
+    if compression not in available_compressions():
+        raise ValueError(f"Unsupported compression: {compression}")
+    codec = _CODECS[compression]
+
+    os.makedirs(directory, exist_ok=True)
+    _write_manifest(directory, signals, compression, chunk_size)
+
+    for name, (t, v) in signals.items():
+        t = np.asarray(t, dtype=np.float64)
+        v = np.asarray(v, dtype=np.float64)
+        with open(os.path.join(directory, name + CHUNK_EXT), "wb") as f:
+            for i in range(0, len(t), chunk_size):
+                _write_chunk(f, codec, t[i:i + chunk_size], v[i:i + chunk_size])
+                if on_chunk is not None:
+                    on_chunk(len(t[i:i + chunk_size]))
+
+
+def load_session(directory, signals=None, t_start=None, t_end=None):
+    """Read a recorded session as {signal: (t, v)}."""
+    reader = SessionReader(directory)
+    names = reader.signals if signals is None else signals
+    return {name: reader.read(name, t_start, t_end) for name in names}
@@ -0,0 +1,192 @@
+import time
+
+import numpy as np
+
+from .filters import zero_phase
+
+
+# Offline smoothing of |v| used to find the reference reversals
+REFERENCE_WINDOW = 15
+REFERENCE_ORDER = 2
+
+
+class SampleCollector:
+    """Stand-in output buffer that keeps every sample added to it."""
+
+    def __init__(self):
+        self.t = []
+        self.v = []
+
+    def add(self, value, timestamp=None):
+        self.t.append(timestamp)
+        self.v.append(value)
+
+
+def run_sign_processor(make, t, v, seeds=None, directions=None):
+    """Feed a recorded speed series through a sign-correction processor.
+
+    `make(out_buffer)` builds the processor. `seeds` (t, frequency) and
+    `directions` (t, sign) are interleaved with the speed samples in time
+    order when the processor accepts them (ModelSignCorrector). Returns
+    (t, signed speed, seconds spent in the processor).
+    """
+    out = SampleCollector()
+    proc = make(out)
+
+    events = []
+    if seeds is not None and hasattr(proc, "seed"):
+        events.append((np.asarray(seeds[0]), np.asarray(seeds[1]), proc.seed))
+    if directions is not None and hasattr(proc, "set_direction"):
+        events.append((np.asarray(directions[0]), np.asarray(directions[1]), proc.set_direction))
+    cursors = [0] * len(events)
+
+    elapsed = 0.0
+    for ts, vs in zip(np.asarray(t, dtype=np.float64).tolist(), np.asarray(v, dtype=np.float64).tolist()):
+        start = time.perf_counter()
+        for k, (et, ev, call) in enumerate(events):
+            while cursors[k] < len(et) and et[cursors[k]] <= ts:
+                call(float(et[cursors[k]]), float(ev[cursors[k]]))
+                cursors[k] += 1
+        proc(ts, vs)
+        elapsed += time.perf_counter() - start
+
+    return np.asarray(out.t, dtype=np.float64), np.asarray(out.v, dtype=np.float64), elapsed
+
+
+def flip_times(t, signed):
+    """Times of the first sample after each sign change."""
+    signs = np.sign(signed)
+    idx = np.flatnonzero((signs[1:] != signs[:-1]) & (signs[1:] != 0) & (signs[:-1] != 0)) + 1
+    return np.asarray(t)[idx]
+
+
+def reference_reversals(t, v, min_spacing, low_ratio=0.5):
+    """Reversal times of a speed magnitude series, found offline with full lookahead.
+
+    |v| is smoothed without lag (core.filters.zero_phase); its local minima
+    that are below `low_ratio` of the largest value within `min_spacing`
+    are kept, the deepest first, so that no two are closer than
+    `min_spacing` seconds.
+    """
+    t = np.asarray(t, dtype=np.float64)
+    if len(t) < 3:
+        return np.empty(0)
+    s = zero_phase(t, np.abs(v), REFERENCE_WINDOW, REFERENCE_ORDER)
+
+    idx = np.flatnonzero((s[1:-1] <= s[:-2]) & (s[1:-1] < s[2:])) + 1
+    if not len(idx):
+        return np.empty(0)
+
+    # Largest value within min_spacing of each candidate
+    lo = np.searchsorted(t, t[idx] - min_spacing)
+    hi = np.searchsorted(t, t[idx] + min_spacing, side="right")
+    local_max = np.array([s[a:b].max() for a, b in zip(lo, hi)])
+    idx = idx[s[idx] < low_ratio * local_max]
+
+    kept = []
+    for i in idx[np.argsort(s[idx], kind="stable")]:
+        if all(abs(t[i] - t[j]) >= min_spacing for j in kept):
+            kept.append(i)
+    return np.sort(t[kept])
+
+
+def reference_signs(t, reversals=None, directions=None):
+    """Reference sign at times `t`, from recorded edge directions or alternating between reversals."""
+    t = np.asarray(t, dtype=np.float64)
+    if directions is not None and len(directions[0]):
+        dt, dv = np.asarray(directions[0]), np.asarray(directions[1])
+        k = np.clip(np.searchsorted(dt, t, side="right") - 1, 0, len(dt) - 1)
+        return np.where(dv[k] >= 0, 1.0, -1.0)
+    k = np.searchsorted(reversals, t, side="right")
+    return np.where(k % 2 == 0, 1.0, -1.0)
+
+
+def match_events(events, reference, tolerance):
+    """Match detected event times to reference times within `tolerance` s.
+
+    Each reference event is matched at most once, to the first detected
+    event inside its tolerance window. Returns (matched count, lags), the
+    lags being detected - reference times of the matches.
+    """
+    events = np.asarray(events, dtype=np.float64)
+    reference = np.asarray(reference, dtype=np.float64)
+    used = np.zeros(len(events), dtype=bool)
+    lags = []
+    for r in reference:
+        i = np.searchsorted(events, r - tolerance)
+        while i < len(events) and events[i] <= r + tolerance and used[i]:
+            i += 1
+        if i < len(events) and events[i] <= r + tolerance:
+            used[i] = True
+            lags.append(events[i] - r)
+    return int(used.sum()), np.asarray(lags)
+
+
+def score_flips(flips, reversals, tolerance):
+    """Match processor flips to reference reversals within `tolerance` s.
+
+    Returns a dict with flips, reversals, matched, missed, spurious and the
+    median lag (flip - reversal, s) of the matched flips.
+    """
+    matched, lags = match_events(flips, reversals, tolerance)
+    return {
+        "flips": int(len(flips)),
+        "reversals": int(len(reversals)),
+        "matched": matched,
+        "missed": int(len(reversals) - matched),
+        "spurious": int(len(flips) - matched),
+        "median_lag": float(np.median(lags)) if len(lags) else float("nan"),
+    }
+
+
+def sign_error(signed, ref_sign):
+    """Fraction of samples whose sign disagrees with the reference (either overall polarity)."""
+    signs = np.where(np.asarray(signed) >= 0, 1.0, -1.0)
+    if not len(signs):
+        return float("nan")
+    agree = np.mean(signs == ref_sign)
+    return float(min(agree, 1.0 - agree))
+
+
+def _read_optional(reader, name, t_start, t_end):
+    if name not in reader.signals:
+        return None
+    t, v = reader.read(name, t_start, t_end)
+    return (t, v) if len(t) else None
+
+
+def load_reference(reader, t_start=None, t_end=None, min_spacing=None):
+    """Speed of a recorded session (SessionReader) with its reference reversals.
+
+    The reversals are the sign changes of the recorded edge directions when
+    the telemetry had the second encoder channel, else the offline minima
+    of |v| no closer than `min_spacing` (default: a quarter of the period
+    of the recorded dominant frequency, else 0.1 s). Returns a dict with t,
+    v, seeds (dominant frequency or None), directions (or None), reversals,
+    source and min_spacing.
+    """
+    t, v = reader.read("speed", t_start, t_end)
+    seeds = _read_optional(reader, "dominant_frequency", t_start, t_end)
+    directions = _read_optional(reader, "edge_direction", t_start, t_end)
+
+    if min_spacing is None:
+        min_spacing = 0.1
+        if seeds is not None and np.median(seeds[1]) > 0:
+            min_spacing = 0.25 / float(np.median(seeds[1]))
+
+    if directions is not None:
+        reversals = flip_times(*directions)
+        source = "edge directions"
+    else:
+        reversals = reference_reversals(t, v, min_spacing)
+        source = "offline |v| minima"
+
+    return {
+        "t": t,
+        "v": v,
+        "seeds": seeds,
+        "directions": directions,
+        "reversals": reversals,
+        "source": source,
+        "min_spacing": min_spacing,
+    }
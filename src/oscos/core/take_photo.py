@@ -1,13 +1,150 @@
 import cv2
-import numpy as np
-from pypylon import pylon
+from pypylon import pylon, genicam
+from .image_io import develop_raw, bayer_code_for, BAYER_CODES
 
 
-def take_photo(exposure_us=2000000, gain_db=0.0):
+# Factores de binning/decimación ofrecidos en la interfaz
+BINNING_FACTORS = (1, 2, 4)
+
+# Formatos de pixel aceptados: color (3 bytes/pixel) y Bayer (1 byte/pixel)
+COLOR_FORMATS = ("BGR8", "RGB8")
+BAYER_FORMATS = tuple(BAYER_CODES)
+
+# Caché por número de serie: formatos soportados y formato elegido
+_supported_formats = {}
+_chosen_formats = {}
+
+
+def negotiate_pixel_format(cam, serial, prefer_bayer=False):
+    """
+    Elige y aplica el formato de pixel de la cámara.
+
+    Los formatos soportados se consultan una sola vez por cámara y la
+    elección se guarda, así que las capturas siguientes no prueban formatos
+    atrapando excepciones. Con prefer_bayer se transfiere el mosaico Bayer
+    (1 byte/pixel) en lugar de RGB8/BGR8 (3 bytes/pixel).
+    """
+    key = (serial, bool(prefer_bayer))
+    fmt = _chosen_formats.get(key)
+
+    if fmt is None:
+        supported = _supported_formats.get(serial)
+        if supported is None:
+            supported = set(cam.PixelFormat.GetSymbolics())
+            _supported_formats[serial] = supported
+
+        order = BAYER_FORMATS + COLOR_FORMATS if prefer_bayer else COLOR_FORMATS + BAYER_FORMATS
+        fmt = next((f for f in order if f in supported), None)
+        if fmt is None:
+            raise RuntimeError("La cámara no soporta formatos RGB8/BGR8/Bayer8.")
+        _chosen_formats[key] = fmt
+
+    try:
+        cam.PixelFormat.SetValue(fmt)
+    except Exception:
+        # Caché desactualizada: se descubre de nuevo en la siguiente captura
+        _supported_formats.pop(serial, None)
+        _chosen_formats.pop(key, None)
+        raise
+
+    return fmt
+
+
+def _snap(value, minimum, maximum, inc):
+    # Ajusta al rango [minimum, maximum] y al incremento del nodo (hacia abajo)
+    value = max(minimum, min(maximum, int(value)))
+    return minimum + ((value - minimum) // inc) * inc
+
+
+def _node(cam, name):
+    # Nodo GenICam si existe y se puede escribir, si no None
+    try:
+        node = getattr(cam, name)
+        return node if genicam.IsWritable(node) else None
+    except Exception:
+        return None
+
+
+def _apply_binning(cam, binning):
+    """Aplica binning (o decimación si no hay binning) y regresa el factor usado."""
+    if binning <= 1:
+        for name in ("BinningHorizontal", "BinningVertical",
+                     "DecimationHorizontal", "DecimationVertical"):
+            node = _node(cam, name)
+            if node is not None:
+                node.SetValue(1)
+        return 1
+
+    for h_name, v_name in (("BinningHorizontal", "BinningVertical"),
+                           ("DecimationHorizontal", "DecimationVertical")):
+        h, v = _node(cam, h_name), _node(cam, v_name)
+        if h is None or v is None:
+            continue
+        factor = min(int(binning), h.GetMax(), v.GetMax())
+        h.SetValue(factor)
+        v.SetValue(factor)
+        return factor
+
+    return 1
+
+
+def apply_roi(cam, roi=None, binning=1, bayer=False):
+    """
+    Configura binning y región de interés (ROI) en la cámara abierta.
+
+    roi = (x, y, w, h) en pixeles ya binneados, o None para el sensor completo.
+    Los valores se ajustan a los mínimos, máximos e incrementos de la cámara;
+    con Bayer se mantienen pares para conservar la fase del mosaico.
+    Regresa (x, y, w, h, binning) realmente aplicados.
+    """
+    # Offsets a cero primero para que Width/Height puedan crecer
+    cam.OffsetX.SetValue(cam.OffsetX.GetMin())
+    cam.OffsetY.SetValue(cam.OffsetY.GetMin())
+
+    factor = _apply_binning(cam, binning)
+
+    if roi is None:
+        x, y, w, h = 0, 0, cam.Width.GetMax(), cam.Height.GetMax()
+    else:
+        x, y, w, h = roi
+
+    step = 2 if bayer else 1
+    w_inc = max(cam.Width.GetInc(), step)
+    h_inc = max(cam.Height.GetInc(), step)
+    width = _snap(w, cam.Width.GetMin(), cam.Width.GetMax(), w_inc)
+    height = _snap(h, cam.Height.GetMin(), cam.Height.GetMax(), h_inc)
+    cam.Width.SetValue(width)
+    cam.Height.SetValue(height)
+
+    # Los máximos de offset dependen del tamaño ya configurado
+    x_inc = max(cam.OffsetX.GetInc(), step)
+    y_inc = max(cam.OffsetY.GetInc(), step)
+    offset_x = _snap(x, cam.OffsetX.GetMin(), cam.OffsetX.GetMax(), x_inc)
+    offset_y = _snap(y, cam.OffsetY.GetMin(), cam.OffsetY.GetMax(), y_inc)
+    cam.OffsetX.SetValue(offset_x)
+    cam.OffsetY.SetValue(offset_y)
+
+    return offset_x, offset_y, width, height, factor
+
+
+def take_photo(exposure_us=2000000, gain_db=0.0, raw_frame=False, roi=None, binning=1,
+               info=None, bayer_transfer=False, on_trigger=None):
     """
     Captura imagen con cámara Basler y regresa:
     - color_bgr: imagen en color
-    - gray: imagen en blanco y negro
+    - con raw_frame=True, el cuadro crudo del sensor (mosaico Bayer si la
+      cámara lo soporta) para procesarlo después con develop_raw
+
+    roi = (x, y, w, h) limita la lectura a una franja del sensor y binning
+    agrupa pixeles; ambos reducen tiempo de lectura, ancho de banda y tamaño
+    de archivo. Si se pasa un dict en info, se llena con los valores
+    aplicados (roi_x, roi_y, roi_width, roi_height, binning, pixel_format).
+
+    Con bayer_transfer=True (implícito con raw_frame) la cámara envía el
+    mosaico Bayer y el demosaicing se hace aquí con el patrón correcto.
+
+    on_trigger() se llama justo después de StartGrabbing, al iniciar la
+    exposición (p. ej. para registrar el tiempo de sesión del disparo).
     """
 
     tlf = pylon.TlFactory.GetInstance()
@@ -16,16 +153,18 @@ def take_photo(exposure_us=2000000, gain_db=0.0):
     if not devices:
         raise RuntimeError("No se encontró cámara Basler.")
 
-    cam = pylon.InstantCamera(tlf.CreateDevice(devices[0]))
+    device = devices[0]
+    cam = pylon.InstantCamera(tlf.CreateDevice(device))
     cam.Open()
 
-    # Pixel Formats a intentar
-    for fmt in ["RGB8", "BGR8", "BayerRG8", "BayerGB8", "BayerBG8", "BayerGR8"]:
-        try:
-            cam.PixelFormat.SetValue(fmt)
-            break
-        except:
-            continue
+    # Formato de pixel (Bayer primero en modo crudo o con transferencia Bayer)
+    try:
+        pixel_format = negotiate_pixel_format(
+            cam, device.GetSerialNumber(), prefer_bayer=raw_frame or bayer_transfer
+        )
+    except Exception:
+        cam.Close()
+        raise
 
     # Desactivar auto
     if hasattr(cam, "GainAuto"):
@@ -37,16 +176,18 @@ def take_photo(exposure_us=2000000, gain_db=0.0):
     cam.Gain.SetValue(gain_db)
     cam.ExposureTime.SetValue(exposure_us)
 
-    # Ajuste de resolución completa
-    cam.Width.SetValue(2040)
-    cam.Height.SetValue(1086)
-    cam.OffsetX.SetValue(0)
-    cam.OffsetY.SetValue(0)
+    # Binning y región de interés (sensor completo si roi es None)
+    applied = apply_roi(cam, roi, binning, bayer=pixel_format in BAYER_FORMATS)
+    if info is not None:
+        info.update(zip(("roi_x", "roi_y", "roi_width", "roi_height", "binning"), applied))
+        info["pixel_format"] = pixel_format
 
     cam.TriggerMode.SetValue("Off")
 
     # Captura
     cam.StartGrabbing(1)
+    if on_trigger is not None:
+        on_trigger()
     grab = cam.RetrieveResult(5000, pylon.TimeoutHandling_ThrowException)
 
     if not grab.GrabSucceeded():
@@ -57,43 +198,21 @@ def take_photo(exposure_us=2000000, gain_db=0.0):
     grab.Release()
     cam.Close()
 
-    # Si es Bayer, demosaicing
-    if len(raw.shape) == 2:
-        try:
-            color_bgr = cv2.cvtColor(raw, cv2.COLOR_BayerRG2BGR)
-        except:
-            raise RuntimeError("Error en demosaicing.")
-    else:
-        color_bgr = raw
-
-    # Aplicar balance de color (multiplicadores por canal)
-    # Los valores pedidos vienen en formato RGB; OpenCV usa BGR.
-    # Valores: red 1,06445  -> 1.06445
-    #         green 0,87891 -> 0.87891
-    #         blue 1,06787  -> 1.06787
-    r_mult = 0.952
-    g_mult = 0.95
-    b_mult = 1
-
-    try:
-        img_f = color_bgr.astype(np.float32)
-        img_f[..., 0] *= b_mult
-        img_f[..., 1] *= g_mult
-        img_f[..., 2] *= r_mult
-        img_f = np.clip(img_f, 0, 255)
-        color_bgr = img_f.astype(np.uint8)
-    except Exception:
-        # Fallback: leave image unchanged on any unexpected issue
-        pass
+    # OpenCV trabaja en BGR
+    if pixel_format == "RGB8":
+        raw = cv2.cvtColor(raw, cv2.COLOR_RGB2BGR)
 
-    # Convertir a gris
-    gray = cv2.cvtColor(color_bgr, cv2.COLOR_BGR2GRAY)
+    # Modo crudo: se devuelve el mosaico Bayer sin procesar (1 byte/pixel)
+    if raw_frame:
+        return raw
 
-    return color_bgr
+    # Demosaicing con el patrón del formato usado (si es Bayer) y balance de color
+    return develop_raw(raw, bayer_code_for(pixel_format))
 
 
 if __name__ == "__main__":
     # Quick test: try to take one photo and save it to disk.
+    # Run from src/oscos as a module: python -m core.take_photo
     import time
     out_name = f"test_capture_{time.strftime('%Y%m%d_%H%M%S')}.png"
     try:
@@ -103,7 +222,6 @@ if __name__ == "__main__":
         print("If you don't have a Basler camera available this test will fail.")
     else:
         try:
-            import cv2
             ok = cv2.imwrite(out_name, img)
             if ok:
                 print("Saved test image to", out_name)
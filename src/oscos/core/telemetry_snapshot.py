@@ -0,0 +1,89 @@
+import os
+import time
+import numpy as np
+
+
+# Buffers stored with every photo
+SNAPSHOT_SIGNALS = ("speed", "speed_corrected", "acceleration", "rpm")
+
+# Appended to the photo file name: "<photo>.<ext>.telemetry.npz"
+SNAPSHOT_SUFFIX = ".telemetry.npz"
+
+# Extra telemetry kept before the exposure starts (seconds)
+DEFAULT_SNAPSHOT_MARGIN_S = 1.0
+
+# Wait after the frame is retrieved before reading the window, so the
+# telemetry of the exposure still in the serial queue has reached the buffers
+DEFAULT_SNAPSHOT_SETTLE_S = 0.2
+
+
+def snapshot_path_for(photo_path):
+    return photo_path + SNAPSHOT_SUFFIX
+
+
+def capture_snapshot(registry, seconds, signals=SNAPSHOT_SIGNALS, t_end=None):
+    """Copy the `seconds` seconds up to `t_end` of each signal in `registry` into arrays.
+
+    All signals are cut over the same window of the registry's session clock;
+    `t_end` is a session time (default: now), so a window can be anchored at
+    an event that happened before the call.
+    For every signal the archive holds `<name>_t` (session seconds) and
+    `<name>_v`; `t0` is the device time of session time 0 (NaN if unknown),
+    so the windows can be placed back on the device clock offline.
+    """
+    t0 = registry.clock.origin
+    if t_end is None:
+        t_end = registry.clock.now()
+    snapshot = {
+        "captured_at": np.float64(time.time()),
+        "window_s": np.float64(seconds),
+        "t0": np.float64(np.nan if t0 is None else t0),
+    }
+
+    window = registry.get_range(signals, t_end - float(seconds), t_end)
+    for name, (ts, vs) in window.items():
+        snapshot[f"{name}_t"] = np.asarray(ts, dtype=np.float64)
+        snapshot[f"{name}_v"] = np.asarray(vs, dtype=np.float64)
+
+    return snapshot
+
+
+class SnapshotRequest:
+    """Telemetry window of one exposure, read once its samples have arrived.
+
+    Create it when the exposure starts: the trigger is recorded on the
+    registry's session clock. Call capture() later (about
+    DEFAULT_SNAPSHOT_SETTLE_S after the frame is retrieved) to copy the
+    `margin_s` seconds before the trigger plus the exposure itself; the
+    archive also holds `t_trigger` (session seconds).
+    """
+
+    def __init__(self, registry, exposure_s, margin_s=DEFAULT_SNAPSHOT_MARGIN_S, signals=SNAPSHOT_SIGNALS):
+        self.registry = registry
+        self.exposure_s = float(exposure_s)
+        self.margin_s = float(margin_s)
+        self.signals = signals
+        self.t_trigger = registry.clock.now()
+
+    def capture(self):
+        snapshot = capture_snapshot(
+            self.registry,
+            self.exposure_s + self.margin_s,
+            self.signals,
+            t_end=self.t_trigger + self.exposure_s,
+        )
+        snapshot["t_trigger"] = np.float64(self.t_trigger)
+        return snapshot
+
+
+def save_snapshot(path, snapshot):
+    # Write through a file object so np.savez does not touch the extension
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        np.savez_compressed(f, **snapshot)
+    os.replace(tmp_path, path)
+
+
+def load_snapshot(path):
+    with np.load(path) as data:
+        return {key: data[key] for key in data.files}
@@ -0,0 +1,112 @@
+import os
+import sqlite3
+import time
+from threading import Lock
+
+
+# File name of the thumbnail cache, stored hidden inside the photo root
+THUMBNAIL_DB_NAME = ".oscos_thumbnails.sqlite"
+
+
+class ThumbnailCache:
+    """Encoded thumbnails stored in a single SQLite file.
+
+    Entries are keyed by path and only returned while the file's mtime and
+    size still match. The least recently used entries are evicted once the
+    cache holds more than `max_entries`. Reads and writes are batched: call
+    `flush()` after a burst of get/put to commit and evict in one transaction.
+    Safe to use from several threads.
+    """
+
+    def __init__(self, db_path, max_entries=20000):
+        self.db_path = db_path
+        self.max_entries = int(max_entries)
+        self.lock = Lock()
+        self._touched = {}
+
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS thumbnails ("
+            " path TEXT PRIMARY KEY,"
+            " mtime_ns INTEGER NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " last_used REAL NOT NULL,"
+            " data BLOB NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS thumbnails_last_used ON thumbnails(last_used)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def _key(path, st=None):
+        if st is None:
+            st = os.stat(path)
+        return os.path.normpath(path), st.st_mtime_ns, st.st_size
+
+    def get(self, path, st=None):
+        """Return the cached thumbnail bytes for `path`, or None if missing/stale."""
+        try:
+            key, mtime_ns, size = self._key(path, st)
+        except OSError:
+            return None
+
+        with self.lock:
+            row = self._conn.execute(
+                "SELECT data FROM thumbnails WHERE path=? AND mtime_ns=? AND size=?",
+                (key, mtime_ns, size),
+            ).fetchone()
+            if row is None:
+                return None
+            self._touched[key] = time.time()
+
+        return row[0]
+
+    def put(self, path, data, st=None):
+        try:
+            key, mtime_ns, size = self._key(path, st)
+        except OSError:
+            return
+
+        with self.lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO thumbnails (path, mtime_ns, size, last_used, data)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (key, mtime_ns, size, time.time(), sqlite3.Binary(data)),
+            )
+
+    def discard(self, path):
+        with self.lock:
+            key = os.path.normpath(path)
+            self._touched.pop(key, None)
+            self._conn.execute("DELETE FROM thumbnails WHERE path=?", (key,))
+
+    def flush(self):
+        """Commit pending writes, record LRU timestamps and evict old entries."""
+        with self.lock:
+            if self._touched:
+                self._conn.executemany(
+                    "UPDATE thumbnails SET last_used=? WHERE path=?",
+                    [(t, p) for p, t in self._touched.items()],
+                )
+                self._touched.clear()
+
+            count = self._conn.execute("SELECT COUNT(*) FROM thumbnails").fetchone()[0]
+            excess = count - self.max_entries
+            if excess > 0:
+                self._conn.execute(
+                    "DELETE FROM thumbnails WHERE path IN ("
+                    " SELECT path FROM thumbnails ORDER BY last_used ASC LIMIT ?)",
+                    (excess,),
+                )
+
+            self._conn.commit()
+
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            with self.lock:
+                self._conn.close()
@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("cv2")
+
+from core.amplitude import measure_frame, measure_profile, amplitude_from_extent
+
+
+def blur_trail(width, center, amplitude, object_width, background=20.0, level=200.0, steps=2000):
+    """Profile of a part oscillating sinusoidally during the whole exposure."""
+    x = np.arange(width) + 0.5
+    profile = np.zeros(width)
+    for phase in np.linspace(0.0, 2.0 * np.pi, steps, endpoint=False):
+        pos = center + amplitude * np.sin(phase)
+        profile += np.abs(x - pos) <= object_width / 2.0
+    return background + (level - background) * profile / steps
+
+
+def test_sinusoidal_trail_extent():
+    profile = blur_trail(400, 200.0, 150.0, 20.0)
+
+    # Dim middle, bright turning points, trail wider than half the ROI
+    assert profile[200] - 20.0 < 0.35 * (profile.max() - 20.0)
+    assert np.median(profile) > 20.0
+
+    # True trail: 2 * 150 + 20 px; the half-contrast edges sit slightly inside
+    start, end, centroid = measure_profile(profile)
+    assert abs((end - start) - 320) <= 12
+    assert abs(centroid - 200.0) <= 2.0
+
+
+def test_sinusoidal_trail_raw_frame(tmp_path):
+    profile = blur_trail(400, 180.0, 120.0, 30.0, background=200.0, level=40.0)
+    frame = np.tile(profile, (64, 1)).astype(np.uint16)
+    path = str(tmp_path / "capture.npy")
+    np.save(path, frame)
+
+    found = measure_frame(path)
+    assert found is not None
+    assert abs(found["extent_px"] - 270) <= 16
+    assert abs(amplitude_from_extent(found["extent_px"], 30) - 120) <= 8
+
+
+def test_flat_frame_has_no_part():
+    assert measure_profile(np.full(200, 50.0)) is None
@@ -0,0 +1,56 @@
+import os
+
+from core.catalog import PhotoCatalog, METADATA_CSV_NAME
+
+
+def write_csv(folder, text):
+    with open(os.path.join(folder, METADATA_CSV_NAME), "w", newline="", encoding="utf-8") as f:
+        f.write(text)
+
+
+def test_reimport_keeps_measurements_and_order(tmp_path):
+    folder = tmp_path / "set1"
+    folder.mkdir()
+    write_csv(folder, "filename,amp,rpm_cmd\na.png,1,100\nb.png,2,200\nc.png,3,300\n")
+
+    catalog = PhotoCatalog(str(tmp_path))
+    try:
+        assert catalog.import_csv(str(folder)) == 3
+        catalog.update(str(folder), "a.png", {"amp_measured_px": 12.5})
+
+        write_csv(folder, "filename,amp,rpm_cmd\na.png,1,110\nb.png,2,200\nc.png,3,300\n")
+        catalog.import_csv(str(folder))
+
+        row = catalog.get(str(folder), "a.png")
+        assert row["amp_measured_px"] == 12.5
+        assert row["rpm_cmd"] == 110
+        assert [r["filename"] for r in catalog.query(folder=str(folder))] == ["a.png", "b.png", "c.png"]
+    finally:
+        catalog.close()
+
+
+def test_import_odd_headers(tmp_path):
+    folder = tmp_path / "set1"
+    folder.mkdir()
+    write_csv(folder, "filename,order,Speed (mm/s),,amp\na.png,2,4.5,x,3\n")
+
+    catalog = PhotoCatalog(str(tmp_path))
+    try:
+        assert catalog.import_csv(str(folder)) == 1
+        row = catalog.get(str(folder), "a.png")
+        assert row["order"] == "2"
+        assert row["Speed__mm_s_"] == "4.5"
+        assert row["amp"] == 3
+    finally:
+        catalog.close()
+
+
+def test_update_inserts_missing_photo(tmp_path):
+    catalog = PhotoCatalog(str(tmp_path))
+    try:
+        catalog.update(str(tmp_path), "new.png", {"gain": 2.0})
+        assert catalog.get(str(tmp_path), "new.png")["gain"] == 2.0
+        assert catalog.remove(str(tmp_path), "new.png")
+        assert catalog.get(str(tmp_path), "new.png") is None
+    finally:
+        catalog.close()
@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+
+from core.data_buffer import TelemetryBuffer
+from core.processors import DampingEstimator
+
+
+def test_decay_of_speed_magnitude_peaks():
+    delta_buf, zeta_buf, q_buf = TelemetryBuffer(), TelemetryBuffer(), TelemetryBuffer()
+    estimator = DampingEstimator(delta_buf, zeta_buf, q_buf, window=8, peaks_per_period=2)
+
+    # Two peaks per 0.5 s period, decaying at sigma = 0.4 1/s
+    period, sigma = 0.5, 0.4
+    for k in range(20):
+        t = k * period / 2.0
+        estimator(t, 5.0 * np.exp(-sigma * t))
+
+    delta = sigma * period
+    zeta = delta / np.sqrt(4.0 * np.pi ** 2 + delta ** 2)
+    assert delta_buf.get_latest(1)[1][0] == pytest.approx(delta)
+    assert zeta_buf.get_latest(1)[1][0] == pytest.approx(zeta)
+    assert q_buf.get_latest(1)[1][0] == pytest.approx(1.0 / (2.0 * zeta))
+
+    # Nothing is estimated from fewer than three peaks
+    assert len(delta_buf.get_all()[0]) == 18
+
+
+def test_growing_oscillation_has_no_q():
+    delta_buf, zeta_buf, q_buf = TelemetryBuffer(), TelemetryBuffer(), TelemetryBuffer()
+    estimator = DampingEstimator(delta_buf, zeta_buf, q_buf)
+    for k in range(5):
+        estimator(k * 0.25, np.exp(0.2 * k))
+
+    assert zeta_buf.get_latest(1)[1][0] < 0
+    assert np.isnan(q_buf.get_latest(1)[1][0])
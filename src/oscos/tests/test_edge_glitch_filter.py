@@ -0,0 +1,50 @@
+import numpy as np
+
+from core.data_buffer import TelemetryBuffer
+from core.processors import EdgeGlitchFilter
+
+
+PERIOD = 0.01
+
+
+def steady(n, start=0.0):
+    return list(start + np.arange(n) * PERIOD)
+
+
+def test_missed_edges_are_filled():
+    raw = steady(20)
+    del raw[12]
+    del raw[15:17]
+
+    glitches = TelemetryBuffer()
+    filt = EdgeGlitchFilter(glitch_buffer=glitches)
+    out = filt.filter_edges(raw)
+
+    # Everything but the last (held back) edge, restored
+    np.testing.assert_allclose(out, steady(19))
+    assert (filt.missed, filt.extra) == (3, 0)
+    assert glitches.get_all()[1] == [1.0, 3.0]
+
+
+def test_extra_edges_are_dropped():
+    raw = steady(20)
+    raw.insert(13, 12.3 * PERIOD)
+    raw.insert(5, raw[4])
+
+    filt = EdgeGlitchFilter()
+    out = filt.filter_edges(raw)
+
+    np.testing.assert_allclose(out, steady(19))
+    assert (filt.missed, filt.extra) == (0, 2)
+    assert filt.quality == 1.0 - 2 / 22
+
+
+def test_speed_changes_pass_unchanged():
+    # Slowing down to a reversal and speeding up again
+    periods = np.concatenate((np.full(15, PERIOD), PERIOD * 1.15 ** np.arange(1, 11),
+                              PERIOD * 1.15 ** np.arange(10, 0, -1), np.full(10, PERIOD)))
+    raw = np.cumsum(periods)
+
+    filt = EdgeGlitchFilter()
+    np.testing.assert_allclose(filt.filter_edges(raw), raw[:-1])
+    assert filt.glitches == 0
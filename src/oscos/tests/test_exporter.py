@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from core.exporter import export_signals, ExportCancelled
+
+
+SIGNALS = {
+    "speed": ([0.0, 0.5, 1.0], [1.0, 2.0, 3.0]),
+    "rpm": ([0.25], [600.0]),
+}
+
+
+def test_long_csv(tmp_path):
+    path = str(tmp_path / "out.csv")
+    percents = []
+    export_signals(path, SIGNALS, "csv", progress=percents.append, chunk_size=2)
+
+    lines = (tmp_path / "out.csv").read_text().splitlines()
+    assert lines[0] == "signal,timestamp,value"
+    assert lines[1:] == ["speed,0,1", "speed,0.5,2", "speed,1,3", "rpm,0.25,600"]
+    assert percents[-1] == 100
+
+
+def test_npz_round_trip(tmp_path):
+    path = str(tmp_path / "out.npz")
+    export_signals(path, SIGNALS, "npz")
+
+    data = np.load(path)
+    np.testing.assert_allclose(data["speed_t"], SIGNALS["speed"][0])
+    np.testing.assert_allclose(data["rpm_v"], SIGNALS["rpm"][1])
+
+
+def test_cancelled_export_leaves_nothing(tmp_path):
+    path = tmp_path / "out.csv"
+    with pytest.raises(ExportCancelled):
+        export_signals(str(path), SIGNALS, "csv", is_cancelled=lambda: True, chunk_size=1)
+    assert list(tmp_path.iterdir()) == []
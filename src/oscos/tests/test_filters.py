@@ -0,0 +1,39 @@
+import numpy as np
+
+from core.filters import SavgolFilter, savgol_fit, zero_phase
+
+
+def irregular_times(n, seed=3):
+    return np.cumsum(np.random.default_rng(seed).uniform(0.01, 0.05, n))
+
+
+def test_quadratic_is_reproduced_on_irregular_samples():
+    t = irregular_times(50)
+    v = 3.0 * t ** 2 - 2.0 * t + 1.0
+
+    te, fit = savgol_fit(t, v, window=9, order=2)
+    np.testing.assert_allclose(te, t[4:-4])
+    np.testing.assert_allclose(fit, v[4:-4])
+
+    te, slope = savgol_fit(t, v, window=9, order=2, deriv=1, position="end")
+    np.testing.assert_allclose(te, t[8:])
+    np.testing.assert_allclose(slope, 6.0 * t[8:] - 2.0)
+
+
+def test_batches_match_whole_series():
+    t = irregular_times(100)
+    v = np.sin(5.0 * t) + np.random.default_rng(4).normal(0.0, 0.1, t.size)
+
+    whole = savgol_fit(t, v, window=9, order=2, deriv=1)
+    filt = SavgolFilter(window=9, order=2, deriv=1)
+    parts = [filt.process(t[i:j], v[i:j]) for i, j in ((0, 3), (3, 4), (4, 40), (40, 100))]
+
+    np.testing.assert_allclose(np.concatenate([p[0] for p in parts]), whole[0])
+    np.testing.assert_allclose(np.concatenate([p[1] for p in parts]), whole[1])
+
+
+def test_zero_phase_keeps_every_sample():
+    t = irregular_times(30)
+    v = 2.0 * t + 1.0
+    np.testing.assert_allclose(zero_phase(t, v), v)
+    np.testing.assert_allclose(zero_phase(t, v, deriv=1), np.full(t.size, 2.0))
@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("cv2")
+
+from core.image_io import save_frame, load_raw, to_uint8, convert_to_png
+
+
+def test_raw_frame_round_trip(tmp_path):
+    frame = np.arange(64, dtype=np.uint8).reshape(8, 8)
+    path = str(tmp_path / "capture.npy")
+    save_frame(frame, path, "npy")
+
+    # No second ".npy" is appended, and the frame is memory-mapped back
+    assert [p.name for p in tmp_path.iterdir()] == ["capture.npy"]
+    raw = load_raw(path)
+    assert isinstance(raw, np.memmap)
+    np.testing.assert_array_equal(raw, frame)
+
+
+def test_to_uint8():
+    np.testing.assert_array_equal(to_uint8(np.array([0.0, 0.5, 1.0])), [0, 127, 255])
+    np.testing.assert_array_equal(to_uint8(np.array([-5, 100, 300])), [0, 100, 255])
+
+
+def test_conversion_never_overwrites_a_png(tmp_path):
+    save_frame(np.zeros((4, 4), dtype=np.uint8), str(tmp_path / "a.npy"), "npy")
+    (tmp_path / "a.png").write_bytes(b"existing")
+
+    with pytest.raises(FileExistsError):
+        convert_to_png(str(tmp_path / "a.npy"))
+    assert (tmp_path / "a.png").read_bytes() == b"existing"
+    assert (tmp_path / "a.npy").exists()
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from core.data_buffer import TelemetryBuffer
+from core.processors import KalmanEstimator
+
+
+def make(**kwargs):
+    buffers = TelemetryBuffer(), TelemetryBuffer(), TelemetryBuffer()
+    return KalmanEstimator(5.0, *buffers, **kwargs), buffers
+
+
+def edges(speed, accel, n, tooth=5e-3, jitter=2e-5, seed=8):
+    # Times at which the part has moved k teeth, with timestamp jitter
+    k = np.arange(n) * tooth
+    t = (-speed + np.sqrt(speed ** 2 + 2.0 * accel * k)) / accel if accel else k / speed
+    return t + np.random.default_rng(seed).normal(0.0, jitter, n)
+
+
+def test_constant_acceleration_is_tracked():
+    kalman, (position, speed, acceleration) = make()
+    t = edges(0.5, 2.0, 400)
+    for ti in t:
+        kalman.push(ti)
+
+    assert speed.get_latest(1)[1][0] == pytest.approx(0.5 + 2.0 * t[-1], rel=0.01)
+    assert acceleration.get_latest(1)[1][0] == pytest.approx(2.0, rel=0.2)
+    assert position.get_latest(1)[1][0] == pytest.approx(399 * 5e-3, abs=2e-4)
+
+
+def test_batch_matches_streaming():
+    t = edges(0.3, 0.0, 200)
+    stream, (_, speed, _) = make(output_rate=0)
+    for ti in t:
+        stream.push(ti)
+
+    batch, _ = make()
+    _, v, _ = batch.filter_edges(t)
+    np.testing.assert_allclose(v, speed.get_all()[1])
+
+
+def test_grid_outputs_between_edges():
+    kalman, (position, speed, _) = make(output_rate=50.0, max_latency=0.1)
+    kalman.push(1.0)
+    kalman.push(1.01)
+    kalman.tick(1.25)
+
+    ts = speed.get_all()[0]
+    assert ts[:2] == [1.0, 1.01]
+    np.testing.assert_allclose(ts[2:], [1.02, 1.04, 1.06, 1.08, 1.10, 1.12, 1.14])
+
+    # An edge arriving within max_latency is still newer than every output
+    kalman.push(1.145)
+    assert speed.get_all()[0][-1] == 1.145
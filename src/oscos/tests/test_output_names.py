@@ -0,0 +1,41 @@
+from core.output_names import OutputNameRegistry
+
+
+def test_collisions_get_suffixes(tmp_path):
+    folder = str(tmp_path)
+    (tmp_path / "photo.png").write_bytes(b"x")
+    (tmp_path / "photo_001.png").write_bytes(b"x")
+
+    names = OutputNameRegistry()
+    first = names.reserve(folder, "photo", ".png")
+    second = names.reserve(folder, "photo", ".png")
+    assert first == str(tmp_path / "photo_002.png")
+    assert second == str(tmp_path / "photo_003.png")
+
+    # Reservations exist on disk, so other programs cannot take them
+    assert (tmp_path / "photo_002.png").exists()
+
+    # A file created behind the registry's back is skipped
+    (tmp_path / "photo_004.png").write_bytes(b"x")
+    assert names.reserve(folder, "photo", ".png") == str(tmp_path / "photo_005.png")
+
+
+def test_release_frees_unwritten_name(tmp_path):
+    folder = str(tmp_path)
+    names = OutputNameRegistry()
+    path = names.reserve(folder, "photo", ".png")
+    assert path == str(tmp_path / "photo.png")
+
+    names.release(path)
+    assert not (tmp_path / "photo.png").exists()
+    assert names.reserve(folder, "photo", ".png") == path
+
+
+def test_release_keeps_written_file(tmp_path):
+    names = OutputNameRegistry()
+    path = names.reserve(str(tmp_path), "photo", ".png")
+    with open(path, "wb") as f:
+        f.write(b"data")
+
+    names.release(path)
+    assert (tmp_path / "photo.png").read_bytes() == b"data"
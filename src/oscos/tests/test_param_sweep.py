@@ -0,0 +1,43 @@
+import numpy as np
+
+from core.param_sweep import grid_points, reference_peaks, sweep
+from core.sign_eval import reference_reversals
+
+
+def recording(seconds=8.0, frequency=1.0):
+    t = np.arange(0.0, seconds, 0.02)
+    v = np.abs(np.sin(2.0 * np.pi * frequency * t)) + 0.05
+    return t, v
+
+
+def test_grid_points():
+    points = grid_points({"a": (1, 2), "b": (0.1,)})
+    assert points == [{"a": 1, "b": 0.1}, {"a": 2, "b": 0.1}]
+    assert grid_points({}) == [{}]
+
+
+def test_reference_reversals_and_peaks():
+    t, v = recording()
+    reversals = reference_reversals(t, v, min_spacing=0.25)
+    np.testing.assert_allclose(reversals, np.arange(1, 16) * 0.5, atol=0.03)
+
+    peak_t, peak_v = reference_peaks(t, v, reversals)
+    np.testing.assert_allclose(peak_t, np.arange(1, 15) * 0.5 + 0.25, atol=0.03)
+    np.testing.assert_allclose(peak_v, 1.05, atol=0.02)
+
+
+def test_sweep_ranks_best_first():
+    t, v = recording()
+    ref = {"t": t, "v": v, "reversals": reference_reversals(t, v, 0.25), "directions": None}
+    sign_grid = {"SLOPE_EPS": (0.02,), "CONFIRM_SAMPLES": (1, 3), "MIN_FLIP_DT": (0.2, 2.0),
+                 "smoothing_alpha": (0.2,)}
+    peak_grid = {"window_seconds": (0.3,), "threshold": (0.3,)}
+
+    sign_results, peak_results = sweep(ref, sign_grid, peak_grid, workers=2)
+    assert len(sign_results) == 4 and len(peak_results) == 1
+
+    errors = [score["errors"] for _, score in sign_results]
+    assert errors == sorted(errors)
+    # Flips at most every 2 s cannot follow a reversal every 0.5 s
+    assert sign_results[-1][0]["MIN_FLIP_DT"] == 2.0
+    assert sign_results[0][1]["errors"] < sign_results[-1][1]["errors"]
@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+from core.data_buffer import TelemetryBuffer
+from core.processors import PLLTracker
+
+
+def run(tracker, frequency, amplitude, seconds=60.0, offset=2.0):
+    rng = np.random.default_rng(2)
+    t = np.cumsum(rng.uniform(0.015, 0.025, int(seconds / 0.02)))
+    for ti in t:
+        tracker(ti, offset + amplitude * np.cos(2.0 * np.pi * frequency * ti + 0.3))
+    return t[-1]
+
+
+def test_locks_to_frequency_amplitude_and_phase():
+    f, a, p = TelemetryBuffer(), TelemetryBuffer(), TelemetryBuffer()
+    tracker = PLLTracker(f, a, p, initial_frequency=1.2)
+    t_end = run(tracker, 1.5, 3.0)
+
+    assert f.get_latest(1)[1][0] == pytest.approx(1.5, abs=0.01)
+    # The amplitude keeps some 2f ripple; its mean is unbiased
+    assert np.mean(a.get_latest(500)[1]) == pytest.approx(3.0, rel=0.03)
+
+    expected = (2.0 * np.pi * 1.5 * t_end + 0.3 + np.pi) % (2.0 * np.pi) - np.pi
+    error = (p.get_latest(1)[1][0] - expected + np.pi) % (2.0 * np.pi) - np.pi
+    assert abs(error) < 0.1
+
+
+def test_seed_pulls_the_loop_to_a_far_frequency():
+    f, a, p = TelemetryBuffer(), TelemetryBuffer(), TelemetryBuffer()
+    tracker = PLLTracker(f, a, p, initial_frequency=1.0)
+    tracker.seed(0.0, 4.0)
+    run(tracker, 4.0, 1.0, seconds=30.0)
+
+    assert f.get_latest(1)[1][0] == pytest.approx(4.0, abs=0.02)
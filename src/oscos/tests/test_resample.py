@@ -0,0 +1,43 @@
+import numpy as np
+
+from core.exporter import export_signals, align_options
+from core.resample import resample_signals, uniform_grid
+
+
+SIGNALS = {
+    "speed": (np.array([0.0, 1.0, 2.0, 3.0]), np.array([0.0, 10.0, 20.0, 30.0])),
+    "rpm": (np.array([0.5, 2.5]), np.array([600.0, 900.0])),
+}
+
+
+def test_default_grid_is_densest_signal():
+    grid, values = resample_signals(SIGNALS)
+    np.testing.assert_allclose(grid, SIGNALS["speed"][0])
+
+    # rpm is held, NaN before its first sample
+    np.testing.assert_allclose(values["rpm"], [np.nan, 600.0, 600.0, 900.0])
+    np.testing.assert_allclose(values["speed"], SIGNALS["speed"][1])
+
+
+def test_reference_grid_interpolates():
+    grid, values = resample_signals(SIGNALS, reference="rpm")
+    np.testing.assert_allclose(grid, [0.5, 2.5])
+    np.testing.assert_allclose(values["speed"], [5.0, 25.0])
+
+
+def test_uniform_grid_covers_common_span():
+    np.testing.assert_allclose(uniform_grid(SIGNALS, 2.0), [0.5, 1.0, 1.5, 2.0, 2.5])
+
+
+def test_align_options():
+    assert align_options("rate", ["speed"], 50) == {"rate": 50.0}
+    assert align_options("rpm", ["speed", "rpm"]) == {"reference": "rpm"}
+    assert align_options("rpm", ["speed"]) == {}
+
+
+def test_aligned_csv(tmp_path):
+    path = str(tmp_path / "out.csv")
+    export_signals(path, SIGNALS, "csv_aligned", align=align_options("rpm", list(SIGNALS)))
+
+    lines = (tmp_path / "out.csv").read_text().splitlines()
+    assert lines == ["t,speed,rpm", "0.5,5,600", "2.5,25,900"]
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from core.data_buffer import TelemetryBuffer
+from core.running_stats import RunningStats, WindowedStats
+
+
+def check(summary, values):
+    assert summary["count"] == len(values)
+    assert summary["mean"] == pytest.approx(np.mean(values))
+    assert summary["std"] == pytest.approx(np.std(values, ddof=1))
+    assert summary["rms"] == pytest.approx(np.sqrt(np.mean(np.square(values))))
+    assert summary["min"] == np.min(values)
+    assert summary["max"] == np.max(values)
+
+
+def test_run_statistics():
+    values = np.random.default_rng(6).normal(1e3, 2.0, 1000)
+    stats = RunningStats()
+    assert stats.summary() is None
+    for v in values:
+        stats.add(v)
+    check(stats.summary(), values)
+
+
+def test_window_statistics():
+    rng = np.random.default_rng(7)
+    t = np.cumsum(rng.uniform(0.05, 0.2, 400))
+    v = rng.normal(5.0, 1.0, t.size)
+
+    stats = WindowedStats(window_seconds=3.0)
+    for ti, vi in zip(t, v):
+        stats.add(ti, vi)
+    check(stats.summary(), v[t >= t[-1] - 3.0])
+
+
+def test_buffer_statistics():
+    buf = TelemetryBuffer(stats=True, stats_window=1.0)
+    for i in range(20):
+        buf.add(float(i), timestamp=i * 0.125)
+
+    check(buf.stats(), np.arange(20.0))
+    check(buf.stats(windowed=True), np.arange(11.0, 20.0))
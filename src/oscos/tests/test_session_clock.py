@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from core.session_clock import SessionClock
+
+
+def test_drift_and_offset_fit_ignore_transport_delay():
+    rng = np.random.default_rng(0)
+    clock = SessionClock(block_seconds=1.0, host_clock=lambda: 0.0)
+
+    # Host clock runs 1000 ppm fast; every sample arrives 0-50 ms late, and
+    # at least one per block arrives without delay
+    for i in range(300):
+        device_t = 5.0 + i * 0.1
+        delay = 0.0 if i % 5 == 0 else rng.uniform(0.0, 0.05)
+        clock.observe(device_t, 1000.0 + device_t * 1.001 + delay)
+
+    assert clock.drift == pytest.approx(0.001 / 1.001, rel=1e-6)
+    assert clock.origin == pytest.approx(5.0)
+
+    # A host time maps back to the device time it was sent at
+    device_t = 30.0
+    assert clock.from_host(1000.0 + device_t * 1.001) == pytest.approx(device_t - 5.0, abs=1e-9)
+
+
+def test_host_timed_samples_before_device_reference():
+    host = [10.0]
+    clock = SessionClock(host_clock=lambda: host[0])
+
+    # The first event starts the session, even without device timestamps
+    assert clock.now() == 0.0
+    host[0] = 12.0
+    assert clock.now() == pytest.approx(2.0)
+
+    # The device origin is chosen so that earlier session times stay valid
+    assert clock.observe(100.0, 12.0) == pytest.approx(2.0)
+    assert clock.from_device(101.0) == pytest.approx(3.0)
+
+    clock.reset()
+    assert clock.origin is None
+    assert clock.now() == 0.0
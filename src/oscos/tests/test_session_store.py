@@ -0,0 +1,48 @@
+import os
+
+import numpy as np
+
+from core.data_buffer import BufferRegistry
+from core.session_store import SessionStore, SessionReader, write_session, load_session, CHUNK_EXT
+
+
+def test_recorded_samples_read_back(tmp_path):
+    registry = BufferRegistry()
+    store = SessionStore(str(tmp_path), registry, signals=("speed", "rpm"),
+                         compression="zlib", chunk_size=4)
+    for i in range(10):
+        registry.speed.add(float(i) * 2, timestamp=i * 0.1)
+    registry.rpm.add(600.0, timestamp=0.5)
+    store.close()
+
+    reader = SessionReader(str(tmp_path))
+    assert reader.signals == ["speed", "rpm"]
+
+    t, v = reader.read("speed")
+    np.testing.assert_allclose(t, np.arange(10) * 0.1)
+    np.testing.assert_allclose(v, np.arange(10) * 2.0)
+    assert reader.time_range("speed") == (0.0, 0.9)
+
+    # Only the requested range is returned
+    t, v = reader.read("speed", t_start=0.25, t_end=0.55)
+    np.testing.assert_allclose(t, [0.3, 0.4, 0.5])
+
+    t, v = reader.read("rpm")
+    np.testing.assert_allclose(v, [600.0])
+
+    # Samples added after close() are not recorded
+    registry.speed.add(1.0, timestamp=5.0)
+    assert len(SessionReader(str(tmp_path)).read("speed")[0]) == 10
+
+
+def test_truncated_last_chunk_is_ignored(tmp_path):
+    t = np.arange(10, dtype=np.float64)
+    write_session(str(tmp_path), {"speed": (t, t * 3)}, compression="none", chunk_size=4)
+
+    path = os.path.join(str(tmp_path), "speed" + CHUNK_EXT)
+    with open(path, "r+b") as f:
+        f.truncate(os.path.getsize(path) - 8)
+
+    loaded = load_session(str(tmp_path))
+    np.testing.assert_allclose(loaded["speed"][0], t[:8])
+    np.testing.assert_allclose(loaded["speed"][1], t[:8] * 3)
@@ -0,0 +1,39 @@
+import numpy as np
+
+from core.data_buffer import TelemetryBuffer
+from core.processors import ModelSignCorrector
+
+
+def test_sine_sign_is_recovered_from_magnitude():
+    rng = np.random.default_rng(9)
+    t = np.cumsum(rng.uniform(0.015, 0.025, 500))
+    v = np.sin(2.0 * np.pi * 1.0 * t) + rng.normal(0.0, 0.02, t.size)
+
+    out = TelemetryBuffer()
+    corrector = ModelSignCorrector(out)
+    for ti, vi in zip(t, v):
+        corrector(ti, abs(vi))
+
+    # One reversal per zero crossing; the sign may start inverted
+    crossings = int(np.floor(2.0 * t[-1]))
+    assert abs(corrector.reversals - crossings) <= 1
+
+    signed = np.asarray(out.get_all()[1])
+    settled = (t > 2.0) & (np.abs(v) > 0.3)
+    agreement = np.mean(np.sign(signed[settled]) == np.sign(v[settled]))
+    assert max(agreement, 1.0 - agreement) > 0.98
+
+
+def test_direction_channel_takes_precedence():
+    out = TelemetryBuffer()
+    corrector = ModelSignCorrector(out, direction_timeout=0.5)
+    corrector.set_direction(0.0, -1)
+    corrector(0.1, 2.0)
+    corrector.set_direction(0.2, 1)
+    corrector(0.3, 3.0)
+    assert out.get_all()[1] == [-2.0, 3.0]
+    assert corrector.reversals == 1
+
+    # Without recent directions the magnitude model takes over
+    corrector(1.0, 1.0)
+    assert out.get_all()[1][-1] == 1.0
@@ -0,0 +1,28 @@
+import numpy as np
+
+from core.processors import SlidingExtremum
+
+
+def test_matches_brute_force_window():
+    rng = np.random.default_rng(5)
+    t = np.cumsum(rng.uniform(0.01, 0.1, 500))
+    v = rng.normal(size=t.size)
+
+    ext = SlidingExtremum(window_seconds=1.5)
+    for i, (ti, vi) in enumerate(zip(t, v)):
+        ext(ti, vi)
+        window = v[(t >= ti - 1.5) & (t <= ti)]
+        assert ext.max == window.max()
+        assert ext.min == window.min()
+        assert ext.peak_to_peak == window.max() - window.min()
+
+
+def test_time_going_backwards_starts_over():
+    ext = SlidingExtremum(window_seconds=10.0)
+    ext(1.0, 5.0)
+    ext(2.0, -5.0)
+    ext(0.5, 1.0)
+    assert (ext.max, ext.min) == (1.0, 1.0)
+
+    ext.reset()
+    assert ext.max is None and ext.peak_to_peak is None
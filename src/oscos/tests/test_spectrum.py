@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+from core.data_buffer import TelemetryBuffer, SpectrumBuffer
+from core.processors import SpectrumProcessor
+
+
+def test_dominant_frequency_of_irregular_samples():
+    rng = np.random.default_rng(1)
+    out, spectrum = TelemetryBuffer(), SpectrumBuffer()
+    proc = SpectrumProcessor(out, spectrum, sample_rate=50.0, segment=512)
+
+    t = np.cumsum(rng.uniform(0.01, 0.03, 4000))
+    for ti in t:
+        proc(ti, 0.5 + np.sin(2.0 * np.pi * 2.3 * ti))
+
+    ts, fs = out.get_all()
+    assert len(fs) > 10
+    assert fs[-1] == pytest.approx(2.3, abs=0.02)
+
+    frequencies, power, _ = spectrum.get()
+    assert frequencies[np.argmax(power)] == pytest.approx(2.3, abs=0.1)
+
+
+def test_gap_restarts_the_grid():
+    out, spectrum = TelemetryBuffer(), SpectrumBuffer()
+    proc = SpectrumProcessor(out, spectrum, sample_rate=50.0, segment=64, max_gap=0.5)
+
+    for i in range(60):
+        proc(i * 0.02, np.sin(i))
+    proc(10.0, 0.0)
+    for i in range(1, 60):
+        proc(10.0 + i * 0.02, np.sin(i))
+
+    # Neither run alone fills a segment
+    assert out.get_all() == ([], [])
@@ -0,0 +1,81 @@
+import pytest
+
+pytest.importorskip("cv2")
+pytest.importorskip("pypylon")
+
+from core import take_photo as tp
+
+
+class Node:
+    def __init__(self, value, minimum=0, maximum=None, inc=1):
+        self.value, self.minimum, self.maximum, self.inc = value, minimum, maximum, inc
+
+    def GetValue(self):
+        return self.value
+
+    def SetValue(self, value):
+        assert self.minimum <= value <= self.GetMax()
+        self.value = value
+
+    def GetMin(self):
+        return self.minimum
+
+    def GetMax(self):
+        return self.maximum() if callable(self.maximum) else self.maximum
+
+    def GetInc(self):
+        return self.inc
+
+
+class PixelFormatNode(Node):
+    def __init__(self, symbolics):
+        super().__init__(None)
+        self.symbolics = symbolics
+        self.queries = 0
+
+    def GetSymbolics(self):
+        self.queries += 1
+        return self.symbolics
+
+    def SetValue(self, value):
+        self.value = value
+
+
+class FakeCamera:
+    def __init__(self, sensor=(2040, 1086), binning=4, formats=("BayerRG8", "RGB8")):
+        w, h = sensor
+        self.BinningHorizontal = Node(1, 1, binning)
+        self.BinningVertical = Node(1, 1, binning)
+        self.Width = Node(w, 16, lambda: w // self.BinningHorizontal.value, 4)
+        self.Height = Node(h, 16, lambda: h // self.BinningVertical.value, 2)
+        self.OffsetX = Node(0, 0, lambda: w // self.BinningHorizontal.value - self.Width.value, 1)
+        self.OffsetY = Node(0, 0, lambda: h // self.BinningVertical.value - self.Height.value, 1)
+        self.PixelFormat = PixelFormatNode(formats)
+
+
+def test_roi_is_snapped_to_camera_limits():
+    cam = FakeCamera()
+    x, y, w, h, factor = tp.apply_roi(cam, roi=(101, 33, 503, 2000), binning=2, bayer=True)
+
+    assert factor == 2
+    # Width on the 4 px increment, height clipped to the binned sensor, even offsets for Bayer
+    assert (w, h) == (500, 542)
+    assert (x, y) == (100, 0)
+    assert cam.Width.value == 500 and cam.OffsetX.value == 100
+
+
+def test_full_sensor_after_roi():
+    cam = FakeCamera()
+    tp.apply_roi(cam, roi=(500, 300, 200, 100))
+    assert tp.apply_roi(cam) == (0, 0, 2040, 1086, 1)
+
+
+def test_pixel_format_is_negotiated_once_per_camera():
+    cam = FakeCamera()
+    assert tp.negotiate_pixel_format(cam, "test-1") == "RGB8"
+    assert tp.negotiate_pixel_format(cam, "test-1", prefer_bayer=True) == "BayerRG8"
+    assert tp.negotiate_pixel_format(cam, "test-1") == "RGB8"
+    assert cam.PixelFormat.queries == 1
+
+    with pytest.raises(RuntimeError):
+        tp.negotiate_pixel_format(FakeCamera(formats=("Mono8",)), "test-2")
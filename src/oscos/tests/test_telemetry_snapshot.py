@@ -0,0 +1,38 @@
+import numpy as np
+
+from core.data_buffer import BufferRegistry
+from core.telemetry_snapshot import SnapshotRequest
+
+
+class FakeClock:
+    def __init__(self):
+        self.t = 100.0
+
+    def __call__(self):
+        return self.t
+
+
+def test_snapshot_includes_samples_that_arrive_after_the_trigger():
+    registry = BufferRegistry()
+    host = FakeClock()
+    registry.clock.host_clock = host
+
+    # Session time 0 at host 100 s; telemetry before the trigger
+    assert registry.clock.now() == 0.0
+    for t in (0.0, 1.0, 2.0):
+        registry.speed.add(t, timestamp=t)
+
+    host.t = 102.0
+    request = SnapshotRequest(registry, exposure_s=0.5, margin_s=1.0)
+    assert request.t_trigger == 2.0
+
+    # Samples of the exposure (and one after it) only reach the buffer later
+    host.t = 103.0
+    for t in (2.2, 2.4, 2.5, 2.8):
+        registry.speed.add(t, timestamp=t)
+
+    snapshot = request.capture()
+    np.testing.assert_allclose(snapshot["speed_t"], [1.0, 2.0, 2.2, 2.4, 2.5])
+    np.testing.assert_allclose(snapshot["speed_v"], [1.0, 2.0, 2.2, 2.4, 2.5])
+    assert snapshot["t_trigger"] == 2.0
+    assert snapshot["window_s"] == 1.5
@@ -0,0 +1,49 @@
+import time
+
+from core.thumbnail_cache import ThumbnailCache, THUMBNAIL_DB_NAME
+
+
+def make_photos(tmp_path, *names):
+    paths = []
+    for name in names:
+        path = tmp_path / name
+        path.write_bytes(name.encode())
+        paths.append(str(path))
+    return paths
+
+
+def test_stale_entries_are_not_returned(tmp_path):
+    a, = make_photos(tmp_path, "a.png")
+    cache = ThumbnailCache(str(tmp_path / THUMBNAIL_DB_NAME))
+    cache.put(a, b"thumb")
+    cache.close()
+
+    # Entries survive reopening
+    cache = ThumbnailCache(str(tmp_path / THUMBNAIL_DB_NAME))
+    assert cache.get(a) == b"thumb"
+
+    with open(a, "ab") as f:
+        f.write(b"changed")
+    assert cache.get(a) is None
+    assert cache.get(str(tmp_path / "missing.png")) is None
+    cache.close()
+
+
+def test_least_recently_used_are_evicted(tmp_path):
+    a, b, c = make_photos(tmp_path, "a.png", "b.png", "c.png")
+    cache = ThumbnailCache(str(tmp_path / THUMBNAIL_DB_NAME), max_entries=2)
+    cache.put(a, b"A")
+    cache.put(b, b"B")
+    cache.flush()
+
+    time.sleep(0.01)
+    assert cache.get(a) == b"A"
+    cache.put(c, b"C")
+    cache.flush()
+
+    assert cache.get(b) is None
+    assert cache.get(a) == b"A" and cache.get(c) == b"C"
+
+    cache.discard(a)
+    assert cache.get(a) is None
+    cache.close()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""Query, import and export the photo catalog of a photo root.
+
+Run from src/oscos:
+
+    python -m tools.catalog query  <root> [--set S] [--amp 13] [--rpm-min 20 --rpm-max 30]
+    python -m tools.catalog import <root> <set folder> [<set folder> ...]
+    python -m tools.catalog export <root> <set folder> [-o out.csv]
+"""
+
+import argparse
+import csv
+import os
+import sys
+
+from core.catalog import PhotoCatalog, METADATA_CSV_NAME
+
+
+def cmd_query(catalog, args):
+    rows = catalog.query(
+        folder=os.path.join(catalog.root, args.set) if args.set else None,
+        amp=args.amp,
+        rpm_min=args.rpm_min,
+        rpm_max=args.rpm_max,
+        since=args.since,
+        until=args.until,
+        rpm_column=args.rpm_column,
+    )
+    if not rows:
+        return 0
+
+    writer = csv.DictWriter(sys.stdout, fieldnames=list(rows[0].keys()))
+    writer.writeheader()
+    writer.writerows(rows)
+    return 0
+
+
+def cmd_import(catalog, args):
+    for folder in args.folders:
+        csv_path = os.path.join(folder, METADATA_CSV_NAME)
+        if not os.path.isfile(csv_path):
+            print(f"[WARN] No {METADATA_CSV_NAME} in {folder}", file=sys.stderr)
+            continue
+        n = catalog.import_csv(folder, csv_path)
+        print(f"{folder}: imported {n} rows", file=sys.stderr)
+    return 0
+
+
+def cmd_export(catalog, args):
+    n = catalog.export_csv(args.folder, args.output)
+    out = args.output or os.path.join(args.folder, METADATA_CSV_NAME)
+    print(f"Exported {n} rows to {out}", file=sys.stderr)
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    q = sub.add_parser("query", help="Print matching photos as CSV")
+    q.add_argument("root", help="Photo root directory")
+    q.add_argument("--set", help="Set folder relative to the root")
+    q.add_argument("--amp", type=float)
+    q.add_argument("--rpm-min", type=float)
+    q.add_argument("--rpm-max", type=float)
+    q.add_argument("--rpm-column", choices=("rpm_measured", "rpm_cmd"), default="rpm_measured")
+    q.add_argument("--since", help='"YYYY-MM-DD HH:MM:SS"')
+    q.add_argument("--until", help='"YYYY-MM-DD HH:MM:SS"')
+    q.set_defaults(func=cmd_query)
+
+    i = sub.add_parser("import", help="Import metadata.csv files of sets")
+    i.add_argument("root", help="Photo root directory")
+    i.add_argument("folders", nargs="+", help="Set folders")
+    i.set_defaults(func=cmd_import)
+
+    e = sub.add_parser("export", help="Export a set's metadata as CSV")
+    e.add_argument("root", help="Photo root directory")
+    e.add_argument("folder", help="Set folder")
+    e.add_argument("-o", "--output", help=f"Output CSV (default: <set>/{METADATA_CSV_NAME})")
+    e.set_defaults(func=cmd_export)
+
+    args = parser.parse_args(argv)
+
+    catalog = PhotoCatalog(args.root)
+    try:
+        return args.func(catalog, args)
+    finally:
+        catalog.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""Encode raw (.npy) and uncompressed TIFF captures of a photo set to PNG.
+
+Run from src/oscos:
+
+    python -m tools.convert_raw <set folder> [<set folder> ...] [-j 4] [-l 6]
+"""
+
+import argparse
+import os
+import sys
+
+from core.image_io import DEFAULT_PNG_COMPRESSION, convert_folder
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("folders", nargs="+", help="Photo set folders to convert")
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="Worker processes (default: number of CPUs)")
+    parser.add_argument("-l", "--level", type=int, default=DEFAULT_PNG_COMPRESSION,
+                        help="PNG compression level 0-9")
+    parser.add_argument("--keep-source", action="store_true",
+                        help="Keep the raw files after converting them")
+    args = parser.parse_args(argv)
+
+    failed = 0
+    for folder in args.folders:
+        if not os.path.isdir(folder):
+            print(f"[WARN] Not a folder: {folder}")
+            continue
+
+        results = convert_folder(
+            folder,
+            png_compression=args.level,
+            workers=args.jobs,
+            remove_source=not args.keep_source,
+        )
+        for src, dst, err in results:
+            if err:
+                failed += 1
+                print(f"[ERROR] {src}: {err}")
+            else:
+                print(f"{src} -> {dst}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
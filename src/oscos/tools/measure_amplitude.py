@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""Measure the oscillation amplitude on the captures of a photo set.
+
+Run from src/oscos:
+
+    python -m tools.measure_amplitude <set folder> [--roi x,y,w,h | --select-roi]
+        [--axis x] [--object-width 40] [--mm-per-px 0.05] [-j 4] [--dry-run]
+"""
+
+import argparse
+import os
+import sys
+
+import cv2
+
+from core.amplitude import MEASURABLE_EXTS, measure_folder
+
+
+def parse_roi(text):
+    try:
+        x, y, w, h = (int(v) for v in text.split(","))
+    except ValueError:
+        raise argparse.ArgumentTypeError("ROI must be x,y,w,h")
+    return x, y, w, h
+
+
+def select_roi(folder):
+    """Let the user drag the ROI on the first capture of the set."""
+    from core.image_io import RAW_EXTS, load_raw, develop_raw, to_uint8
+
+    for entry in sorted(os.listdir(folder)):
+        path = os.path.join(folder, entry)
+        ext = os.path.splitext(entry)[1].lower()
+        if ext not in MEASURABLE_EXTS:
+            continue
+        if ext in RAW_EXTS:
+            img = develop_raw(to_uint8(load_raw(path, mmap=False)))
+        else:
+            img = cv2.imread(path)
+        if img is None:
+            continue
+
+        try:
+            roi = cv2.selectROI("Select ROI (Enter to confirm)", img, showCrosshair=False)
+            cv2.destroyAllWindows()
+        except cv2.error:
+            # opencv-python-headless has no highgui windows
+            print("[ERROR] --select-roi needs an OpenCV build with GUI support; use --roi x,y,w,h")
+            return None
+        return tuple(int(v) for v in roi) if roi[2] and roi[3] else None
+
+    return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("folder", help="Photo set folder")
+    roi_group = parser.add_mutually_exclusive_group()
+    roi_group.add_argument("--roi", type=parse_roi, default=None,
+                           help="Region containing the oscillating part, x,y,w,h in pixels")
+    roi_group.add_argument("--select-roi", action="store_true",
+                           help="Draw the region on the first capture")
+    parser.add_argument("--axis", choices=("x", "y"), default="x",
+                        help="Direction of the oscillation in the image")
+    parser.add_argument("--polarity", choices=("auto", "bright", "dark"), default="auto",
+                        help="Whether the part is brighter or darker than the background")
+    parser.add_argument("--level", type=float, default=0.5,
+                        help="Edge threshold as a fraction of the peak contrast")
+    parser.add_argument("--object-width", type=float, default=0.0,
+                        help="Width of the part along the axis (pixels), removed from the blur trail")
+    parser.add_argument("--mm-per-px", type=float, default=None,
+                        help="Image scale, to also store the amplitude in mm")
+    parser.add_argument("--root", default=None,
+                        help="Photo root holding the catalog (default: search the parents)")
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="Worker processes (default: number of CPUs)")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Print the measurements without storing them")
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.folder):
+        print(f"[ERROR] Not a folder: {args.folder}")
+        return 1
+
+    roi = args.roi
+    if args.select_roi:
+        roi = select_roi(args.folder)
+        if roi is None:
+            print("[ERROR] No ROI selected")
+            return 1
+        print(f"ROI: {','.join(str(v) for v in roi)}")
+
+    results = measure_folder(
+        args.folder,
+        roi=roi,
+        axis=args.axis,
+        object_width_px=args.object_width,
+        mm_per_px=args.mm_per_px,
+        polarity=args.polarity,
+        level=args.level,
+        workers=args.jobs,
+        write=not args.dry_run,
+        catalog_root=args.root,
+    )
+
+    failed = 0
+    for filename, frame, err in results:
+        if err:
+            failed += 1
+            print(f"[ERROR] {filename}: {err}")
+            continue
+        line = f"{filename}: extent={frame['extent_px']:.1f}px amp={frame['amp_measured_px']:.2f}px"
+        if "amp_measured_mm" in frame:
+            line += f" ({frame['amp_measured_mm']:.3f} mm)"
+        print(line)
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
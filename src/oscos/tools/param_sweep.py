@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""Tune the sign-correction and peak-detection parameters on a recorded session.
+
+Run from src/oscos:
+
+    python -m tools.param_sweep <session folder> [--t-start 10] [--t-end 70] [-j 4]
+        [--slope-eps 0,0.01,0.02] [--confirm-samples 1:5:1] [--min-flip-dt 0.1:0.3:0.1]
+        [--smoothing-alpha 0,0.2,0.4] [--peak-window 0.2:0.8:0.1] [--peak-threshold 0.1:0.5:0.1]
+        [--only sign|peak] [--top 5] [--csv results.csv]
+
+Grids are comma-separated values or start:stop:step (stop included).
+"""
+
+import argparse
+import csv
+import os
+import sys
+
+import numpy as np
+
+from core.param_sweep import SIGN_GRID, PEAK_GRID, sweep
+from core.session_store import SessionReader
+from core.sign_eval import load_reference
+
+
+def parse_grid(text):
+    try:
+        if ":" in text:
+            start, stop, step = (float(v) for v in text.split(":"))
+            if step <= 0:
+                raise ValueError
+            values = np.arange(start, stop + step / 2, step)
+        else:
+            values = [float(v) for v in text.split(",")]
+    except ValueError:
+        raise argparse.ArgumentTypeError("Grid must be v1,v2,... or start:stop:step")
+    return tuple(round(float(v), 10) for v in values)
+
+
+def format_params(params):
+    return " ".join(f"{name}={value:g}" for name, value in params.items())
+
+
+def print_results(title, results, top, columns):
+    print(f"\n{title}")
+    for rank, (params, score) in enumerate(results[:top], 1):
+        stats = " ".join(fmt.format(score[key]) for key, fmt in columns)
+        print(f"  {rank:>2}. {format_params(params)}  |  {stats}")
+
+
+def write_csv(path, sign_results, peak_results):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["processor", "params", "errors", "missed", "spurious", "median_lag", "wrong_sign"])
+        for kind, results in (("sign", sign_results), ("peak", peak_results)):
+            for params, score in results:
+                writer.writerow([
+                    kind, format_params(params), score["errors"], score["missed"], score["spurious"],
+                    score["median_lag"], score.get("wrong_sign", ""),
+                ])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("session", help="Session folder written by Record session")
+    parser.add_argument("--t-start", type=float, default=None, help="First second to use (session time)")
+    parser.add_argument("--t-end", type=float, default=None, help="Last second to use (session time)")
+    parser.add_argument("--slope-eps", type=parse_grid, default=SIGN_GRID["SLOPE_EPS"])
+    parser.add_argument("--confirm-samples", type=parse_grid, default=SIGN_GRID["CONFIRM_SAMPLES"])
+    parser.add_argument("--min-flip-dt", type=parse_grid, default=SIGN_GRID["MIN_FLIP_DT"])
+    parser.add_argument("--smoothing-alpha", type=parse_grid, default=SIGN_GRID["smoothing_alpha"])
+    parser.add_argument("--peak-window", type=parse_grid, default=PEAK_GRID["window_seconds"])
+    parser.add_argument("--peak-threshold", type=parse_grid, default=PEAK_GRID["threshold"])
+    parser.add_argument("--only", choices=("sign", "peak"), default=None,
+                        help="Sweep only one of the processors")
+    parser.add_argument("--tolerance", type=float, default=0.1,
+                        help="Largest distance to a reference reversal or peak counted as a match (s)")
+    parser.add_argument("--min-spacing", type=float, default=None,
+                        help="Shortest time between reference reversals (s)")
+    parser.add_argument("--min-peak", type=float, default=None,
+                        help="Smallest half-cycle peak counted as a reference peak (m/s)")
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="Worker processes (default: number of CPUs)")
+    parser.add_argument("--top", type=int, default=5, help="Results listed per processor")
+    parser.add_argument("--csv", default=None, help="Also write every result to this CSV file")
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.session):
+        print(f"[ERROR] Not a folder: {args.session}")
+        return 1
+
+    ref = load_reference(SessionReader(args.session), args.t_start, args.t_end, args.min_spacing)
+    if len(ref["t"]) < 3:
+        print("[ERROR] The session has no speed samples in that range")
+        return 1
+
+    sign_grid = {
+        "SLOPE_EPS": args.slope_eps,
+        "CONFIRM_SAMPLES": tuple(int(v) for v in args.confirm_samples),
+        "MIN_FLIP_DT": args.min_flip_dt,
+        "smoothing_alpha": args.smoothing_alpha,
+    }
+    peak_grid = {
+        "window_seconds": args.peak_window,
+        "threshold": args.peak_threshold,
+    }
+    if args.only == "peak":
+        sign_grid = None
+    elif args.only == "sign":
+        peak_grid = None
+
+    print(f"{len(ref['t'])} speed samples, {len(ref['reversals'])} reference reversals ({ref['source']})")
+    sign_results, peak_results = sweep(ref, sign_grid, peak_grid, args.tolerance, args.min_peak, args.jobs)
+
+    if sign_results:
+        print_results("Sign correction (SpeedCorrectedProcessor)", sign_results, args.top, (
+            ("errors", "errors={}"), ("missed", "missed={}"), ("spurious", "spurious={}"),
+            ("median_lag", "lag={:.3f}s"), ("wrong_sign", "wrong sign={:.2%}"),
+        ))
+    if peak_results:
+        print_results(f"Peak detection ({peak_results[0][1]['reference']} reference peaks)", peak_results, args.top, (
+            ("errors", "errors={}"), ("missed", "missed={}"), ("spurious", "spurious={}"),
+            ("median_lag", "timing={:.3f}s"),
+        ))
+        best = peak_results[0][0]
+        print(f"\nBest peak settings: window {best['window_seconds']:g} s, threshold {best['threshold']:g} "
+              f"(Peak Detection parameters, then Change)")
+
+    if args.csv:
+        write_csv(args.csv, sign_results, peak_results)
+        print(f"\nWrote {len(sign_results) + len(peak_results)} results to {args.csv}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
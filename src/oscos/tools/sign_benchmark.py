@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""Compare the speed sign-correction methods on a recorded session.
+
+Run from src/oscos:
+
+    python -m tools.sign_benchmark <session folder> [--t-start 10] [--t-end 70]
+        [--tolerance 0.1] [--min-spacing 0.1]
+
+The reference reversals come from the recorded edge directions when the
+telemetry had the second encoder channel; otherwise they are the minima of
+the speed magnitude found offline with zero-phase smoothing.
+"""
+
+import argparse
+import os
+import sys
+
+from core.processors import SpeedCorrectedProcessor, ModelSignCorrector
+from core.session_store import SessionReader
+from core.sign_eval import load_reference, run_sign_processor, flip_times, reference_signs, score_flips, sign_error
+
+
+METHODS = {
+    "slope": SpeedCorrectedProcessor,
+    "model": ModelSignCorrector,
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("session", help="Session folder written by Record session")
+    parser.add_argument("--t-start", type=float, default=None, help="First second to use (session time)")
+    parser.add_argument("--t-end", type=float, default=None, help="Last second to use (session time)")
+    parser.add_argument("--tolerance", type=float, default=0.1,
+                        help="Largest flip/reversal distance counted as a match (s)")
+    parser.add_argument("--min-spacing", type=float, default=None,
+                        help="Shortest time between reference reversals (s, default: a quarter period "
+                             "from the recorded dominant frequency, else 0.1)")
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.session):
+        print(f"[ERROR] Not a folder: {args.session}")
+        return 1
+
+    ref = load_reference(SessionReader(args.session), args.t_start, args.t_end, args.min_spacing)
+    t, v, seeds, directions, reversals = ref["t"], ref["v"], ref["seeds"], ref["directions"], ref["reversals"]
+    if len(t) < 3:
+        print("[ERROR] The session has no speed samples in that range")
+        return 1
+    print(f"{len(t)} speed samples, {len(reversals)} reference reversals ({ref['source']})")
+
+    for name, make in METHODS.items():
+        # Directions are the reference here, so the model runs on its sine fit alone
+        ts, vs, elapsed = run_sign_processor(make, t, v, seeds=seeds)
+        score = score_flips(flip_times(ts, vs), reversals, args.tolerance)
+        error = sign_error(vs, reference_signs(ts, reversals, directions))
+        print(
+            f"{name:>6}: flips={score['flips']} matched={score['matched']} missed={score['missed']} "
+            f"spurious={score['spurious']} lag={score['median_lag'] * 1e3:.1f}ms "
+            f"wrong sign={error:.2%} cost={elapsed / len(t) * 1e6:.1f}us/sample"
+        )
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
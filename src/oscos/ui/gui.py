@@ -362,13 +362,13 @@ class Ui_MainWindow(object):
         self.scrollArea_2.setWidgetResizable(True)
         self.scrollArea_2.setObjectName("scrollArea_2")
         self.scrollAreaWidgetContents = QtWidgets.QWidget()
-        self.scrollAreaWidgetContents.setGeometry(QtCore.QRect(0, 0, 319, 1130))
+        self.scrollAreaWidgetContents.setGeometry(QtCore.QRect(0, 0, 319, 1515))
         self.scrollAreaWidgetContents.setObjectName("scrollAreaWidgetContents")
         self.verticalLayout_9 = QtWidgets.QVBoxLayout(self.scrollAreaWidgetContents)
         self.verticalLayout_9.setObjectName("verticalLayout_9")
         self.ControlParametersGB = QtWidgets.QGroupBox(self.scrollAreaWidgetContents)
-        self.ControlParametersGB.setMinimumSize(QtCore.QSize(300, 500))
-        self.ControlParametersGB.setMaximumSize(QtCore.QSize(300, 500))
+        self.ControlParametersGB.setMinimumSize(QtCore.QSize(300, 660))
+        self.ControlParametersGB.setMaximumSize(QtCore.QSize(300, 660))
         self.ControlParametersGB.setStyleSheet("QGroupBox{\n"
 "    font-weight: bold;\n"
 "}")
@@ -571,6 +571,103 @@ class Ui_MainWindow(object):
         self.PeakCheckBox.setText("")
         self.PeakCheckBox.setObjectName("PeakCheckBox")
         self.gridLayout.addWidget(self.PeakCheckBox, 2, 0, 1, 1)
+        self.SpectrumCheckBox = QtWidgets.QCheckBox(self.ControlParametersGB)
+        self.SpectrumCheckBox.setMinimumSize(QtCore.QSize(20, 0))
+        self.SpectrumCheckBox.setMaximumSize(QtCore.QSize(20, 16777215))
+        self.SpectrumCheckBox.setCursor(QtGui.QCursor(QtCore.Qt.PointingHandCursor))
+        self.SpectrumCheckBox.setText("")
+        self.SpectrumCheckBox.setObjectName("SpectrumCheckBox")
+        self.gridLayout.addWidget(self.SpectrumCheckBox, 4, 0, 1, 1)
+        self.label_39 = QtWidgets.QLabel(self.ControlParametersGB)
+        self.label_39.setMinimumSize(QtCore.QSize(90, 20))
+        self.label_39.setMaximumSize(QtCore.QSize(90, 20))
+        self.label_39.setAlignment(QtCore.Qt.AlignCenter)
+        self.label_39.setObjectName("label_39")
+        self.gridLayout.addWidget(self.label_39, 4, 1, 1, 1)
+        self.lcdFrequency = QtWidgets.QLCDNumber(self.ControlParametersGB)
+        self.lcdFrequency.setMinimumSize(QtCore.QSize(100, 30))
+        self.lcdFrequency.setMaximumSize(QtCore.QSize(100, 30))
+        self.lcdFrequency.setAutoFillBackground(True)
+        self.lcdFrequency.setStyleSheet("QLCDNumber{\n"
+"    color: red;\n"
+"}")
+        self.lcdFrequency.setProperty("value", 0.0)
+        self.lcdFrequency.setObjectName("lcdFrequency")
+        self.gridLayout.addWidget(self.lcdFrequency, 4, 2, 1, 1)
+        self.label_40 = QtWidgets.QLabel(self.ControlParametersGB)
+        self.label_40.setObjectName("label_40")
+        self.gridLayout.addWidget(self.label_40, 4, 3, 1, 1)
+        self.TrackerCheckBox = QtWidgets.QCheckBox(self.ControlParametersGB)
+        self.TrackerCheckBox.setMinimumSize(QtCore.QSize(20, 0))
+        self.TrackerCheckBox.setMaximumSize(QtCore.QSize(20, 16777215))
+        self.TrackerCheckBox.setCursor(QtGui.QCursor(QtCore.Qt.PointingHandCursor))
+        self.TrackerCheckBox.setText("")
+        self.TrackerCheckBox.setObjectName("TrackerCheckBox")
+        self.gridLayout.addWidget(self.TrackerCheckBox, 5, 0, 1, 1)
+        self.label_41 = QtWidgets.QLabel(self.ControlParametersGB)
+        self.label_41.setMinimumSize(QtCore.QSize(90, 20))
+        self.label_41.setMaximumSize(QtCore.QSize(90, 20))
+        self.label_41.setAlignment(QtCore.Qt.AlignCenter)
+        self.label_41.setObjectName("label_41")
+        self.gridLayout.addWidget(self.label_41, 5, 1, 1, 1)
+        self.lcdTrackerFrequency = QtWidgets.QLCDNumber(self.ControlParametersGB)
+        self.lcdTrackerFrequency.setMinimumSize(QtCore.QSize(100, 30))
+        self.lcdTrackerFrequency.setMaximumSize(QtCore.QSize(100, 30))
+        self.lcdTrackerFrequency.setAutoFillBackground(True)
+        self.lcdTrackerFrequency.setStyleSheet("QLCDNumber{\n"
+"    color: red;\n"
+"}")
+        self.lcdTrackerFrequency.setProperty("value", 0.0)
+        self.lcdTrackerFrequency.setObjectName("lcdTrackerFrequency")
+        self.gridLayout.addWidget(self.lcdTrackerFrequency, 5, 2, 1, 1)
+        self.label_42 = QtWidgets.QLabel(self.ControlParametersGB)
+        self.label_42.setObjectName("label_42")
+        self.gridLayout.addWidget(self.label_42, 5, 3, 1, 1)
+        self.label_43 = QtWidgets.QLabel(self.ControlParametersGB)
+        self.label_43.setMinimumSize(QtCore.QSize(90, 20))
+        self.label_43.setMaximumSize(QtCore.QSize(90, 20))
+        self.label_43.setAlignment(QtCore.Qt.AlignCenter)
+        self.label_43.setObjectName("label_43")
+        self.gridLayout.addWidget(self.label_43, 6, 1, 1, 1)
+        self.lcdDamping = QtWidgets.QLCDNumber(self.ControlParametersGB)
+        self.lcdDamping.setMinimumSize(QtCore.QSize(100, 30))
+        self.lcdDamping.setMaximumSize(QtCore.QSize(100, 30))
+        self.lcdDamping.setAutoFillBackground(True)
+        self.lcdDamping.setStyleSheet("QLCDNumber{\n"
+"    color: red;\n"
+"}")
+        self.lcdDamping.setProperty("value", 0.0)
+        self.lcdDamping.setObjectName("lcdDamping")
+        self.gridLayout.addWidget(self.lcdDamping, 6, 2, 1, 1)
+        self.label_44 = QtWidgets.QLabel(self.ControlParametersGB)
+        self.label_44.setObjectName("label_44")
+        self.gridLayout.addWidget(self.label_44, 6, 3, 1, 1)
+        self.KalmanCheckBox = QtWidgets.QCheckBox(self.ControlParametersGB)
+        self.KalmanCheckBox.setMinimumSize(QtCore.QSize(20, 0))
+        self.KalmanCheckBox.setMaximumSize(QtCore.QSize(20, 16777215))
+        self.KalmanCheckBox.setCursor(QtGui.QCursor(QtCore.Qt.PointingHandCursor))
+        self.KalmanCheckBox.setText("")
+        self.KalmanCheckBox.setObjectName("KalmanCheckBox")
+        self.gridLayout.addWidget(self.KalmanCheckBox, 7, 0, 1, 1)
+        self.label_47 = QtWidgets.QLabel(self.ControlParametersGB)
+        self.label_47.setMinimumSize(QtCore.QSize(90, 20))
+        self.label_47.setMaximumSize(QtCore.QSize(90, 20))
+        self.label_47.setAlignment(QtCore.Qt.AlignCenter)
+        self.label_47.setObjectName("label_47")
+        self.gridLayout.addWidget(self.label_47, 7, 1, 1, 1)
+        self.lcdKalmanSpeed = QtWidgets.QLCDNumber(self.ControlParametersGB)
+        self.lcdKalmanSpeed.setMinimumSize(QtCore.QSize(100, 30))
+        self.lcdKalmanSpeed.setMaximumSize(QtCore.QSize(100, 30))
+        self.lcdKalmanSpeed.setAutoFillBackground(True)
+        self.lcdKalmanSpeed.setStyleSheet("QLCDNumber{\n"
+"    color: red;\n"
+"}")
+        self.lcdKalmanSpeed.setProperty("value", 0.0)
+        self.lcdKalmanSpeed.setObjectName("lcdKalmanSpeed")
+        self.gridLayout.addWidget(self.lcdKalmanSpeed, 7, 2, 1, 1)
+        self.label_48 = QtWidgets.QLabel(self.ControlParametersGB)
+        self.label_48.setObjectName("label_48")
+        self.gridLayout.addWidget(self.label_48, 7, 3, 1, 1)
         self.verticalLayout_6.addLayout(self.gridLayout)
         self.line_4 = QtWidgets.QFrame(self.ControlParametersGB)
         self.line_4.setFrameShape(QtWidgets.QFrame.HLine)
@@ -629,8 +726,8 @@ class Ui_MainWindow(object):
         self.verticalLayout_6.addLayout(self.horizontalLayout_21)
         self.verticalLayout_9.addWidget(self.ControlParametersGB)
         self.GraphParametersGB = QtWidgets.QGroupBox(self.scrollAreaWidgetContents)
-        self.GraphParametersGB.setMinimumSize(QtCore.QSize(300, 230))
-        self.GraphParametersGB.setMaximumSize(QtCore.QSize(300, 230))
+        self.GraphParametersGB.setMinimumSize(QtCore.QSize(300, 350))
+        self.GraphParametersGB.setMaximumSize(QtCore.QSize(300, 350))
         self.GraphParametersGB.setStyleSheet("QGroupBox{\n"
 "    font-weight: bold;\n"
 "}")
@@ -684,6 +781,36 @@ class Ui_MainWindow(object):
         self.AutoScrollGraphCheckBox.setCursor(QtGui.QCursor(QtCore.Qt.PointingHandCursor))
         self.AutoScrollGraphCheckBox.setObjectName("AutoScrollGraphCheckBox")
         self.verticalLayout_8.addWidget(self.AutoScrollGraphCheckBox)
+        self.horizontalLayout_32 = QtWidgets.QHBoxLayout()
+        self.horizontalLayout_32.setObjectName("horizontalLayout_32")
+        self.label_45 = QtWidgets.QLabel(self.GraphParametersGB)
+        self.label_45.setObjectName("label_45")
+        self.horizontalLayout_32.addWidget(self.label_45)
+        self.AccelFilterComboBox = QtWidgets.QComboBox(self.GraphParametersGB)
+        self.AccelFilterComboBox.setCursor(QtGui.QCursor(QtCore.Qt.PointingHandCursor))
+        self.AccelFilterComboBox.setObjectName("AccelFilterComboBox")
+        self.horizontalLayout_32.addWidget(self.AccelFilterComboBox)
+        self.verticalLayout_8.addLayout(self.horizontalLayout_32)
+        self.horizontalLayout_33 = QtWidgets.QHBoxLayout()
+        self.horizontalLayout_33.setObjectName("horizontalLayout_33")
+        self.label_46 = QtWidgets.QLabel(self.GraphParametersGB)
+        self.label_46.setObjectName("label_46")
+        self.horizontalLayout_33.addWidget(self.label_46)
+        self.LcdModeComboBox = QtWidgets.QComboBox(self.GraphParametersGB)
+        self.LcdModeComboBox.setCursor(QtGui.QCursor(QtCore.Qt.PointingHandCursor))
+        self.LcdModeComboBox.setObjectName("LcdModeComboBox")
+        self.horizontalLayout_33.addWidget(self.LcdModeComboBox)
+        self.verticalLayout_8.addLayout(self.horizontalLayout_33)
+        self.horizontalLayout_34 = QtWidgets.QHBoxLayout()
+        self.horizontalLayout_34.setObjectName("horizontalLayout_34")
+        self.label_49 = QtWidgets.QLabel(self.GraphParametersGB)
+        self.label_49.setObjectName("label_49")
+        self.horizontalLayout_34.addWidget(self.label_49)
+        self.SignMethodComboBox = QtWidgets.QComboBox(self.GraphParametersGB)
+        self.SignMethodComboBox.setCursor(QtGui.QCursor(QtCore.Qt.PointingHandCursor))
+        self.SignMethodComboBox.setObjectName("SignMethodComboBox")
+        self.horizontalLayout_34.addWidget(self.SignMethodComboBox)
+        self.verticalLayout_8.addLayout(self.horizontalLayout_34)
         self.horizontalLayout_18 = QtWidgets.QHBoxLayout()
         self.horizontalLayout_18.setObjectName("horizontalLayout_18")
         self.ClearBuffersButton = QtWidgets.QPushButton(self.GraphParametersGB)
@@ -695,8 +822,8 @@ class Ui_MainWindow(object):
         self.verticalLayout_8.addLayout(self.horizontalLayout_18)
         self.verticalLayout_9.addWidget(self.GraphParametersGB)
         self.groupBox = QtWidgets.QGroupBox(self.scrollAreaWidgetContents)
-        self.groupBox.setMinimumSize(QtCore.QSize(300, 370))
-        self.groupBox.setMaximumSize(QtCore.QSize(300, 370))
+        self.groupBox.setMinimumSize(QtCore.QSize(300, 475))
+        self.groupBox.setMaximumSize(QtCore.QSize(300, 475))
         self.groupBox.setStyleSheet("QGroupBox{\n"
 "    font-weight: bold;\n"
 "}")
@@ -735,6 +862,26 @@ class Ui_MainWindow(object):
         self.ExportSpeedCheckBox.setCursor(QtGui.QCursor(QtCore.Qt.PointingHandCursor))
         self.ExportSpeedCheckBox.setObjectName("ExportSpeedCheckBox")
         self.gridLayout_2.addWidget(self.ExportSpeedCheckBox, 2, 1, 1, 1)
+        self.ExportDampingCheckBox = QtWidgets.QCheckBox(self.groupBox)
+        self.ExportDampingCheckBox.setCursor(QtGui.QCursor(QtCore.Qt.PointingHandCursor))
+        self.ExportDampingCheckBox.setObjectName("ExportDampingCheckBox")
+        self.gridLayout_2.addWidget(self.ExportDampingCheckBox, 4, 1, 1, 1)
+        self.ExportTrackerCheckBox = QtWidgets.QCheckBox(self.groupBox)
+        self.ExportTrackerCheckBox.setCursor(QtGui.QCursor(QtCore.Qt.PointingHandCursor))
+        self.ExportTrackerCheckBox.setObjectName("ExportTrackerCheckBox")
+        self.gridLayout_2.addWidget(self.ExportTrackerCheckBox, 5, 0, 1, 1)
+        self.ExportKalmanCheckBox = QtWidgets.QCheckBox(self.groupBox)
+        self.ExportKalmanCheckBox.setCursor(QtGui.QCursor(QtCore.Qt.PointingHandCursor))
+        self.ExportKalmanCheckBox.setObjectName("ExportKalmanCheckBox")
+        self.gridLayout_2.addWidget(self.ExportKalmanCheckBox, 5, 1, 1, 1)
+        self.ExportGlitchesCheckBox = QtWidgets.QCheckBox(self.groupBox)
+        self.ExportGlitchesCheckBox.setCursor(QtGui.QCursor(QtCore.Qt.PointingHandCursor))
+        self.ExportGlitchesCheckBox.setObjectName("ExportGlitchesCheckBox")
+        self.gridLayout_2.addWidget(self.ExportGlitchesCheckBox, 6, 0, 1, 1)
+        self.ExportZeroPhaseCheckBox = QtWidgets.QCheckBox(self.groupBox)
+        self.ExportZeroPhaseCheckBox.setCursor(QtGui.QCursor(QtCore.Qt.PointingHandCursor))
+        self.ExportZeroPhaseCheckBox.setObjectName("ExportZeroPhaseCheckBox")
+        self.gridLayout_2.addWidget(self.ExportZeroPhaseCheckBox, 7, 0, 1, 2)
         self.verticalLayout_3.addLayout(self.gridLayout_2)
         self.verticalLayout_10 = QtWidgets.QVBoxLayout()
         self.verticalLayout_10.setObjectName("verticalLayout_10")
@@ -784,13 +931,43 @@ class Ui_MainWindow(object):
         spacerItem12 = QtWidgets.QSpacerItem(20, 40, QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Expanding)
         self.verticalLayout_11.addItem(spacerItem12)
         self.verticalLayout_3.addLayout(self.verticalLayout_11)
+        self.horizontalLayout_35 = QtWidgets.QHBoxLayout()
+        self.horizontalLayout_35.setObjectName("horizontalLayout_35")
+        self.label_50 = QtWidgets.QLabel(self.groupBox)
+        self.label_50.setObjectName("label_50")
+        self.horizontalLayout_35.addWidget(self.label_50)
+        self.AlignComboBox = QtWidgets.QComboBox(self.groupBox)
+        self.AlignComboBox.setCursor(QtGui.QCursor(QtCore.Qt.PointingHandCursor))
+        self.AlignComboBox.setObjectName("AlignComboBox")
+        self.horizontalLayout_35.addWidget(self.AlignComboBox)
+        self.AlignRateSpinBox = QtWidgets.QDoubleSpinBox(self.groupBox)
+        self.AlignRateSpinBox.setMinimumSize(QtCore.QSize(80, 0))
+        self.AlignRateSpinBox.setMaximumSize(QtCore.QSize(80, 16777215))
+        self.AlignRateSpinBox.setDecimals(0)
+        self.AlignRateSpinBox.setMinimum(1.0)
+        self.AlignRateSpinBox.setMaximum(10000.0)
+        self.AlignRateSpinBox.setProperty("value", 100.0)
+        self.AlignRateSpinBox.setObjectName("AlignRateSpinBox")
+        self.horizontalLayout_35.addWidget(self.AlignRateSpinBox)
+        self.verticalLayout_3.addLayout(self.horizontalLayout_35)
         self.horizontalLayout_15 = QtWidgets.QHBoxLayout()
         self.horizontalLayout_15.setObjectName("horizontalLayout_15")
+        self.ExportFormatComboBox = QtWidgets.QComboBox(self.groupBox)
+        self.ExportFormatComboBox.setObjectName("ExportFormatComboBox")
+        self.horizontalLayout_15.addWidget(self.ExportFormatComboBox)
+        self.ExportProgressBar = QtWidgets.QProgressBar(self.groupBox)
+        self.ExportProgressBar.setProperty("value", 0)
+        self.ExportProgressBar.setObjectName("ExportProgressBar")
+        self.horizontalLayout_15.addWidget(self.ExportProgressBar)
         self.ExportButton = QtWidgets.QPushButton(self.groupBox)
         self.ExportButton.setMinimumSize(QtCore.QSize(100, 0))
         self.ExportButton.setMaximumSize(QtCore.QSize(100, 16777215))
         self.ExportButton.setCursor(QtGui.QCursor(QtCore.Qt.PointingHandCursor))
         self.ExportButton.setObjectName("ExportButton")
+        self.RecordSessionCheckBox = QtWidgets.QCheckBox(self.groupBox)
+        self.RecordSessionCheckBox.setCursor(QtGui.QCursor(QtCore.Qt.PointingHandCursor))
+        self.RecordSessionCheckBox.setObjectName("RecordSessionCheckBox")
+        self.horizontalLayout_15.addWidget(self.RecordSessionCheckBox)
         self.horizontalLayout_15.addWidget(self.ExportButton)
         self.verticalLayout_3.addLayout(self.horizontalLayout_15)
         self.verticalLayout_9.addWidget(self.groupBox)
@@ -837,6 +1014,9 @@ class Ui_MainWindow(object):
         self.AddSetButton.setObjectName("AddSetButton")
         self.horizontalLayout_26.addWidget(self.AddSetButton)
         self.verticalLayout_13.addLayout(self.horizontalLayout_26)
+        self.ExportSetMetadataButton = QtWidgets.QPushButton(self.imageac_tab)
+        self.ExportSetMetadataButton.setObjectName("ExportSetMetadataButton")
+        self.verticalLayout_13.addWidget(self.ExportSetMetadataButton)
         self.DeleteSetButton = QtWidgets.QPushButton(self.imageac_tab)
         self.DeleteSetButton.setStyleSheet("QPushButton {\n"
 "    background-color: red;\n"
@@ -888,6 +1068,67 @@ class Ui_MainWindow(object):
         self.label_24 = QtWidgets.QLabel(self.imageac_tab)
         self.label_24.setObjectName("label_24")
         self.gridLayout_3.addWidget(self.label_24, 1, 0, 1, 1)
+        self.label_35 = QtWidgets.QLabel(self.imageac_tab)
+        self.label_35.setObjectName("label_35")
+        self.gridLayout_3.addWidget(self.label_35, 2, 0, 1, 1)
+        self.PhotoFormatComboBox = QtWidgets.QComboBox(self.imageac_tab)
+        self.PhotoFormatComboBox.setMinimumSize(QtCore.QSize(140, 0))
+        self.PhotoFormatComboBox.setObjectName("PhotoFormatComboBox")
+        self.gridLayout_3.addWidget(self.PhotoFormatComboBox, 2, 1, 1, 2)
+        self.label_36 = QtWidgets.QLabel(self.imageac_tab)
+        self.label_36.setObjectName("label_36")
+        self.gridLayout_3.addWidget(self.label_36, 3, 0, 1, 1)
+        self.PngCompressionSpinBox = QtWidgets.QSpinBox(self.imageac_tab)
+        self.PngCompressionSpinBox.setMinimumSize(QtCore.QSize(60, 0))
+        self.PngCompressionSpinBox.setMaximumSize(QtCore.QSize(60, 16777215))
+        self.PngCompressionSpinBox.setMaximum(9)
+        self.PngCompressionSpinBox.setProperty("value", 3)
+        self.PngCompressionSpinBox.setObjectName("PngCompressionSpinBox")
+        self.gridLayout_3.addWidget(self.PngCompressionSpinBox, 3, 1, 1, 1)
+        self.RoiCheckBox = QtWidgets.QCheckBox(self.imageac_tab)
+        self.RoiCheckBox.setObjectName("RoiCheckBox")
+        self.gridLayout_3.addWidget(self.RoiCheckBox, 4, 0, 1, 1)
+        self.RoiXSpinBox = QtWidgets.QSpinBox(self.imageac_tab)
+        self.RoiXSpinBox.setMinimumSize(QtCore.QSize(60, 0))
+        self.RoiXSpinBox.setMaximumSize(QtCore.QSize(60, 16777215))
+        self.RoiXSpinBox.setMaximum(8192)
+        self.RoiXSpinBox.setObjectName("RoiXSpinBox")
+        self.gridLayout_3.addWidget(self.RoiXSpinBox, 4, 1, 1, 1)
+        self.RoiYSpinBox = QtWidgets.QSpinBox(self.imageac_tab)
+        self.RoiYSpinBox.setMinimumSize(QtCore.QSize(60, 0))
+        self.RoiYSpinBox.setMaximumSize(QtCore.QSize(60, 16777215))
+        self.RoiYSpinBox.setMaximum(8192)
+        self.RoiYSpinBox.setObjectName("RoiYSpinBox")
+        self.gridLayout_3.addWidget(self.RoiYSpinBox, 4, 2, 1, 1)
+        self.label_37 = QtWidgets.QLabel(self.imageac_tab)
+        self.label_37.setObjectName("label_37")
+        self.gridLayout_3.addWidget(self.label_37, 5, 0, 1, 1)
+        self.RoiWidthSpinBox = QtWidgets.QSpinBox(self.imageac_tab)
+        self.RoiWidthSpinBox.setMinimumSize(QtCore.QSize(60, 0))
+        self.RoiWidthSpinBox.setMaximumSize(QtCore.QSize(60, 16777215))
+        self.RoiWidthSpinBox.setMinimum(16)
+        self.RoiWidthSpinBox.setMaximum(8192)
+        self.RoiWidthSpinBox.setProperty("value", 2040)
+        self.RoiWidthSpinBox.setObjectName("RoiWidthSpinBox")
+        self.gridLayout_3.addWidget(self.RoiWidthSpinBox, 5, 1, 1, 1)
+        self.RoiHeightSpinBox = QtWidgets.QSpinBox(self.imageac_tab)
+        self.RoiHeightSpinBox.setMinimumSize(QtCore.QSize(60, 0))
+        self.RoiHeightSpinBox.setMaximumSize(QtCore.QSize(60, 16777215))
+        self.RoiHeightSpinBox.setMinimum(16)
+        self.RoiHeightSpinBox.setMaximum(8192)
+        self.RoiHeightSpinBox.setProperty("value", 1086)
+        self.RoiHeightSpinBox.setObjectName("RoiHeightSpinBox")
+        self.gridLayout_3.addWidget(self.RoiHeightSpinBox, 5, 2, 1, 1)
+        self.label_38 = QtWidgets.QLabel(self.imageac_tab)
+        self.label_38.setObjectName("label_38")
+        self.gridLayout_3.addWidget(self.label_38, 6, 0, 1, 1)
+        self.BinningComboBox = QtWidgets.QComboBox(self.imageac_tab)
+        self.BinningComboBox.setMinimumSize(QtCore.QSize(60, 0))
+        self.BinningComboBox.setObjectName("BinningComboBox")
+        self.gridLayout_3.addWidget(self.BinningComboBox, 6, 1, 1, 1)
+        self.BayerTransferCheckBox = QtWidgets.QCheckBox(self.imageac_tab)
+        self.BayerTransferCheckBox.setObjectName("BayerTransferCheckBox")
+        self.gridLayout_3.addWidget(self.BayerTransferCheckBox, 7, 0, 1, 3)
         self.verticalLayout_13.addLayout(self.gridLayout_3)
         self.horizontalLayout_27.addLayout(self.verticalLayout_13)
         self.scrollArea_4 = QtWidgets.QScrollArea(self.imageac_tab)
@@ -1114,6 +1355,14 @@ class Ui_MainWindow(object):
         self.label_11.setText(_translate("MainWindow", "m/s²"))
         self.label_9.setText(_translate("MainWindow", "Peak Speed"))
         self.label_15.setText(_translate("MainWindow", "m/s"))
+        self.label_39.setText(_translate("MainWindow", "Frequency"))
+        self.label_40.setText(_translate("MainWindow", "Hz"))
+        self.label_41.setText(_translate("MainWindow", "PLL frequency"))
+        self.label_42.setText(_translate("MainWindow", "Hz"))
+        self.label_43.setText(_translate("MainWindow", "Damping ratio"))
+        self.label_44.setText(_translate("MainWindow", "ζ"))
+        self.label_47.setText(_translate("MainWindow", "Kalman speed"))
+        self.label_48.setText(_translate("MainWindow", "m/s"))
         self.label_18.setText(_translate("MainWindow", "Peak Detection parameters"))
         self.label_19.setText(_translate("MainWindow", "Peak window (s)"))
         self.label_20.setText(_translate("MainWindow", "Threshold (m/s)"))
@@ -1123,6 +1372,9 @@ class Ui_MainWindow(object):
         self.SignCorrectionCheckBox.setText(_translate("MainWindow", "Sign correction"))
         self.checkBox.setText(_translate("MainWindow", "Peaks"))
         self.AutoScrollGraphCheckBox.setText(_translate("MainWindow", "Auto-scroll"))
+        self.label_45.setText(_translate("MainWindow", "Acceleration filter"))
+        self.label_46.setText(_translate("MainWindow", "LCDs show"))
+        self.label_49.setText(_translate("MainWindow", "Direction from"))
         self.ClearBuffersButton.setText(_translate("MainWindow", "Clear buffers"))
         self.groupBox.setTitle(_translate("MainWindow", "Export"))
         self.ExportRPMCheckBox.setText(_translate("MainWindow", "RPM"))
@@ -1134,20 +1386,37 @@ class Ui_MainWindow(object):
         self.ExportAccelerationCheckBox.setText(_translate("MainWindow", "Acceleration"))
         self.ExportPeaksCheckBox.setText(_translate("MainWindow", "Peaks"))
         self.ExportSpeedCheckBox.setText(_translate("MainWindow", "Speed"))
+        self.ExportDampingCheckBox.setText(_translate("MainWindow", "Damping"))
+        self.ExportTrackerCheckBox.setText(_translate("MainWindow", "Frequency tracking"))
+        self.ExportKalmanCheckBox.setText(_translate("MainWindow", "Kalman estimate"))
+        self.ExportGlitchesCheckBox.setText(_translate("MainWindow", "Edge glitches"))
+        self.ExportZeroPhaseCheckBox.setText(_translate("MainWindow", "Zero-phase smoothing (speed, acceleration)"))
         self.label_16.setText(_translate("MainWindow", "Save path"))
         self.SelectPathButton.setText(_translate("MainWindow", "..."))
         self.CustomExportFilenameCheckBox.setText(_translate("MainWindow", "Custom filename"))
         self.label_17.setText(_translate("MainWindow", ".csv"))
+        self.label_50.setText(_translate("MainWindow", "Align to"))
+        self.AlignComboBox.setToolTip(_translate("MainWindow", "Time base of the CSV (time-aligned) export"))
+        self.AlignRateSpinBox.setSuffix(_translate("MainWindow", " Hz"))
+        self.RecordSessionCheckBox.setToolTip(_translate("MainWindow", "Continuously save all signals to a session folder in the save path"))
+        self.RecordSessionCheckBox.setText(_translate("MainWindow", "Record session"))
         self.ExportButton.setText(_translate("MainWindow", "Export data"))
         self.MainTab.setTabText(self.MainTab.indexOf(self.control_tab), _translate("MainWindow", "Control"))
         self.SelectPhotoPathButton.setText(_translate("MainWindow", "..."))
         self.AddSetButton.setText(_translate("MainWindow", "Add set"))
+        self.ExportSetMetadataButton.setText(_translate("MainWindow", "Export set metadata (CSV)"))
         self.DeleteSetButton.setText(_translate("MainWindow", "Delete Selected Set"))
         self.label_22.setText(_translate("MainWindow", "Camera parameters"))
         self.label_23.setText(_translate("MainWindow", "Exposure time"))
         self.label_26.setText(_translate("MainWindow", "dB"))
         self.label_25.setText(_translate("MainWindow", "s"))
         self.label_24.setText(_translate("MainWindow", "Gain"))
+        self.label_35.setText(_translate("MainWindow", "Output format"))
+        self.label_36.setText(_translate("MainWindow", "PNG level"))
+        self.RoiCheckBox.setText(_translate("MainWindow", "ROI x, y"))
+        self.label_37.setText(_translate("MainWindow", "ROI w, h"))
+        self.label_38.setText(_translate("MainWindow", "Binning"))
+        self.BayerTransferCheckBox.setText(_translate("MainWindow", "Bayer transfer (1 byte/pixel)"))
         self.label_27.setText(_translate("MainWindow", "Photo parameters"))
         self.label_28.setText(_translate("MainWindow", "Amplitude"))
         self.label_29.setText(_translate("MainWindow", "RPM"))
@@ -1 +1,4 @@
 from .serial_worker import SerialWorker
+from .frame_writer import FrameWriteTask
+from .thumbnail_loader import ThumbnailTask
+from .export_worker import ExportTask
@@ -0,0 +1,53 @@
+from threading import Event
+from PyQt5.QtCore import QObject, QRunnable, pyqtSignal
+from core.exporter import export_signals, ExportCancelled
+from core.filters import zero_phase_signals
+
+
+class ExportSignals(QObject):
+    progress = pyqtSignal(int)
+    finished = pyqtSignal(str)
+    cancelled = pyqtSignal()
+    error = pyqtSignal(str)
+
+
+class ExportTask(QRunnable):
+    """Write a telemetry export off the GUI thread; cancel() stops it between chunks."""
+
+    def __init__(self, path, data, fmt, align=None, smoothing=None):
+        super().__init__()
+        self.path = path
+        self.data = data
+        self.fmt = fmt
+        self.align = align
+        self.smoothing = smoothing
+        self.signals = ExportSignals()
+        self._cancel = Event()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def run(self):
+        try:
+            data = self.data
+            if self.smoothing:
+                data = zero_phase_signals(data, self.smoothing)
+            export_signals(
+                self.path,
+                data,
+                self.fmt,
+                progress=self.signals.progress.emit,
+                is_cancelled=self._cancel.is_set,
+                align=self.align,
+            )
+        except ExportCancelled:
+            self.signals.cancelled.emit()
+            return
+        except Exception as e:
+            self.signals.error.emit(str(e))
+            return
+        finally:
+            self.data = None
+            self.smoothing = None
+
+        self.signals.finished.emit(self.path)
@@ -0,0 +1,41 @@
+from PyQt5.QtCore import QObject, QRunnable, pyqtSignal
+from core.image_io import save_frame
+from core.telemetry_snapshot import save_snapshot, snapshot_path_for
+
+
+class FrameWriterSignals(QObject):
+    saved = pyqtSignal(str)
+    error = pyqtSignal(str, str)
+
+
+class FrameWriteTask(QRunnable):
+    """Encode and write one captured frame (and its telemetry snapshot) off the GUI thread."""
+
+    def __init__(self, img, out_path, fmt, png_compression, snapshot=None):
+        super().__init__()
+        self.img = img
+        self.out_path = out_path
+        self.fmt = fmt
+        self.png_compression = png_compression
+        self.snapshot = snapshot
+        self.signals = FrameWriterSignals()
+
+    def run(self):
+        try:
+            save_frame(self.img, self.out_path, self.fmt, self.png_compression)
+        except Exception as e:
+            self.signals.error.emit(self.out_path, str(e))
+            return
+        finally:
+            self.img = None
+
+        if self.snapshot is not None:
+            try:
+                save_snapshot(snapshot_path_for(self.out_path), self.snapshot)
+            except Exception as e:
+                # The frame itself is safe; only the telemetry is missing
+                print(f"[ERROR] Writing telemetry snapshot for {self.out_path}: {e}")
+            finally:
+                self.snapshot = None
+
+        self.signals.saved.emit(self.out_path)
@@ -0,0 +1,73 @@
+import os
+from PyQt5.QtCore import QObject, QRunnable, Qt, QBuffer, QByteArray, QIODevice, pyqtSignal
+from PyQt5.QtGui import QImage, QImageReader
+from core.image_io import RAW_EXTS, read_preview
+
+
+def load_thumbnail_image(fp, size, cache=None):
+    """Return a thumbnail QImage for `fp` no larger than `size` x `size`.
+
+    Uses `cache` when the file is unchanged; otherwise the image is decoded
+    at reduced size and the result is stored in the cache. Returns a null
+    QImage if the file cannot be decoded.
+    """
+    if cache is not None:
+        data = cache.get(fp)
+        if data is not None:
+            img = QImage.fromData(data, "PNG")
+            if not img.isNull():
+                return img
+
+    if os.path.splitext(fp)[1].lower() in RAW_EXTS:
+        try:
+            bgr = read_preview(fp, size)
+        except Exception:
+            return QImage()
+        h, w = bgr.shape[:2]
+        img = QImage(bgr.data, w, h, bgr.strides[0], QImage.Format_BGR888).copy()
+    else:
+        reader = QImageReader(fp)
+        src_size = reader.size()
+        if src_size.isValid():
+            reader.setScaledSize(src_size.scaled(size, size, Qt.KeepAspectRatio))
+        img = reader.read()
+
+    if img.isNull():
+        return img
+
+    if img.width() > size or img.height() > size:
+        img = img.scaled(size, size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+
+    if cache is not None:
+        data = QByteArray()
+        buf = QBuffer(data)
+        buf.open(QIODevice.WriteOnly)
+        if img.save(buf, "PNG"):
+            cache.put(fp, bytes(data))
+
+    return img
+
+
+class ThumbnailSignals(QObject):
+    # generation, path, thumbnail (null QImage if the file could not be decoded)
+    loaded = pyqtSignal(int, str, QImage)
+
+
+class ThumbnailTask(QRunnable):
+    """Decode one thumbnail on a QThreadPool thread."""
+
+    def __init__(self, generation, fp, size, cache=None):
+        super().__init__()
+        self.generation = generation
+        self.fp = fp
+        self.size = size
+        self.cache = cache
+        self.signals = ThumbnailSignals()
+
+    def run(self):
+        try:
+            img = load_thumbnail_image(self.fp, self.size, self.cache)
+        except Exception:
+            img = QImage()
+
+        self.signals.loaded.emit(self.generation, self.fp, img)